@@ -5,12 +5,9 @@
 
 # -- Path setup --------------------------------------------------------------
 
-# Because the modules we want to document are in another directory, we must
-# add them to sys.path ; we also use os.path.abspath to transform the relative
-# path into an absolute one.
-import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+# The API reference is generated by sphinx-autoapi, which reads the source
+# files instead of importing the modules: the package and its (heavy) runtime
+# dependencies do not need to be installed to build the docs.
 
 # -- Project information -----------------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#project-information
@@ -23,10 +20,8 @@ author = 'Enzo Dos Anjos, Remy Chaput'
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#general-configuration
 
 extensions = [
-    # Include documentation from docstrings
-    'sphinx.ext.autodoc',
-    # Generate summaries (tables/listings) for autodoc
-    'sphinx.ext.autosummary',
+    # Generate the API reference from the docstrings, by parsing the sources
+    'autoapi.extension',
     # Link to external (other projects') documentation
     'sphinx.ext.intersphinx',
     # Automatically add a 'copy button' to our code blocks
@@ -39,9 +34,6 @@ extensions = [
     'sphinx.ext.napoleon',
 ]
 
-# Enable autosummary
-autosummary_generate = True
-
 templates_path = ['_templates']
 exclude_patterns = []
 
@@ -51,13 +43,42 @@ intersphinx_mapping = {
     'numpy': ('https://numpy.org/doc/stable/', None),
     'gymnasium': ('https://gymnasium.farama.org/', None),
 }
+# Only resolve Python objects through the inventories: our `:doc:` and `:ref:`
+# roles always target our own pages.
+intersphinx_disabled_reftypes = ['std:*']
+# The inventories are stored in the build environment (`.doctrees`); keep them
+# for a month instead of re-downloading them after 5 days.
+intersphinx_cache_limit = 30
+# Do not let an unreachable inventory stall the whole build.
+intersphinx_timeout = 10
+
+# -- AutoAPI configuration ---------------------------------------------------
+# https://sphinx-autoapi.readthedocs.io/en/latest/reference/config.html
+
+autoapi_dirs = ['../../ethicalgardeners']
+# Same members as our previous autosummary templates: private members are
+# documented too (e.g., `_ActionEnum`).
+autoapi_options = [
+    'members',
+    'private-members',
+    'show-inheritance',
+    'show-module-summary',
+]
+# Document the constructor (`__init__`) arguments along with the class.
+autoapi_python_class_content = 'both'
+# Generate the pages in `source/modules` and link them from `api.rst` rather
+# than from the root toctree.
+autoapi_root = 'modules'
+autoapi_add_toctree_entry = False
 
 # -- Sphinx-multiversion configuration ---------------------------------------
 # https://sphinx-contrib.github.io/multiversion/main/index.html
 
-# Accept all branches except:
-# - any `wip/**` branch (because they are not ready)
-smv_branch_whitelist = r'^(?!wip/).*'
+# Only build the `main` branch and the released versions: every other branch
+# would be a full additional build. Pull requests get a separate preview build
+# of their own branch (see `.github/workflows/docs.yml`).
+smv_branch_whitelist = r'^main$'
+smv_tag_whitelist = r'^v.*$'
 
 # Allow remote branches from `origin` only (required for building all branches
 # on GitHub Actions, because they are not automatically fetched).
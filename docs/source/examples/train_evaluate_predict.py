@@ -1,12 +1,12 @@
-from copy import deepcopy
 import hydra
+from omegaconf import OmegaConf
 
 from sb3_contrib import MaskablePPO
 from sb3_contrib.common.maskable.policies import MaskableActorCriticPolicy
 
 # from stable_baselines3 import DQN
 
-from stable_baselines3.common.vec_env import DummyVecEnv  # , SubprocVecEnv
+from stable_baselines3.common.vec_env import SubprocVecEnv  # , DummyVecEnv
 
 from ethicalgardeners import algorithms, make_env
 from ethicalgardeners.main import run_simulation, _find_config_path
@@ -18,22 +18,26 @@ def main(config):
 
     # ---- Training ----
     num_envs = 10
-    total_timesteps = 0
-    configs = [deepcopy(config) for _ in range(num_envs)]
-    for i, cfg in enumerate(configs):
-        cfg["random_seed"] = 42 + i  # a different seed for each env
-        cfg["num_iterations"] = 2048
-        total_timesteps += cfg["num_iterations"]
+    # All the training envs share the same config; only their seed differs.
+    # The config is resolved here because the `now` resolver of the output
+    # paths is only registered by Hydra in this process, not in the
+    # subprocesses of SubprocVecEnv.
+    train_config = OmegaConf.to_container(
+        OmegaConf.merge(config, {"num_iterations": 2048}), resolve=True)
+    seeds = [42 + i for i in range(num_envs)]  # a different seed for each env
+    total_timesteps = num_envs * train_config["num_iterations"]
 
     # When num_envs > 1, multiple environments are created using the provided
-    # configs and run in parallel using either SubprocVecEnv or DummyVecEnv.
-    # When num_envs = 1, a single environment is created using the first config
+    # config and run in parallel using either SubprocVecEnv (one process per
+    # env) or DummyVecEnv (all envs sequentially in the current process).
+    # When num_envs = 1, a single environment is created using the first seed
     if num_envs > 1:
-        env_fns = [algorithms.make_env_thunk(make_env, cfg) for cfg in configs]
-        vec_cls = DummyVecEnv  # or SubprocVecEnv
+        env_fns = [algorithms.make_env_thunk(make_env, train_config, seed)
+                   for seed in seeds]
+        vec_cls = SubprocVecEnv  # or DummyVecEnv
         env = vec_cls(env_fns)
     else:
-        env = algorithms.make_SB3_env(make_env, configs[0])
+        env = algorithms.make_SB3_env(make_env, train_config, seeds[0])
 
     # Create the model using the provided model function
     model = MaskablePPO(MaskableActorCriticPolicy, env, verbose=3)
@@ -46,9 +50,10 @@ def main(config):
     # ---- Evaluation ----
     env = make_env(config)
 
-    policy_path = algorithms.get_latest_policy(algo)
-    model = MaskablePPO.load(policy_path)
-    # or model = DQN.load(policy_path)
+    # The trained model is still in memory, so it is evaluated directly.
+    # To evaluate a previously saved model instead, load it from disk:
+    # policy_path = algorithms.get_latest_policy(algo)
+    # model = MaskablePPO.load(policy_path)  # or DQN.load(policy_path)
 
     round_rewards, total_rewards, winrate, scores = algorithms.evaluate(
         env, model, algo,
@@ -27,6 +27,10 @@ Main Components:
 * :py:mod:`.renderer`: Display the environment state to the user.
 * :py:class:`.GardenersEnv`: The main environment class that integrates all
   components and provides the interface for interaction with RL agents.
+* :py:class:`.SyncVectorGardeners`: A batch of environments whose state is
+  stored in NumPy arrays and stepped at once, for faster training.
+  :py:class:`.SharedVectorGardeners` spreads such a batch over several
+  processes sharing its arrays.
 
 Usage Examples:
 -----------------
@@ -11,12 +11,15 @@ This module contains:
 
 These actions are handled by the :py:class:`.ActionHandler` class.
 """
-from enum import Enum, auto
+from enum import IntEnum, auto
 
 
-class _ActionEnum(Enum):
+class _ActionEnum(IntEnum):
     """
     Custom enum for actions.
+
+    Actions are integers, so they can be compared with plain integers and
+    used directly as indices, e.g. in an action mask.
     """
 
     def __init__(self, *args, **kwargs):
@@ -39,15 +42,14 @@ class _ActionEnum(Enum):
     @classmethod
     def get_non_planting_actions(cls):
         """
-        Get a list of actions that do not involve planting flowers.
+        Get the actions that do not involve planting flowers.
+
+        The actions are computed once by :py:func:`create_action_enum`.
 
         Returns:
-            list: A list of actions that do not involve planting flowers.
+            tuple: The actions that do not involve planting flowers.
         """
-        return [
-            action for action in cls
-            if not action.name.startswith('PLANT_TYPE_')
-        ]
+        return cls._non_planting
 
     @classmethod
     def get_planting_action_for_type(cls, flower_type):
@@ -61,11 +63,9 @@ class _ActionEnum(Enum):
             Enum member: The planting action for the specified flower type.
             None: If no corresponding action is found.
         """
-        action_name = f'PLANT_TYPE_{flower_type}'
-        try:
-            return cls[action_name]
-        except KeyError:
-            return None
+        if 0 <= flower_type < len(cls._planting):
+            return cls._planting[flower_type]
+        return None
 
 
 def create_action_enum(num_flower_type=1):
@@ -93,4 +93,13 @@ def create_action_enum(num_flower_type=1):
         action_name = f'PLANT_TYPE_{i}'
         actions[action_name] = auto()
 
-    return Enum('Action', actions, type=_ActionEnum)
+    action_enum = _ActionEnum('Action', actions)
+
+    # Split the planting and non-planting actions once, so that looking them
+    # up does not scan the enumeration
+    action_enum._planting = tuple(
+        action_enum[f'PLANT_TYPE_{i}'] for i in range(num_flower_type))
+    action_enum._non_planting = tuple(
+        action for action in action_enum if action.flower_type is None)
+
+    return action_enum
@@ -1,12 +1,15 @@
 """
 Handles the execution of agent actions in the Ethical Gardeners simulation.
 """
+import functools
 import warnings
 
 import numpy as np
 
 from ethicalgardeners.agent import Agent
-from ethicalgardeners.constants import MIN_SEED_RETURNS, MAX_SEED_RETURNS
+
+_DELTAS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+"""Position offset of the UP, DOWN, LEFT and RIGHT actions, by action value."""
 
 
 class ActionHandler:
@@ -24,7 +27,6 @@ class ActionHandler:
             actions (UP, DOWN, LEFT, RIGHT, HARVEST, WAIT, PLANT_TYPE_i).
             Created dynamically based on the number of flower types available.
     """
-
     def __init__(self, grid_world, action_enum):
         """
         Create the ActionHandler with a reference to the grid world.
@@ -40,28 +42,74 @@ class ActionHandler:
         self.grid_world = grid_world
         self.action_enum = action_enum  # Dynamically created Action enum
 
+    @property
+    def action_enum(self):
+        return self._action_enum
+
+    @action_enum.setter
+    def action_enum(self, action_enum):
+        self._action_enum = action_enum
+        self._handlers = self._build_handlers(action_enum)
+        # Constants of the action masks, computed once per enumeration
+        self._num_actions = len(action_enum)
+        self._harvest_action = action_enum.HARVEST.value
+        self._planting_actions = np.array(
+            [action.value for action in action_enum
+             if action.flower_type is not None], dtype=np.intp)
+
+    def _build_handlers(self, action_enum):
+        """
+        Build the table mapping each action to the method performing it.
+
+        The table is built once per action enumeration, with the direction
+        of the movements and the flower type of the plantings bound to their
+        method, so that :py:meth:`handle_action` does a single index instead
+        of comparing the action with each action type.
+
+        Args:
+            action_enum (:py:class:`._ActionEnum`): The enumeration of possible
+                actions.
+
+        Returns:
+            tuple: The callable performing each action, indexed by action
+            value and taking the agent performing the action.
+        """
+        handlers = [None] * len(action_enum)
+        for action in action_enum:
+            if action < len(_DELTAS):
+                handlers[action] = functools.partial(self.move_agent,
+                                                     action=action)
+            elif action.flower_type is not None:
+                handlers[action] = functools.partial(
+                    self.plant_flower, flower_type=action.flower_type)
+        handlers[action_enum.HARVEST] = self.harvest_flower
+        handlers[action_enum.WAIT] = self.wait
+
+        return tuple(handlers)
+
     def handle_action(self, agent: Agent, action):
         """
         Process an agent's action and execute it in the grid world.
 
         This method delegates to specific handler methods based on the action
-        type.
+        type, looked up in a table built from :py:attr:`action_enum`.
+
+        Every action counts as a turn without income for the agent. A
+        successful harvest then resets this count, see
+        :py:meth:`harvest_flower`.
 
         Args:
             agent (:py:class:`.Agent`): The agent performing the action.
             action (:py:class:`._ActionEnum`): The action to perform (UP,
                 DOWN, LEFT, RIGHT, HARVEST, WAIT or PLANT_TYPE_i). PLANT_TYPE_i
                 plants a flower of type i at the agent's current position.
+
+        Returns:
+            bool: True if the action was performed, False if it was invalid
+            and ignored.
         """
-        if action in [self.action_enum.UP, self.action_enum.DOWN,
-                      self.action_enum.LEFT, self.action_enum.RIGHT]:
-            self.move_agent(agent, action)
-        elif action == self.action_enum.HARVEST:
-            self.harvest_flower(agent)
-        elif action == self.action_enum.WAIT:
-            self.wait(agent)
-        else:  # Assume action is a PLANT_TYPE_i action
-            self.plant_flower(agent, action.flower_type)
+        agent.turns_without_income += 1
+        return self._handlers[action](agent)
 
     def move_agent(self, agent: Agent, action):
         """
@@ -71,24 +119,24 @@ class ActionHandler:
             agent (:py:class:`.Agent`): The agent to move.
             action (:py:class:`._ActionEnum`): The direction to move (UP,
                 DOWN, LEFT, RIGHT).
+
+        Returns:
+            bool: True if the agent moved, False if the move was invalid.
         """
         # Compute the new position based on the action
-        new_position = self._compute_new_position(agent.position, action)
-
-        if self.grid_world.valid_move(new_position):
-            self.grid_world.get_cell(agent.position).agent = None
-
-            agent.move(new_position)
+        new_position = self._compute_new_position(agent.row, agent.col,
+                                                  action)
 
-            self.grid_world.get_cell(new_position).agent = agent
-
-        else:
+        if not self.grid_world.valid_move(new_position):
             warnings.warn(
                 f"Invalid move attempted by {agent} towards {new_position}. "
                 f"The agent remains at its current position."
             )
+            return False
 
-        agent.turns_without_income += 1
+        self.grid_world.move_agent(agent, new_position)
+        agent.move(new_position)
+        return True
 
     def plant_flower(self, agent: Agent, flower_type: int):
         """
@@ -99,48 +147,55 @@ class ActionHandler:
         Args:
             agent (:py:class:`.Agent`): The agent planting the flower.
             flower_type (int): The type of flower to plant.
-        """
-        agent.turns_without_income += 1
 
-        cell = self.grid_world.get_cell(agent.position)
+        Returns:
+            bool: True if the flower was planted, False if the agent has no
+            seeds of this type or the cell cannot be planted on.
+        """
+        cell = self._get_agent_cell(agent)
         if not agent.can_plant(flower_type):
             warnings.warn(
                 f"Invalid plant attempted by {agent} with flower_type "
                 f"{flower_type}. The agent does not have seeds of this type. "
                 f"The action is ignored."
             )
-            return
+            return False
         elif not cell.can_plant_on():
             warnings.warn(
                 f"Invalid plant attempted by {agent} with flower_type "
                 f"{flower_type}. The cell at {agent.position} cannot be "
                 f"planted on. The action is ignored."
             )
-            return
+            return False
 
         agent.use_seed(flower_type)
         self.grid_world.place_flower(agent.position, flower_type, agent)
         agent.flowers_planted[flower_type] += 1
+        return True
 
     def harvest_flower(self, agent: Agent):
         """
         Harvest a fully grown flower at the agent's current position.
 
         The flower must be fully grown to be harvested. Upon harvesting, the
-        agent receives seeds and money based on the flower type.
+        agent receives seeds and money based on the flower type, and its
+        count of turns without income is reset.
 
         Args:
             agent (:py:class:`.Agent`): The agent harvesting the flower.
+
+        Returns:
+            bool: True if a flower was harvested, False if there is no fully
+            grown flower at the agent's position.
         """
-        flower = self.grid_world.get_cell(agent.position).flower
+        flower = self._get_agent_cell(agent).flower
         if not flower:
             warnings.warn(
                 f"Invalid harvest attempted by {agent} with flower "
                 f"{flower}. There is no flower at {agent.position}. The action"
                 f" is ignored."
             )
-            agent.turns_without_income += 1
-            return
+            return False
 
         if not flower.is_grown():
             warnings.warn(
@@ -148,22 +203,18 @@ class ActionHandler:
                 f"{flower}. The flower is not fully grown. The action"
                 f" is ignored."
             )
-            agent.turns_without_income += 1
-            return
+            return False
 
         self.grid_world.remove_flower(agent.position)
 
         if self.grid_world.num_seeds_returned is not None:
             if self.grid_world.num_seeds_returned == -3:
-                num_seeds_returned = (
-                    self.grid_world.random_generator.randint(MIN_SEED_RETURNS,
-                                                             MAX_SEED_RETURNS))
+                num_seeds_returned = self.grid_world.next_seed_return()
             else:
                 num_seeds_returned = self.grid_world.num_seeds_returned
             agent.add_seed(flower.flower_type, num_seeds_returned)
 
-        agent.add_money(
-            self.grid_world.flowers_data[flower.flower_type]['price'])
+        agent.add_money(flower.price)
         agent.turns_without_income = 0
 
         agent.flowers_harvested[flower.flower_type] += 1
@@ -172,6 +223,7 @@ class ActionHandler:
         # Remember that initially planted flowers do not have a planter
         if planter_agent is not None:
             planter_agent.flowers_planted[flower.flower_type] -= 1
+        return True
 
     def wait(self, agent: Agent):
         """
@@ -182,8 +234,11 @@ class ActionHandler:
 
         Args:
             agent (:py:class:`.Agent`): The agent performing the wait action.
+
+        Returns:
+            bool: Always True, waiting is always valid.
         """
-        agent.turns_without_income += 1
+        return True
 
     def update_action_mask(self, agent: Agent):
         """
@@ -197,52 +252,60 @@ class ActionHandler:
             agent (:py:class:`.Agent`): The agent for which to update the
                 action mask.
         """
-        mask = np.ones(len(self.action_enum), dtype=np.int8)
-        if not self.grid_world.valid_move(self._compute_new_position(
-                agent.position, self.action_enum.UP)):
-            mask[self.action_enum.UP.value] = 0
-        if not self.grid_world.valid_move(self._compute_new_position(
-                agent.position, self.action_enum.DOWN)):
-            mask[self.action_enum.DOWN.value] = 0
-        if not self.grid_world.valid_move(self._compute_new_position(
-                agent.position, self.action_enum.LEFT)):
-            mask[self.action_enum.LEFT.value] = 0
-        if not self.grid_world.valid_move(self._compute_new_position(
-                agent.position, self.action_enum.RIGHT)):
-            mask[self.action_enum.RIGHT.value] = 0
-        if not self.grid_world.get_cell(agent.position).flower or \
-                not self.grid_world.get_cell(agent.position).flower.is_grown():
-            mask[self.action_enum.HARVEST.value] = 0
+        mask = np.ones(self._num_actions, dtype=np.int8)
+        row, col = agent.row, agent.col
+        valid_move = self.grid_world.valid_move
+        # The movement actions are the first ones, in the order of _DELTAS
+        for action, (d_row, d_col) in enumerate(_DELTAS):
+            if not valid_move((row + d_row, col + d_col)):
+                mask[action] = 0
+        cell = self._get_agent_cell(agent)
+        if not cell.flower or not cell.flower.is_grown():
+            mask[self._harvest_action] = 0
 
         # Check planting actions for each flower type
-        can_plant_on_cell = self.grid_world.get_cell(
-            agent.position).can_plant_on()
-        for i in range(len(agent.seeds)):
-            plant_action = self.action_enum.get_planting_action_for_type(i)
-            if not agent.can_plant(i) or not can_plant_on_cell:
-                mask[plant_action.value] = 0
+        planting_actions = self._planting_actions[:len(agent.seeds)]
+        if cell.can_plant_on():
+            for flower_type, action in enumerate(planting_actions):
+                if not agent.can_plant(flower_type):
+                    mask[action] = 0
+        else:
+            mask[planting_actions] = 0
 
         agent.action_mask = mask
 
-    def _compute_new_position(self, position, action):
+    def _get_agent_cell(self, agent: Agent):
+        """
+        Return the cell the agent is on.
+
+        The cell is read from :py:attr:`.Agent.cell`, which avoids looking it
+        up in the grid, unless the agent has not been placed in a grid.
+
+        Args:
+            agent (:py:class:`.Agent`): The agent whose cell to return.
+
+        Returns:
+            :py:class:`.Cell`: The cell at the agent's position.
+        """
+        cell = agent.cell
+        if cell is None:
+            cell = self.grid_world.get_cell(agent.position)
+        return cell
+
+    def _compute_new_position(self, row, col, action):
         """
         Compute the new position based on the current position and action.
 
         Args:
-            position (tuple): The current (x, y) coordinates of the agent.
+            row (int): The current row (x coordinate) of the agent.
+            col (int): The current column (y coordinate) of the agent.
             action (:py:class:`._ActionEnum`): The action to perform
                 (UP, DOWN, LEFT, RIGHT).
 
         Returns:
             tuple: The new (x, y) coordinates after applying the action.
         """
-        if action == self.action_enum.UP:
-            return (position[0] - 1, position[1])
-        elif action == self.action_enum.DOWN:
-            return (position[0] + 1, position[1])
-        elif action == self.action_enum.LEFT:
-            return (position[0], position[1] - 1)
-        elif action == self.action_enum.RIGHT:
-            return (position[0], position[1] + 1)
-        else:
-            return position
+        if action >= len(_DELTAS):
+            return (row, col)
+        d_row, d_col = _DELTAS[action]
+        return (row + d_row, col + d_col)
@@ -1,6 +1,9 @@
 """
 Represents a gardener agent in the Ethical Gardeners simulation.
 """
+from collections.abc import Mapping
+
+import numpy as np
 
 
 class Agent:
@@ -11,21 +14,29 @@ class Agent:
     and accumulate money from harvesting flowers.
 
     Attributes:
-        position (tuple): The (x, y) coordinates of the agent in the grid.
+        row (int): The row (x coordinate) of the agent in the grid.
+        col (int): The column (y coordinate) of the agent in the grid.
         money (float): The agent's current monetary wealth.
-        seeds (dict): Dictionary mapping flower types to the number of seeds
-            the agent has.
-        flowers_planted (dict): Counter of flowers this agent has planted on
-            the grid by type.
-        flowers_harvested (dict): Counter of flowers this agent has harvested
-            by type. (Note that, because an agent can harvest flowers planted
-            by another agent, this counter can be very different from the
-            ``flowers_planted`` counter.)
+        seeds (:py:class:`numpy.ndarray`): Number of seeds the agent has,
+            indexed by flower type. A count of -1 represents infinite seeds.
+        flowers_planted (:py:class:`numpy.ndarray`): Counter of flowers this
+            agent has planted on the grid, indexed by flower type.
+        flowers_harvested (:py:class:`numpy.ndarray`): Counter of flowers this
+            agent has harvested, indexed by flower type. (Note that, because
+            an agent can harvest flowers planted by another agent, this
+            counter can be very different from the ``flowers_planted``
+            counter.)
         turns_without_income (int): Number of turns the agent has not earned
             money.
         action_mask (list): Action mask indicating valid actions for the agent.
+        cell (:py:class:`.Cell`): The cell of the grid the agent is on, or None
+            if the agent has not been placed in a grid.
     """
-    def __init__(self, position, money=0.0, seeds: dict = None):
+    __slots__ = ('row', 'col', 'money', 'seeds', 'flowers_planted',
+                 'flowers_harvested', 'turns_without_income', 'action_mask',
+                 'cell')
+
+    def __init__(self, position, money=0.0, seeds=None):
         """
         Create a new agent.
 
@@ -33,19 +44,46 @@ class Agent:
             position (tuple): The (x, y) coordinates where the agent starts.
             money (float, optional): Initial amount of money the agent has.
                 Defaults to 0.
-            seeds (dict, optional): Dictionary mapping flower types to initial
-                seed counts. Defaults to 10 for each type.
+            seeds (list or dict, optional): Initial seed counts, either as a
+                list indexed by flower type or as a dictionary mapping flower
+                types to counts. Defaults to 10 for each of the 3 types.
+
+        Raises:
+            ValueError: If a seed count is negative and is not -1.
         """
         self.position = position
         self.money = money
         if seeds is None:
-            self.seeds = {0: 10, 1: 10, 2: 10}
-        else:
-            self.seeds = seeds
-        self.flowers_planted = {i: 0 for i in self.seeds}
-        self.flowers_harvested = {i: 0 for i in self.seeds}
+            seeds = [10, 10, 10]
+        elif isinstance(seeds, Mapping):
+            counts = [0] * (max(seeds, default=-1) + 1)
+            for flower_type, count in seeds.items():
+                counts[flower_type] = count
+            seeds = counts
+        self.seeds = np.array(seeds, dtype=np.int32)
+        # The seed operations rely on -1 being the only negative count
+        if (self.seeds < -1).any():
+            raise ValueError("Seed counts must be positive, or -1 for "
+                             "infinite seeds.")
+        self.flowers_planted = np.zeros_like(self.seeds)
+        self.flowers_harvested = np.zeros_like(self.seeds)
         self.turns_without_income = 0
         self.action_mask = None  # Action mask to indicate valid actions
+        self.cell = None  # Set when the agent is placed in a grid
+
+    @property
+    def position(self):
+        """
+        tuple: The (x, y) coordinates of the agent in the grid.
+
+        The coordinates are stored in :py:attr:`row` and :py:attr:`col`, so
+        moving the agent does not allocate a tuple.
+        """
+        return (self.row, self.col)
+
+    @position.setter
+    def position(self, position):
+        self.row, self.col = position
 
     def move(self, new_position):
         """
@@ -57,7 +95,7 @@ class Agent:
             new_position (tuple): The (x, y) coordinates of the agent in the
                 grid.
         """
-        self.position = new_position
+        self.row, self.col = new_position
 
     def can_plant(self, flower_type: int):
         """
@@ -71,12 +109,9 @@ class Agent:
             bool: True if the agent has at least one seed of the specified type
             or if seed count is -1 because this represents infinite seeds.
         """
-
-        if self.seeds[flower_type] == -1:
-            # If the seed count is -1, it represents infinite seeds
-            return True
-
-        return self.seeds[flower_type] > 0
+        # Counts are never negative except -1, which represents infinite
+        # seeds, so only an empty count prevents planting
+        return bool(self.seeds[flower_type] != 0)
 
     def use_seed(self, flower_type: int):
         """
@@ -92,13 +127,13 @@ class Agent:
             bool: True if the seed was successfully used, False if no seeds
             available.
         """
-        if self.can_plant(flower_type):
-            if self.seeds[flower_type] != -1:
-                # Only decrement if the seed count is not infinite
-                self.seeds[flower_type] -= 1
-            return True
+        seeds = self.seeds[flower_type]
+        if seeds == 0:
+            return False
 
-        return False
+        # An infinite seed count (-1) is left unchanged
+        self.seeds[flower_type] = seeds - (seeds > 0)
+        return True
 
     def add_money(self, amount):
         """
@@ -117,7 +152,5 @@ class Agent:
             flower_type (int): The type of flower seeds to add.
             num_seeds (int): The number of seeds to add.
         """
-        if self.seeds[flower_type] == -1:
-            # If the seed count is -1, it represents infinite seeds
-            return
-        self.seeds[flower_type] += num_seeds
+        # An infinite seed count (-1) is left unchanged
+        self.seeds[flower_type] += num_seeds * (self.seeds[flower_type] >= 0)
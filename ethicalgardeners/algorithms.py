@@ -2,6 +2,7 @@
 Utilities to train and evaluate RL agents using Stable Baselines3 on the
 EthicalGardeners PettingZoo AEC environment.
 """
+import functools
 import glob
 import os
 import time
@@ -15,6 +16,7 @@ class SB3Wrapper(BaseWrapper, Env):
     """
     Wrapper to adapt a PettingZoo AEC environment to be compatible with Stable
     Baselines3.
+
     - Only returns the observation (without action mask) for the current agent.
     - the observation_space and action_space are aligned with the current
       agent.
@@ -116,13 +118,17 @@ def get_latest_policy(algorithm_name: str):
     return latest
 
 
-def make_SB3_env(env_fn, config):
+def make_SB3_env(env_fn, config, seed=None):
     """
     Create a Stable Baselines3 compatible environment with action masking.
 
     Args:
         env_fn: A function that takes a config and returns a PettingZoo AEC env
         config: Hydra configuration parameters for the environment.
+        seed: The random seed used to reset the environment. If None, the
+            `random_seed` of the configuration is used. This allows creating
+            several environments with different seeds from the same
+            configuration.
     """
     try:
         from sb3_contrib.common.wrappers import ActionMasker
@@ -134,23 +140,79 @@ def make_SB3_env(env_fn, config):
 
     env = SB3Wrapper(env_fn(config))
     env = ActionMasker(env, mask_fn)
-    env.reset(seed=config["random_seed"])
+    env.reset(seed=seed if seed is not None else config["random_seed"])
 
     return env
 
 
-def make_env_thunk(env_fn, config):
+def make_env_thunk(env_fn, config, seed=None):
     """
     Return a thunk that creates a Stable Baselines3 compatible environment.
 
+    The thunk can be pickled, so it can be sent to a subprocess, provided that
+    `env_fn` and `config` can be pickled too.
+
     Args:
         env_fn: A function that takes a config and returns a PettingZoo AEC env
         config: Hydra configuration parameters for the environment.
+        seed: The random seed used to reset the environment. If None, the
+            `random_seed` of the configuration is used.
+    """
+    # A partial of a module-level function (rather than a closure) can be
+    # pickled, as required to create the environment in a subprocess (e.g.,
+    # with SubprocVecEnv).
+    return functools.partial(make_SB3_env, env_fn, config, seed)
+
+
+def make_vec_env(env_fn, config, n_envs=8, num_cpus=None):
+    """
+    Create a Stable Baselines3 vectorized environment running several copies
+    of the parallel environment in worker processes with SuperSuit.
+
+    Each agent of each copy is an environment of the returned vectorized
+    environment, and the observations do not include the action mask. When
+    the vectorized environment is reset with a seed, SuperSuit resets each
+    copy with a different seed derived from it.
+
+    The environments are created in the worker processes, so the metrics
+    should not be sent to WandB and the graphical renderer should be disabled
+    in the configuration.
+
+    Args:
+        env_fn: A function that takes a config and a `parallel` keyword and
+            returns a PettingZoo environment, such as
+            :py:func:`~ethicalgardeners.main.make_env`.
+        config: Hydra configuration parameters for the environment.
+        n_envs: Number of copies of the environment.
+        num_cpus: Number of worker processes. If None, one process is used for
+            each copy.
+
+    Raises:
+        RuntimeError: If `supersuit` is not installed.
     """
-    def thunk():
-        return make_SB3_env(env_fn, config)
+    try:
+        import supersuit as ss
+    except ImportError as e:
+        raise RuntimeError(
+            "Vectorized environments require `supersuit`. "
+            "Install it via: pip install supersuit"
+        ) from e
 
-    return thunk
+    env = env_fn(config, parallel=True)
+    # All agents share the same spaces, so the observations only need to be
+    # stripped of the action mask. The observation space already describes
+    # the observations without it
+    env = ss.observation_lambda_v0(
+        env,
+        lambda observation, space: observation["observation"],
+        lambda space: space
+    )
+    env = ss.pettingzoo_env_to_vec_env_v1(env)
+
+    return ss.concat_vec_envs_v1(
+        env, n_envs, num_cpus=n_envs if num_cpus is None else num_cpus,
+        base_class="stable_baselines3"
+    )
 
 
 def train(model, algorithm_name: str = "maskable_ppo", total_timesteps=10_000):
@@ -3,7 +3,9 @@ The GardenersEnv module provides the main simulation environment for the
 Ethical Gardeners reinforcement learning platform.
 
 This module implements the PettingZoo AECEnv interface, serving as the primary
-entry point of the simulation. It coordinates all simulation components:
+entry point of the simulation, and the PettingZoo ParallelEnv interface, in
+which all agents act at once each turn. It coordinates all simulation
+components:
 
 1. World representation and state management (:py:mod:`.gridworld`)
 2. Agent actions and interactions (:py:class:`.ActionHandler`)
@@ -15,15 +17,14 @@ entry point of the simulation. It coordinates all simulation components:
 The environment is highly configurable through Hydra configuration files.
 """
 import numpy as np
-from pettingzoo import AECEnv
-# import agent_selector or AgentSelector depending on python version
+from pettingzoo import AECEnv, ParallelEnv
+# The agent selector class was renamed in PettingZoo 1.25, the name is
+# resolved once here so the environment only uses AgentSelector
 try:
-    # Python 3.13+
-    from pettingzoo.utils.agent_selector import (
-        AgentSelector as agent_selector)
+    from pettingzoo.utils.agent_selector import AgentSelector
 except ImportError:
-    # Python 3.12 and below
-    from pettingzoo.utils import agent_selector
+    # PettingZoo 1.24 and below
+    from pettingzoo.utils import agent_selector as AgentSelector
 from gymnasium.spaces import Discrete
 
 
@@ -43,8 +44,6 @@ class GardenersEnv(AECEnv):
                 number generator for reproducible experiments.
             grid_world (:py:class:`.GridWorld`): The simulated 2D grid world
                 environment.
-            prev_grid_world (:py:class:`.GridWorld`): Copy of the previous grid
-                world state.
             action_enum (:py:class:`._ActionEnum`): Enumeration of possible
                 actions in the environment.
             possible_agents (list): List of all agent IDs in the environment.
@@ -60,15 +59,30 @@ class GardenersEnv(AECEnv):
             renderers (list): List of renderer objects for visualization.
             num_iter (int): Maximum number of iterations for the simulation.
             render_mode (str): Current rendering mode ('human' or 'none').
-            observations (dict): Current observations for all agents.
+            render_per_turn (bool): Whether the environment is only rendered
+                at the end of each turn, and of the episode, when render_mode
+                is not 'human'. Otherwise, it is rendered after each action.
+            observations (dict): Last observations computed for all agents.
+                The observations of the agents in :py:attr:`_stale_agents`
+                are out of date, :py:meth:`observe` recomputes them.
             rewards (dict): Current rewards for all agents.
             terminations (dict): Terminal state flags for all agents.
             truncations (dict): Truncation flags for all agents.
-            infos (dict): Additional information for all agents.
+            infos (dict): Additional information for all agents. Once an
+                agent has acted, its info has the following keys:
+
+                - 'rewards': The reward dict for the agent containing each
+                  reward component ('ecology', 'wellbeing', 'biodiversity')
+                  and the total reward ('total'), as computed by
+                  :py:meth:`.RewardFunctions.compute_reward`.
+                - 'action_valid': Whether the last action of the agent was
+                  valid.
             num_moves (int): Current number of moves executed in the
                 simulation.
             actions_in_current_turn (int): Number of actions taken in the
                 current turn.
+            _stale_agents (set): IDs of the agents whose observation has
+                changed since it was last computed.
         """
     metadata = {
         'render_modes': ['human', 'none'],
@@ -77,7 +91,8 @@ class GardenersEnv(AECEnv):
 
     def __init__(self, random_generator, grid_world, action_enum, num_iter,
                  render_mode, action_handler, observation_strategy,
-                 reward_functions, metrics_collector, renderers):
+                 reward_functions, metrics_collector, renderers,
+                 render_per_turn=False):
         """
         Create the Ethical Gardeners environment.
 
@@ -103,6 +118,10 @@ class GardenersEnv(AECEnv):
             metrics_collector (:py:class:`.MetricsCollector`): Collector for
                 simulation metrics.
             renderers (list): List of renderer objects for visualization.
+            render_per_turn (bool, optional): Whether to only render the
+                environment at the end of each turn when render_mode is not
+                'human', e.g. to record one video frame per turn. Defaults to
+                False, which renders it after each action.
         """
         super().__init__()
 
@@ -115,13 +134,23 @@ class GardenersEnv(AECEnv):
         # Set PettingZoo parameters
         self.num_iter = num_iter
         self.render_mode = render_mode
+        self.render_per_turn = render_per_turn
         self.possible_agents = [f"agent_{i}" for i in
                                 range(len(self.grid_world.agents))]
         self.agents = {self.possible_agents[i]: self.grid_world.agents[i] for i
                        in range(len(self.grid_world.agents))}
 
+        # The agents always act in the same order, so the agent selector is
+        # created once and rewound at each reset
+        self._agent_selector = AgentSelector(self.possible_agents)
+
         # Set environment components
         self.action_enum = action_enum
+        # The actions are looked up by value at each step and the action
+        # space is the same for all agents, so both are built once
+        self._actions_by_value = {action.value: action
+                                  for action in action_enum}
+        self._action_space = Discrete(len(action_enum))
         self.action_handler = action_handler
         self.observation_strategy = observation_strategy
         self.reward_functions = reward_functions
@@ -146,7 +175,7 @@ class GardenersEnv(AECEnv):
             gymnasium.spaces.Discrete: The action space for the specified
             agent.
         """
-        return Discrete(len(self.action_enum))
+        return self._action_space
 
     def observation_space(self, agent_id):
         """
@@ -184,9 +213,8 @@ class GardenersEnv(AECEnv):
                 - observations (dict): Initial observations for all agents.
                 - infos (dict): Additional information for all agents.
         """
-        # Initialise the agent selector
-        self._agent_selector = agent_selector(self.possible_agents)
-        self.agent_selection = self._agent_selector.next()
+        # Select the first agent
+        self.agent_selection = self._agent_selector.reset()
 
         # Set the random generator if a seed is provided
         if seed is not None:
@@ -212,29 +240,24 @@ class GardenersEnv(AECEnv):
         # Reset the counter of actions in the turn
         self.actions_in_current_turn = 0
 
-        # Save the previous grid world state for rewards calculation
-        self.prev_grid_world = self.grid_world.copy()
-
         # Initialise needed data structures for all agents
-        self.observations = {agent_id: None for agent_id in
-                             self.possible_agents}
-        self.rewards = {agent_id: 0 for agent_id in self.possible_agents}
-        self.terminations = {agent_id: False for agent_id in
-                             self.possible_agents}
-        self.truncations = {agent_id: False for agent_id in
-                            self.possible_agents}
+        self.rewards = dict.fromkeys(self.possible_agents, 0)
+        self.terminations = dict.fromkeys(self.possible_agents, False)
+        self.truncations = dict.fromkeys(self.possible_agents, False)
         self.infos = {agent_id: {} for agent_id in self.possible_agents}
-
-        # Update action masks for all agents
-        for agent_id in self.possible_agents:
-            self.action_handler.update_action_mask(self.agents[agent_id])
-
-        # Initialise the observations for all agents
-        for agent_id in self.possible_agents:
+        self._num_active_agents = len(self.possible_agents)
+
+        # Update the action masks and initialise the observations for all
+        # agents
+        observations = self._get_observations(self.possible_agents)
+        self.observations = {}
+        for agent_id, agent in self.agents.items():
+            self.action_handler.update_action_mask(agent)
             self.observations[agent_id] = {
-                "observation": self._get_observations(agent_id),
-                "action_mask": self.agents[agent_id].action_mask
+                "observation": observations[agent_id],
+                "action_mask": agent.action_mask
             }
+        self._stale_agents = set()
 
         return self.observations, self.infos
 
@@ -247,7 +270,14 @@ class GardenersEnv(AECEnv):
         updates metrics, and selects the next agent to act.
 
         If all agents have taken an action in the current turn, it updates the
-        environmental conditions (pollution, flower growth).
+        environmental conditions (pollution, flower growth), the action
+        masks of all agents. Otherwise, only the action masks of the agents
+        next to the cells changed by the action are updated. The observations
+        in which a changed cell is visible are only recomputed when they are
+        observed.
+
+        The environment is rendered after each action in 'human' render mode,
+        and once per turn otherwise.
 
         Args:
             action (int): The action to take for the current agent.
@@ -263,36 +293,56 @@ class GardenersEnv(AECEnv):
         agent_id = self.agent_selection
         agent = self.agents[agent_id]
 
-        # Handle the action for the agent
-        action_enum_value = list(self.action_enum)[action]
-        self.action_handler.handle_action(agent, action_enum_value)
+        # Save the cell of the agent for the rewards, then handle the action
+        old_position = agent.position
+        snapshot = self.grid_world.snapshot(old_position)
+        action_enum_value = self._actions_by_value[action]
+        action_valid = self.action_handler.handle_action(agent,
+                                                         action_enum_value)
 
         # Increment action counter for the current turn
         self.actions_in_current_turn += 1
 
-        # Count active agents (those that are not terminated or truncated)
-        active_agents = sum(1 for a in self.possible_agents if
-                            not (self.terminations[a] or self.truncations[a]))
-
-        # Update pollution once all active agents have acted
-        if self.actions_in_current_turn >= active_agents:
+        # Update pollution once all active agents have acted. The growth of
+        # the flowers can change the action masks of all agents, otherwise
+        # only the cells the agent left, entered or acted on have changed.
+        end_of_turn = self.actions_in_current_turn >= self._num_active_agents
+        if end_of_turn:
             self.grid_world.update_cell()
             self.actions_in_current_turn = 0
-
-        # Update observation and action mask for all agents
-        for ag_id in self.possible_agents:
-            ag = self.agents[ag_id]
-            self.action_handler.update_action_mask(ag)
-
+            changed_cells = None
+            masks_to_update = self.possible_agents
+        else:
+            changed_cells = {old_position, agent.position}
+            masks_to_update = self._agents_near(changed_cells)
+
+        for ag_id in masks_to_update:
+            agent_to_update = self.agents[ag_id]
+            self.action_handler.update_action_mask(agent_to_update)
             self.observations[ag_id] = {
-                "observation": self._get_observations(ag_id),
-                "action_mask": ag.action_mask
+                "observation": self.observations[ag_id]["observation"],
+                "action_mask": agent_to_update.action_mask
             }
 
+        # Mark the observations in which a changed cell is visible as stale,
+        # the other ones are kept from the previous step
+        if changed_cells is None:
+            self._stale_agents.update(self.possible_agents)
+        else:
+            self._stale_agents.update(
+                ag_id for ag_id, ag in self.agents.items()
+                if any(self.observation_strategy.is_visible(ag, cell)
+                       for cell in changed_cells)
+            )
+
         # Update the rewards, and info for the agent
-        rewards = self._get_rewards(agent_id, action_enum_value)
+        rewards = self.reward_functions.compute_reward(
+            snapshot, self.grid_world, agent, action_enum_value)
         self.rewards[agent_id] = rewards['total']
-        self.infos[agent_id] = self._get_info(agent_id, rewards)
+        self.infos[agent_id] = {
+            'rewards': rewards,
+            'action_valid': action_valid,
+        }
 
         # Update metrics
         self.metrics_collector.update_metrics(
@@ -302,28 +352,30 @@ class GardenersEnv(AECEnv):
         )
 
         # Export and send metrics if configured
-        self.metrics_collector.export_metrics()
-        self.metrics_collector.send_metrics()
-
-        # Save the current grid world state for the next step
-        self.prev_grid_world = self.grid_world.copy()
+        if self.metrics_collector.export_on:
+            self.metrics_collector.export_metrics()
+        if self.metrics_collector.send_on:
+            self.metrics_collector.send_metrics()
 
         self.num_moves += 1
 
-        # Check if the agent has reached a terminal state
-        self.truncations = {agent: self.num_moves >= self.num_iter
-                            for agent in self.possible_agents}
+        # The flags of the agents only change when the episode is truncated
+        if self.num_moves >= self.num_iter:
+            self.truncations = {agent: True for agent in self.possible_agents}
+            self._num_active_agents = 0
 
-        # Check if the episode is done for all agents
-        if all(self.terminations[agent] or self.truncations[agent]
-               for agent in self.possible_agents):
             # Finalize metrics for the episode
             self.metrics_collector.finish_episode()
 
         # Selects the next agent
         self.agent_selection = self._agent_selector.next()
 
-        self.render()
+        # When rendering per turn without a display, the environment is only
+        # rendered at the end of a turn, and after the last action of an
+        # episode that ends mid-turn
+        if (self.render_mode == "human" or not self.render_per_turn
+                or end_of_turn or self.num_moves >= self.num_iter):
+            self.render()
 
         return self.observe(self.agent_selection)
 
@@ -339,6 +391,14 @@ class GardenersEnv(AECEnv):
                 - observation: The agent's view of the environment.
                 - action_mask: Binary mask indicating valid actions.
         """
+        if agent_id in self._stale_agents:
+            self._stale_agents.discard(agent_id)
+            self.observations[agent_id] = {
+                "observation": self._get_observations(
+                    [agent_id])[agent_id],
+                "action_mask": self.agents[agent_id].action_mask
+            }
+
         return self.observations[agent_id]
 
     def render(self):
@@ -365,79 +425,52 @@ class GardenersEnv(AECEnv):
 
         self.metrics_collector.close()
 
-    def _get_observations(self, agent_id):
+    def _get_observations(self, agent_ids):
         """
-        Generate the observation for a specific agent.
+        Generate the observations of several agents.
 
         This method delegates to the observation strategy to generate the
-        appropriate observation based on the agent's configured observation
-        type.
-
-        Args:
-            agent_id (str): The ID of the agent to generate the observation
-                for.
-
-        Returns:
-            object: The observation for the specified agent.
-        """
-        agent = self.agents[agent_id]
-        return self.observation_strategy.get_observation(self.grid_world,
-                                                         agent)
+        appropriate observations based on the configured observation type.
+        The observations are generated in one call so that the strategy can
+        share work between the agents.
 
-    def _get_rewards(self, agent_id, action):
-        """
-        Calculate the rewards for a specific agent.
-
-        This method delegates to the reward functions to calculate the
-        appropriate rewards based on the agent's actions and changes in the
-        environment.
+        The observations are kept until they become stale and returned by
+        each call to :py:meth:`observe` without being copied, so they are
+        made read-only to protect them from changes by the caller.
 
         Args:
-            agent_id (str): The ID of the agent to calculate rewards for.
-            action (:py:class:`._ActionEnum`): The action taken by the agent.
+            agent_ids (list): The IDs of the agents to generate the
+                observations for.
 
         Returns:
-            dict: Dictionary of reward components and total reward with the
-            following keys:
-                - 'total': The mono-objective reward for the agent. Computed
-                  as the average of all reward components.
-                - 'ecology': The ecological reward component.
-                - 'wellbeing': The wellbeing reward component.
-                - 'biodiversity': The biodiversity reward component.
-        """
-        # get the agent from its ID
-        agent = self.agents[agent_id]
-
-        # Compute the rewards
-        rewards = self.reward_functions.compute_reward(
-            self.prev_grid_world,
-            self.grid_world,
-            agent,
-            action
-        )
-
-        return rewards
-
-    def _get_info(self, agent_id, rewards):
+            dict: Mapping from the agent IDs to their observation.
+        """
+        agents = [self.agents[agent_id] for agent_id in agent_ids]
+        observations = self.observation_strategy.get_observations(
+            self.grid_world, agents)
+        for observation in observations:
+            observation.flags.writeable = False
+        return dict(zip(agent_ids, observations))
+
+    def _agents_near(self, cells):
         """
-        Generate additional information for a specific agent.
+        Return the agents whose action mask depends on the given cells.
 
-        This method creates a dictionary of additional information that is
-        provided alongside the observation and reward.
+        The action mask of an agent depends on its own cell and on the cells
+        it can move to, so the agents on or next to the given cells are
+        returned.
 
         Args:
-            agent_id (str): The ID of the agent to generate info for.
-            rewards (dict): The reward components for the agent.
+            cells (set): Positions of the cells, as (row, col) tuples.
 
         Returns:
-            dict: Additional information for the specified agent with the
-            following keys:
-                - 'rewards': The reward dict for the agent containing each
-                  reward component and the total reward.
+            list: The IDs of the agents on or next to one of the cells.
         """
-        return {
-            'rewards': rewards,
-        }
+        return [
+            agent_id for agent_id, agent in self.agents.items()
+            if any(abs(agent.row - row) + abs(agent.col - col) <= 1
+                   for row, col in cells)
+        ]
 
     def last(self):
         """
@@ -459,10 +492,10 @@ class GardenersEnv(AECEnv):
                 - termination (bool): Whether the agent is in a terminal state.
                 - truncation (bool): Whether the episode was truncated.
                 - info (dict): Additional information about the agent. Refer to
-                  :py:meth:`_get_info` for details on the returned value.
+                  :py:attr:`infos` for details on the returned value.
         """
         agent_id = self.agent_selection
-        observation = self.observations[agent_id]
+        observation = self.observe(agent_id)
         reward = self.rewards[agent_id]
         termination = self.terminations[agent_id]
         truncation = self.truncations[agent_id]
@@ -484,3 +517,294 @@ class GardenersEnv(AECEnv):
         agent_id = self.agent_selection
         self.rewards[agent_id] = 0
         self._agent_selector.next()
+
+
+class GardenersParallelEnv(ParallelEnv):
+    """
+        Environment class implementing the PettingZoo ParallelEnv interface.
+
+        This class runs the same simulation as :py:class:`GardenersEnv`, but
+        each call to :py:meth:`step` takes the actions of all agents for a
+        whole turn. The actions are applied in the order of
+        `possible_agents`, then the environmental conditions are updated once
+        and the observations, rewards and infos of all agents are computed in
+        a single pass.
+
+        The environment can be converted to the AEC interface with
+        :py:func:`pettingzoo.utils.conversions.parallel_to_aec`.
+
+        Attributes:
+            metadata (dict): Environment metadata for PettingZoo compatibility.
+            random_generator (:py:class:`numpy.random.RandomState`): Random
+                number generator for reproducible experiments.
+            grid_world (:py:class:`.GridWorld`): The simulated 2D grid world
+                environment.
+            action_enum (:py:class:`._ActionEnum`): Enumeration of possible
+                actions in the environment.
+            possible_agents (list): List of all agent IDs in the environment.
+            agents (list): List of the IDs of the agents still acting. It is
+                emptied at the end of the episode.
+            agents_by_id (dict): Mapping from agent IDs to Agent objects.
+            action_handler (:py:class:`.ActionHandler`): Handler for processing
+                agent actions.
+            observation_strategy (:py:class:`.ObservationStrategy`): Strategy
+                for generating agent observations.
+            reward_functions (:py:class:`.RewardFunctions`): Functions for
+                calculating agent rewards.
+            metrics_collector (:py:class:`.MetricsCollector`): Collector for
+                simulation metrics.
+            renderers (list): List of renderer objects for visualization.
+            num_iter (int): Maximum number of actions for the simulation,
+                counted over all agents as in :py:class:`GardenersEnv`.
+            render_mode (str): Current rendering mode ('human' or 'none').
+            num_moves (int): Current number of actions executed in the
+                simulation.
+        """
+    metadata = {
+        'render_modes': ['human', 'none'],
+        'name': "ethical_gardeners_parallel"
+    }
+
+    def __init__(self, random_generator, grid_world, action_enum, num_iter,
+                 render_mode, action_handler, observation_strategy,
+                 reward_functions, metrics_collector, renderers):
+        """
+        Create the parallel Ethical Gardeners environment.
+
+        Args:
+            random_generator (:py:class:`.numpy.random.RandomState`): Random
+                number generator for reproducibility.
+            grid_world (:py:class:`.GridWorld`): The grid world representing
+                the simulation environment.
+            action_enum (:py:class:`._ActionEnum`): Enumeration of possible
+                actions in the environment.
+            num_iter (int): Maximum number of actions for the simulation.
+            render_mode (str): Rendering mode for the environment ('human' or
+                'none').
+            action_handler (:py:class:`.ActionHandler`): Handler for processing
+                agent actions.
+            observation_strategy (:py:class:`.ObservationStrategy`): Strategy
+                for generating agent observations.
+            reward_functions (:py:class:`.RewardFunctions`): Functions for
+                calculating agent rewards.
+            metrics_collector (:py:class:`.MetricsCollector`): Collector for
+                simulation metrics.
+            renderers (list): List of renderer objects for visualization.
+        """
+        self.random_generator = random_generator
+        self.grid_world = grid_world
+
+        # Set PettingZoo parameters
+        self.num_iter = num_iter
+        self.render_mode = render_mode
+        self.possible_agents = [f"agent_{i}" for i in
+                                range(len(self.grid_world.agents))]
+        self.agents = self.possible_agents[:]
+        self.agents_by_id = dict(zip(self.possible_agents,
+                                     self.grid_world.agents))
+
+        # Set environment components
+        self.action_enum = action_enum
+        # The actions are looked up by value at each step and the action
+        # space is the same for all agents, so both are built once
+        self._actions_by_value = {action.value: action
+                                  for action in action_enum}
+        self._action_space = Discrete(len(action_enum))
+        self.action_handler = action_handler
+        self.observation_strategy = observation_strategy
+        # PettingZoo expects the same space object at each call, so the
+        # observation spaces are built once per agent
+        self._observation_spaces = {
+            agent_id: observation_strategy.observation_space(agent)
+            for agent_id, agent in self.agents_by_id.items()
+        }
+        self.reward_functions = reward_functions
+        self.metrics_collector = metrics_collector
+        self.renderers = renderers
+
+        for renderer in self.renderers:
+            renderer.init(self.grid_world)
+
+    def action_space(self, agent_id):
+        """
+        Return the action space for a specific agent.
+
+        Args:
+            agent_id (str): The ID of the agent to get the action space for.
+
+        Returns:
+            gymnasium.spaces.Discrete: The action space for the specified
+            agent.
+        """
+        return self._action_space
+
+    def observation_space(self, agent_id):
+        """
+        Return the observation space for a specific agent.
+
+        Args:
+            agent_id (str): The ID of the agent to get the observation space
+                for.
+
+        Returns:
+            gymnasium.spaces.Space: The observation space for the specified
+            agent.
+        """
+        return self._observation_spaces[agent_id]
+
+    def reset(self, seed=None, options=None):
+        """
+        Reset the environment to its initial state.
+
+        Args:
+            seed (int, optional): Random seed for environment initialization.
+            options (dict, optional): Additional options for reset
+                customization.
+
+        Returns:
+            tuple: A tuple containing:
+                - observations (dict): Initial observations for all agents.
+                - infos (dict): Additional information for all agents.
+        """
+        if seed is not None:
+            self.random_generator = np.random.RandomState(seed)
+
+        self.grid_world.reset(self.random_generator)
+
+        self.agents = self.possible_agents[:]
+        self.agents_by_id = dict(zip(self.possible_agents,
+                                     self.grid_world.agents))
+
+        for renderer in self.renderers:
+            renderer.init(self.grid_world)
+
+        self.metrics_collector.reset_metrics()
+        self.num_moves = 0
+
+        observations = self._get_observations()
+        infos = {agent_id: {} for agent_id in self.possible_agents}
+
+        return observations, infos
+
+    def step(self, actions: dict):
+        """
+        Execute a turn in which every agent takes its action.
+
+        The actions are handled in the order of `possible_agents`; agents
+        missing from `actions` do not act. The environmental conditions
+        (pollution, flower growth) are then updated once, and the rewards,
+        observations and action masks of all agents are computed.
+
+        Args:
+            actions (dict): Mapping from agent IDs to the action they take.
+
+        Returns:
+            tuple: A tuple containing:
+                - observations (dict): The observation of each agent, see
+                  :py:meth:`GardenersEnv.observe`.
+                - rewards (dict): The total reward of each acting agent.
+                - terminations (dict): Terminal state flag of each agent.
+                - truncations (dict): Truncation flag of each agent.
+                - infos (dict): Additional information about each acting
+                  agent, see :py:attr:`GardenersEnv.infos`.
+        """
+        acting_agents = [agent_id for agent_id in self.agents
+                         if agent_id in actions]
+
+        # Handle the actions in a fixed order, saving the cell of each agent
+        # before its action for the rewards
+        action_enum_values = {}
+        actions_valid = {}
+        snapshots = {}
+        for agent_id in acting_agents:
+            agent = self.agents_by_id[agent_id]
+            action_enum_value = self._actions_by_value[actions[agent_id]]
+            action_enum_values[agent_id] = action_enum_value
+            snapshots[agent_id] = self.grid_world.snapshot(agent.position)
+            actions_valid[agent_id] = self.action_handler.handle_action(
+                agent, action_enum_value)
+
+        # Update pollution and flowers once for the whole turn
+        self.grid_world.update_cell()
+
+        observations = self._get_observations()
+
+        rewards = {}
+        infos = {}
+        for agent_id in acting_agents:
+            agent_rewards = self.reward_functions.compute_reward(
+                snapshots[agent_id],
+                self.grid_world,
+                self.agents_by_id[agent_id],
+                action_enum_values[agent_id]
+            )
+            rewards[agent_id] = agent_rewards['total']
+            infos[agent_id] = {
+                'rewards': agent_rewards,
+                'action_valid': actions_valid[agent_id],
+            }
+
+        self.metrics_collector.update_metrics(self.grid_world, rewards,
+                                              None)
+        if self.metrics_collector.export_on:
+            self.metrics_collector.export_metrics()
+        if self.metrics_collector.send_on:
+            self.metrics_collector.send_metrics()
+
+        self.num_moves += len(acting_agents)
+        truncated = self.num_moves >= self.num_iter
+        terminations = {agent_id: False for agent_id in self.agents}
+        truncations = {agent_id: truncated for agent_id in self.agents}
+
+        if truncated:
+            self.metrics_collector.finish_episode()
+            self.agents = []
+
+        self.render()
+
+        return observations, rewards, terminations, truncations, infos
+
+    def render(self):
+        """
+        Render the current state of the environment with all configured
+        renderers.
+        """
+        for renderer in self.renderers:
+            renderer.render(self.grid_world, self.agents_by_id)
+
+            if self.render_mode == "human":
+                renderer.display_render()
+
+    def close(self):
+        """
+        Close the environment, finalizing all renderers and the metrics
+        collector.
+        """
+        for renderer in self.renderers:
+            renderer.end_render()
+
+        self.metrics_collector.close()
+
+    def _get_observations(self):
+        """
+        Update the action masks and generate the observations of all agents.
+
+        Returns:
+            dict: The observation of each agent, containing:
+                - observation: The agent's view of the environment.
+                - action_mask: Binary mask indicating valid actions.
+        """
+        agents = list(self.agents_by_id.values())
+        agent_observations = self.observation_strategy.get_observations(
+            self.grid_world, agents)
+
+        observations = {}
+        for agent_id, agent, observation in zip(self.agents_by_id, agents,
+                                                agent_observations):
+            self.action_handler.update_action_mask(agent)
+            observations[agent_id] = {
+                "observation": observation,
+                "action_mask": agent.action_mask
+            }
+
+        return observations
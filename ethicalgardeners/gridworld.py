@@ -8,7 +8,9 @@ where agents (gardeners) interact with the world. The environment consists of:
 1. A 2D grid of cells (:py:class:`Cell`) - Each cell represents a physical
 location that can be of different types (:py:class:`CellType`). The cells
 have a pollution level that evolves over time, depending on whether they
-contain flowers or not.
+contain flowers or not. The state of the cells is stored by the
+:py:class:`GridWorld` in one NumPy array per attribute, the cells being views
+on these arrays.
 
 2. Flowers (:py:class:`Flower`) - Plants that agents can grow in ground cells:
 
@@ -27,15 +29,19 @@ the environment:
 
 The GridWorld provides methods to initialize the environment (from file,
 randomly, or programmatically), place and manage agents and flowers,
-update environmental conditions, and validate agent actions.
+update environmental conditions, and validate agent actions. The state of a
+cell before an action can be saved in a :py:class:`GridSnapshot`.
 """
-from enum import Enum
+from enum import IntEnum
 import copy
+from typing import NamedTuple
 
 import numpy as np
 
 from ethicalgardeners.agent import Agent
 from ethicalgardeners.constants import MIN_SEED_RETURNS, MAX_SEED_RETURNS
+from ethicalgardeners.kernels import (PARALLEL_MIN_CELLS, step_grid,
+                                      step_grid_serial)
 
 
 class GridWorld:
@@ -69,8 +75,45 @@ class GridWorld:
         flowers_data (dict): Configuration data for different types of flowers.
         collisions_on (bool): Whether agents can occupy the same cell
             simultaneously.
+        pollution_reductions (:py:class:`numpy.ndarray`): 2D array of the
+            pollution reduction of each flower type (rows) at each growth
+            stage (columns), built from :py:attr:`flowers_data`.
+        max_growth_stages (:py:class:`numpy.ndarray`): Last growth stage of
+            each flower type.
+        flower_prices (:py:class:`numpy.ndarray`): Price of each flower type,
+            built from :py:attr:`flowers_data`.
+        cell_types (:py:class:`numpy.ndarray`): 2D array of the
+            :py:class:`CellType` value of each cell.
+        pollution (:py:class:`numpy.ndarray`): 2D array of the pollution level
+            of each cell. The value of obstacle cells is meaningless. The
+            levels are stored as bytes when they are always integers between
+            0 and 255, see :py:meth:`_pollution_dtype`, and as 64-bit floats
+            otherwise. Setting the pollution of a cell to a level that does
+            not fit in bytes stores all the levels as floats.
+        flower_types (:py:class:`numpy.ndarray`): 2D array of the type of the
+            flower in each cell, -1 if the cell has no flower.
+        growth_stages (:py:class:`numpy.ndarray`): 2D array of the growth
+            stage of the flower in each cell, 0 if the cell has no flower.
+        flowers (:py:class:`numpy.ndarray`): 2D array of the
+            :py:class:`Flower` object in each cell, None if the cell has no
+            flower.
+        cell_agents (:py:class:`numpy.ndarray`): 2D array of the
+            :py:class:`.Agent` object in each cell, None if the cell is not
+            occupied.
+        occupancy (:py:class:`numpy.ndarray`): 2D array of the number of
+            agents in each cell, used to check moves without reading the
+            :py:attr:`cell_agents` objects.
+        cell_agent_indices (:py:class:`numpy.ndarray`): 2D array of the index
+            in :py:attr:`agents` of the agent in each cell, -1 if the cell is
+            not occupied.
         grid (list): 2D array of Cell objects representing the environment.
+            Each cell is a view on the arrays above at its position. The
+            views are only created when a cell is first accessed, see
+            :py:meth:`get_cell`, and the first access to the grid creates the
+            views of all the cells.
         agents (list): List of all Agent objects in the environment.
+        agent_indices (dict): Mapping from each placed :py:class:`.Agent` to
+            its index in :py:attr:`agents`.
     """
 
     def __init__(self, init_method, init_config, width=10, height=10,
@@ -110,8 +153,9 @@ class GridWorld:
             random_generator (:py:class:`numpy.random.RandomState`, optional):
                 Custom random generator instance for reproducibility. If None,
                 uses the default random
-            grid (list, optional): 2D array of Cell objects representing the
-                environment. If None, initializes an empty grid.
+            grid (:py:class:`numpy.ndarray`, optional): 2D array of the
+                :py:class:`CellType` values of the cells of the environment.
+                If None, initializes a grid of ground cells.
             agents (list, optional): List of Agent objects to place in the
                 grid.
             flowers (list, optional): List of tuples representing flowers to
@@ -135,7 +179,33 @@ class GridWorld:
                 2: {'price': 2, 'pollution_reduction': [1]}
             }
 
-        self.flowers_data = flowers_data
+        # Copy the flowers data once into plain dictionaries and lists, as
+        # it is read each time a flower is created and may come from a much
+        # slower OmegaConf configuration
+        self.flowers_data = {
+            int(flower_type): dict(
+                data, pollution_reduction=list(data['pollution_reduction']))
+            for flower_type, data in flowers_data.items()
+        }
+
+        # Lookup table of the pollution reduction of each flower type at each
+        # growth stage
+        self.pollution_reductions = np.zeros(
+            (max(self.flowers_data) + 1,
+             max(len(data['pollution_reduction'])
+                 for data in self.flowers_data.values())),
+            dtype=np.float64
+        )
+        self.max_growth_stages = np.zeros(len(self.pollution_reductions),
+                                          dtype=np.uint8)
+        self.flower_prices = np.zeros(len(self.pollution_reductions),
+                                      dtype=np.float64)
+        for flower_type, data in self.flowers_data.items():
+            pollution_reduction = data['pollution_reduction']
+            self.pollution_reductions[
+                flower_type, :len(pollution_reduction)] = pollution_reduction
+            self.max_growth_stages[flower_type] = len(pollution_reduction) - 1
+            self.flower_prices[flower_type] = data['price']
 
         self.random_generator = random_generator if (
                 random_generator is not None) else np.random.RandomState()
@@ -150,9 +220,29 @@ class GridWorld:
         else:
             self.num_seeds_returned = num_seeds_returned
 
-        self.grid = grid if grid is not None else [[]]
+        if grid is None:
+            grid = np.full((height, width), CellType.GROUND, dtype=np.uint8)
+
+        # Structure of arrays holding the state of the cells
+        self.cell_types = np.array(grid, dtype=np.uint8)
+        shape = self.cell_types.shape
+        self.pollution = np.where(
+            self.cell_types == CellType.GROUND, 50, 0
+        ).astype(self._pollution_dtype(50))
+        self.flower_types = np.full(shape, -1, dtype=np.int8)
+        self.growth_stages = np.zeros(shape, dtype=np.uint8)
+        self.flowers = np.full(shape, None, dtype=object)
+        self.cell_agents = np.full(shape, None, dtype=object)
+        self.occupancy = np.zeros(shape, dtype=np.uint16)
+        self.cell_agent_indices = np.full(shape, -1, dtype=np.int16)
+
+        # Cell views created on demand, keyed by position, and the rows of
+        # all the views, built by the first access to the grid property
+        self._cells = {}
+        self._grid = None
 
         self.agents = []
+        self.agent_indices = {}
         # Place agents in the grid
         if agents is not None:
             for agent in agents:
@@ -218,9 +308,8 @@ class GridWorld:
         width = int(first_line[0])
         height = int(first_line[1])
 
-        # Initialize the grid with empty cells
-        grid = [[None for _ in range(width)] for _ in
-                range(height)]
+        # Initialize the grid with ground cells
+        grid = np.full((height, width), CellType.GROUND, dtype=np.uint8)
 
         # parse the grid
         agents_to_create = {}
@@ -229,18 +318,14 @@ class GridWorld:
         for i in range(height):
             cells = lines[i + 1].strip().split()
             for j, cell_code in enumerate(cells):
-                if cell_code == 'G':
-                    grid[i][j] = Cell(CellType.GROUND)
-                elif cell_code == 'O':
-                    grid[i][j] = Cell(CellType.OBSTACLE)
+                if cell_code == 'O':
+                    grid[i, j] = CellType.OBSTACLE
                 elif cell_code.startswith('F'):
-                    grid[i][j] = Cell(CellType.GROUND)
                     flower_info = cell_code[1:].split('_')
                     flower_type = int(flower_info[0])
                     growth_stage = int(flower_info[1])
                     flowers_to_create[(i, j)] = (flower_type, growth_stage)
                 elif cell_code.startswith('A'):
-                    grid[i][j] = Cell(CellType.GROUND)
                     agent_id = int(cell_code[1:])
                     agents_to_create[agent_id] = (i, j)
 
@@ -255,8 +340,7 @@ class GridWorld:
             position = agents_to_create[agent_id]
             money = float(agent_data[1])
             seed_counts = list(map(int, agent_data[2].split('|')))
-            seeds = {i: count for i, count in enumerate(seed_counts)}
-            agent = Agent(position, money, seeds)
+            agent = Agent(position, money, seed_counts)
             agents.append(agent)
 
         # Create flowers_data
@@ -326,36 +410,28 @@ class GridWorld:
                 random_generator is not None) else np.random.RandomState()
 
         # Initialize grid with ground cells
-        grid = [[Cell(CellType.GROUND) for _ in range(width)] for _ in
-                range(height)]
+        grid = np.full((height, width), CellType.GROUND, dtype=np.uint8)
 
-        # Create a list of all possible positions
-        valid_positions = [(i, j) for i in range(height) for j in
-                           range(width)]
-
-        # Place obstacles randomly
-        indices = np.arange(len(valid_positions))  # choice needs indices
+        # Place obstacles randomly, the cells are drawn by their flat index
         num_obstacles = int(init_config["obstacles_ratio"] * width * height)
-        selected_indices = random_generator.choice(indices,
+        obstacle_indices = random_generator.choice(width * height,
                                                    num_obstacles,
                                                    replace=False)
-        obstacle_positions = [valid_positions[i] for i in selected_indices]
+        grid.flat[obstacle_indices] = CellType.OBSTACLE
 
-        for pos in obstacle_positions:
-            i, j = pos
-            grid[i][j] = Cell(CellType.OBSTACLE)
-            valid_positions.remove(pos)
+        # Flat indices of the remaining ground cells, in row-major order
+        valid_indices = np.flatnonzero(grid == CellType.GROUND)
 
-        if len(valid_positions) < init_config["nb_agent"]:
+        if len(valid_indices) < init_config["nb_agent"]:
             raise ValueError(
                 f"Not enough valid positions for {init_config['nb_agent']}"
                 f" agents")
 
-        indices = np.arange(len(valid_positions))
-        selected_indices = random_generator.choice(indices,
+        selected_indices = random_generator.choice(len(valid_indices),
                                                    init_config["nb_agent"],
                                                    replace=False)
-        agent_positions = [valid_positions[i] for i in selected_indices]
+        rows, cols = np.divmod(valid_indices[selected_indices], width)
+        agent_positions = list(zip(rows.tolist(), cols.tolist()))
 
         agents = []
         for i in range(init_config["nb_agent"]):
@@ -407,7 +483,7 @@ class GridWorld:
                         'agents': [  # List of agents to create (optional:
                                      # money and seeds)
                             {'position': (row, col), 'money': float,
-                            'seeds': {0:int, 1:int, ...}},
+                            'seeds': {0:int, 1:int, ...} or [int, ...]},
                         ],
                         'flowers': [  # List of flowers to create (optional:
                                       # growth stage)
@@ -462,8 +538,7 @@ class GridWorld:
                                        None)
 
         # Initialize grid with ground cells
-        grid = [[Cell(CellType.GROUND) for _ in range(width)] for _ in
-                range(height)]
+        grid = np.full((height, width), CellType.GROUND, dtype=np.uint8)
 
         # Place special cells (obstacles, ...) based on the configuration
         for cell_info in grid_config.get('cells', []):
@@ -473,14 +548,14 @@ class GridWorld:
             # Convert string type to CellType enum
             cell_type = CellType[cell_type_str.upper()]
 
-            grid[position[0]][position[1]] = Cell(cell_type)
+            grid[position[0], position[1]] = cell_type
 
         # Create and place agents
         agents = []
         for agent_info in grid_config.get('agents', []):
             position = agent_info['position']
             money = agent_info.get('money', 0)
-            seeds = agent_info.get('seeds', {0: 10, 1: 10, 2: 10})
+            seeds = agent_info.get('seeds', [10, 10, 10])
             agent = Agent(position, money, seeds)
             agents.append(agent)
 
@@ -620,6 +695,8 @@ class GridWorld:
 
         # Replace this object's state with the new one.
         self.__dict__.update(new.__dict__)
+        for cell in self._cells.values():
+            cell._grid_world = self
         return self
 
     def place_agent(self, agent: Agent):
@@ -643,8 +720,40 @@ class GridWorld:
                              "collisions enabled.")
 
         cell.agent = agent
+        agent.cell = cell
+        self.occupancy[agent.row, agent.col] += 1
+        self.cell_agent_indices[agent.row, agent.col] = len(self.agents)
+        self.agent_indices[agent] = len(self.agents)
         self.agents.append(agent)
 
+    def move_agent(self, agent: Agent, new_position):
+        """
+        Move an agent of the grid from its current cell to a new position.
+
+        The agent is removed from its current cell and set as the agent of
+        the cell at the new position, and the :py:attr:`occupancy` and
+        :py:attr:`cell_agent_indices` of both cells are updated. The move is
+        not checked, see :py:meth:`valid_move`, and the position of the agent
+        itself is updated by :py:meth:`.Agent.move`.
+
+        Args:
+            agent (Agent): The agent to move.
+            new_position (tuple): The new (x, y) coordinates of the agent.
+        """
+        old_cell = agent.cell
+        if old_cell is None:
+            old_cell = self.get_cell(agent.position)
+        new_cell = self.get_cell(new_position)
+
+        self.occupancy[agent.row, agent.col] -= 1
+        self.occupancy[new_position[0], new_position[1]] += 1
+        self.cell_agent_indices[agent.row, agent.col] = -1
+        self.cell_agent_indices[new_position[0], new_position[1]] = (
+            self.agent_indices[agent])
+        old_cell.agent = None
+        new_cell.agent = agent
+        agent.cell = new_cell
+
     def place_flower(self, position, flower_type: int, agent: Agent = None,
                      growth_stage=0):
         """
@@ -699,15 +808,128 @@ class GridWorld:
         flower's pollution reduction value and make the flower grow. If it does
         not contain a flower, pollution increases by the pollution increment
         value.
+
+        If Numba is installed, the update is done in a single pass over the
+        grid by the compiled :py:func:`.kernels.step_grid` kernel, on several
+        threads for grids of at least :py:data:`.kernels.PARALLEL_MIN_CELLS`
+        cells.
+        """
+        if step_grid is not None:
+            kernel = (step_grid if self.cell_types.size >= PARALLEL_MIN_CELLS
+                      else step_grid_serial)
+            kernel(self.cell_types, self.flower_types, self.growth_stages,
+                   self.pollution, self.pollution_reductions,
+                   self.max_growth_stages, float(self.min_pollution),
+                   float(self.max_pollution), float(self.pollution_increment),
+                   int(CellType.GROUND))
+            return
+
+        # The masks are computed once and shared by both updates
+        has_flower = self.flower_types >= 0
+        flower_types = self.flower_types.clip(0)
+
+        # Update pollution level
+        self._update_pollution(has_flower, flower_types)
+
+        # Make the flowers grow by one stage, up to the last stage of their
+        # type
+        np.minimum(self.growth_stages + has_flower,
+                   self.max_growth_stages[flower_types],
+                   out=self.growth_stages)
+
+    def update_pollution(self):
+        """
+        Updates the pollution of all ground cells in the grid at once.
+
+        This is the vectorized equivalent of calling
+        :py:meth:`Cell.update_pollution` on every cell: cells with a flower
+        have their pollution decreased by the pollution reduction of the
+        flower at its current growth stage, down to :py:attr:`min_pollution`,
+        and other ground cells have their pollution increased by
+        :py:attr:`pollution_increment`, up to :py:attr:`max_pollution`.
         """
-        for row in self.grid:
-            for cell in row:
-                # Update pollution level
-                cell.update_pollution(self.min_pollution, self.max_pollution)
+        self._update_pollution(self.flower_types >= 0,
+                               self.flower_types.clip(0))
 
-                # If the cell has a flower, make it grow
-                if cell.has_flower():
-                    cell.flower.grow()
+    def _update_pollution(self, has_flower, flower_types):
+        """
+        Updates the pollution of all ground cells from precomputed masks.
+
+        Args:
+            has_flower (:py:class:`numpy.ndarray`): 2D boolean array of the
+                cells with a flower.
+            flower_types (:py:class:`numpy.ndarray`): 2D array of the flower
+                types, with 0 for cells without a flower so it can index the
+                lookup tables.
+        """
+        is_empty_ground = ((self.cell_types == CellType.GROUND)
+                           & ~has_flower)
+        reductions = self.pollution_reductions[flower_types,
+                                               self.growth_stages]
+
+        # The results are exact even when the pollution is stored as bytes,
+        # so they can be cast back unsafely
+        np.copyto(self.pollution,
+                  np.maximum(self.pollution - reductions, self.min_pollution),
+                  where=has_flower, casting='unsafe')
+        np.copyto(self.pollution,
+                  np.minimum(self.pollution + self.pollution_increment,
+                             self.max_pollution),
+                  where=is_empty_ground, casting='unsafe')
+
+    def _pollution_dtype(self, initial_pollution):
+        """
+        Choose the type of the :py:attr:`pollution` array.
+
+        The pollution starts at `initial_pollution` and only changes by the
+        pollution increment or by the pollution reductions of the flowers,
+        and is clipped to the pollution limits. If all these values are
+        integers and the pollution can never leave the 0 to 255 range, even
+        before being clipped, the levels are stored exactly in bytes, which
+        divides the memory used by the pollution by 8.
+
+        Args:
+            initial_pollution (float): Initial pollution of the ground cells.
+
+        Returns:
+            type: :py:class:`numpy.uint8` if the pollution levels fit in
+            bytes, :py:class:`numpy.float64` otherwise.
+        """
+        values = np.append(self.pollution_reductions,
+                           [initial_pollution, self.min_pollution,
+                            self.max_pollution, self.pollution_increment])
+        highest = (max(initial_pollution, self.max_pollution)
+                   + max(self.pollution_increment, 0))
+        if (np.array_equal(values, np.round(values)) and values.min() >= 0
+                and highest <= np.iinfo(np.uint8).max):
+            return np.uint8
+        return np.float64
+
+    def _widen_pollution(self):
+        """
+        Store the pollution levels as 64-bit floats, so that levels that are
+        not integers between 0 and 255 can be set.
+
+        The cell views are bound to the new :py:attr:`pollution` array.
+        """
+        self.pollution = self.pollution.astype(np.float64)
+        for cell in self._cells.values():
+            cell._pollution = self.pollution
+
+    def next_seed_return(self):
+        """
+        Draw the number of seeds returned by a harvest when it is random.
+
+        The number is drawn from :py:attr:`random_generator` at each call, so
+        that the generator is in the same state for the next draws (e.g., the
+        next random grid) as when the harvest was handled directly.
+
+        Returns:
+            int: A number of seeds between :py:const:`.MIN_SEED_RETURNS`
+            (included) and :py:const:`.MAX_SEED_RETURNS` (excluded).
+        """
+        return int(self.random_generator.randint(MIN_SEED_RETURNS,
+                                                 MAX_SEED_RETURNS))
 
     def valid_position(self, position):
         """
@@ -726,10 +948,8 @@ class GridWorld:
             bool: True if the position is valid, False otherwise.
         """
         if 0 <= position[0] < self.height and 0 <= position[1] < self.width:
-            if self.get_cell(position).can_walk_on():
-                return True
-            else:
-                return False
+            return bool(self.cell_types[position[0], position[1]] ==
+                        CellType.GROUND)
         else:
             return False
 
@@ -755,7 +975,7 @@ class GridWorld:
         if not self.valid_position(new_position):
             return False
         if self.collisions_on:
-            if self.get_cell(new_position).has_agent():
+            if self.occupancy[new_position[0], new_position[1]]:
                 return False
 
         return True
@@ -770,7 +990,43 @@ class GridWorld:
         Returns:
             Cell: The cell at the specified position.
         """
-        return self.grid[position[0]][position[1]]
+        position = (position[0], position[1])
+        cell = self._cells.get(position)
+        if cell is None:
+            cell = self._cells[position] = Cell.view(self, position)
+        return cell
+
+    @property
+    def grid(self):
+        # The views of all the cells are created by the first access, then
+        # the same rows are returned
+        if self._grid is None:
+            height, width = self.cell_types.shape
+            self._grid = [[self.get_cell((i, j)) for j in range(width)]
+                          for i in range(height)]
+        return self._grid
+
+    def snapshot(self, position):
+        """
+        Save the state of the cell at the specified position.
+
+        Unlike :py:meth:`copy`, this only reads the cell arrays at the given
+        position, so it does not depend on the size of the grid.
+
+        Args:
+            position (tuple): The (x, y) coordinates of the cell to save.
+
+        Returns:
+            GridSnapshot: The state of the cell.
+        """
+        row, col = position[0], position[1]
+        return GridSnapshot(
+            position=(row, col),
+            flower_type=int(self.flower_types[row, col]),
+            growth_stage=int(self.growth_stages[row, col]),
+            pollution=(None if self.cell_types[row, col] != CellType.GROUND
+                       else float(self.pollution[row, col]))
+        )
 
     def copy(self):
         """
@@ -782,10 +1038,43 @@ class GridWorld:
         return copy.deepcopy(self)
 
 
-class CellType(Enum):
+class GridSnapshot(NamedTuple):
+    """
+    State of a cell of a :py:class:`GridWorld` saved before an action.
+
+    Created by :py:meth:`GridWorld.snapshot`, it lets the reward functions
+    compare a cell before and after an action without copying the whole grid.
+
+    Attributes:
+        position (tuple): The (x, y) coordinates of the cell.
+        flower_type (int): The type of the flower of the cell, -1 if the cell
+            had no flower.
+        growth_stage (int): The growth stage of the flower of the cell.
+        pollution (float): The pollution of the cell, None for cells that are
+            not ground.
+    """
+    position: tuple
+    flower_type: int
+    growth_stage: int
+    pollution: float
+
+    def has_flower(self):
+        """
+        Check if the cell had a flower.
+
+        Returns:
+            bool: True if the cell had a flower, False otherwise.
+        """
+        return self.flower_type >= 0
+
+
+class CellType(IntEnum):
     """
     Enum representing the possible types of cells in the grid world.
 
+    The types are integers, so they can be compared directly with the
+    :py:attr:`GridWorld.cell_types` array.
+
     Attributes:
         GROUND: A normal cell where agents can walk, plant and harvest flowers.
         OBSTACLE: An impassable cell that agents cannot traverse or interact
@@ -804,6 +1093,12 @@ class Cell:
     It can have a pollution level that evolves over time to a speed defined by
     :py:attr:`pollution_increment`.
 
+    The state of a cell is not stored in the cell itself but in arrays: the
+    cells of a :py:class:`GridWorld` are views on the arrays of the grid (see
+    :py:meth:`view`), so reading or setting an attribute of a cell reads or
+    sets the entry of the grid arrays at the cell's position. A cell created
+    on its own is backed by 0-dimensional arrays and behaves the same way.
+
     Attributes:
         cell_type (CellType): Type of the cell (ground, obstacle).
         flower (Flower): The flower present in this cell, if any.
@@ -813,6 +1108,9 @@ class Cell:
             step if no flower is in the cell.
 
     """
+    __slots__ = ('_cell_types', '_pollution', '_flower_types',
+                 '_growth_stages', '_flowers', '_agents', '_index',
+                 '_grid_world', 'pollution_increment')
 
     def __init__(self, cell_type, pollution=50, pollution_increment=1):
         """
@@ -825,15 +1123,97 @@ class Cell:
             pollution_increment (float, optional): Amount by which pollution
                 increases each step if no flower is in the cell. Defaults to 1.
         """
-        self.cell_type = cell_type
-        self.flower = None
-        self.agent = None
+        self._bind(np.array(cell_type, dtype=np.uint8),
+                   np.array(0, dtype=np.float64),
+                   np.array(-1, dtype=np.int8),
+                   np.array(0, dtype=np.uint8),
+                   np.array(None, dtype=object),
+                   np.array(None, dtype=object),
+                   ())
+        self._grid_world = None
         if cell_type == CellType.GROUND:
             self.pollution = pollution
-        elif cell_type == CellType.OBSTACLE:
-            self.pollution = None
         self.pollution_increment = pollution_increment
 
+    @classmethod
+    def view(cls, grid_world, position):
+        """
+        Create a cell viewing the arrays of a grid world at a position.
+
+        Args:
+            grid_world (GridWorld): The grid world holding the arrays.
+            position (tuple): The (x, y) coordinates of the cell in the grid.
+
+        Returns:
+            Cell: A cell whose attributes are backed by the arrays of the grid
+            world.
+        """
+        cell = cls.__new__(cls)
+        cell._bind(grid_world.cell_types, grid_world.pollution,
+                   grid_world.flower_types, grid_world.growth_stages,
+                   grid_world.flowers, grid_world.cell_agents,
+                   (position[0], position[1]))
+        cell._grid_world = grid_world
+        cell.pollution_increment = grid_world.pollution_increment
+        return cell
+
+    def _bind(self, cell_types, pollution, flower_types, growth_stages,
+              flowers, agents, index):
+        self._cell_types = cell_types
+        self._pollution = pollution
+        self._flower_types = flower_types
+        self._growth_stages = growth_stages
+        self._flowers = flowers
+        self._agents = agents
+        self._index = index
+
+    @property
+    def cell_type(self):
+        return CellType(int(self._cell_types[self._index]))
+
+    @property
+    def pollution(self):
+        if self._cell_types[self._index] != CellType.GROUND:
+            return None
+        return self._pollution[self._index].item()
+
+    @pollution.setter
+    def pollution(self, pollution):
+        # A level that does not fit in the bytes of the grid would be
+        # truncated or overflow, so the grid switches to floats
+        if self._pollution.dtype == np.uint8 and not (
+                float(pollution).is_integer()
+                and 0 <= pollution <= np.iinfo(np.uint8).max):
+            self._grid_world._widen_pollution()
+            self._pollution = self._grid_world.pollution
+        self._pollution[self._index] = pollution
+
+    @property
+    def flower(self):
+        return self._flowers[self._index]
+
+    @flower.setter
+    def flower(self, flower):
+        previous_flower = self._flowers[self._index]
+        if previous_flower is not None and previous_flower is not flower:
+            previous_flower._detach()
+
+        self._flowers[self._index] = flower
+        if flower is None:
+            self._flower_types[self._index] = -1
+            self._growth_stages[self._index] = 0
+        else:
+            self._flower_types[self._index] = flower.flower_type
+            flower._attach(self._growth_stages, self._index)
+
+    @property
+    def agent(self):
+        return self._agents[self._index]
+
+    @agent.setter
+    def agent(self, agent):
+        self._agents[self._index] = agent
+
     def update_pollution(self, min_pollution, max_pollution):
         """
         Update the pollution level of the cell based on its current state.
@@ -869,7 +1249,7 @@ class Cell:
         Returns:
             bool: True if agents can walk on this cell, False otherwise.
         """
-        return self.cell_type == CellType.GROUND
+        return bool(self._cell_types[self._index] == CellType.GROUND)
 
     def can_plant_on(self):
         """
@@ -879,7 +1259,7 @@ class Cell:
             bool: True if a flower can be planted in this cell, False
             otherwise.
         """
-        return self.cell_type == CellType.GROUND and not self.has_flower()
+        return self.can_walk_on() and not self.has_flower()
 
     def has_flower(self):
         """
@@ -888,7 +1268,7 @@ class Cell:
         Returns:
             bool: True if the cell contains a flower, False otherwise.
         """
-        return self.flower is not None
+        return bool(self._flower_types[self._index] != -1)
 
     def has_agent(self):
         """
@@ -908,6 +1288,9 @@ class Flower:
     Different flower types have different growth patterns, prices, and
     pollution reduction capabilities.
 
+    Once planted in a cell, the growth stage of the flower is stored in the
+    growth stage array of the cell (see :py:class:`Cell`).
+
     Attributes:
         position (tuple): The (x, y) coordinates of the flower in the grid.
         flower_type (int): The type of flower, determining its growth and
@@ -915,12 +1298,16 @@ class Flower:
         price (float): The monetary value of the flower when harvested.
         pollution_reduction (list): List of pollution reduction values for each
             growth stage.
-        num_growth_stage (int): Total number of growth stages for this flower.
+        num_growth_stage (int): Index of the last growth stage of this flower,
+            i.e., the number of times it grows before being fully grown. It
+            is the last valid index of :py:attr:`pollution_reduction`.
         current_growth_stage (int): Current growth stage of the flower,
             starting at 0.
         planted_by (Agent, optional): The agent who planted the flower. Can be
             None if the flower was initially present in the environment.
     """
+    __slots__ = ('position', 'flower_type', 'price', 'pollution_reduction',
+                 'num_growth_stage', 'planted_by', '_growth_stages', '_index')
 
     def __init__(self, position, flower_type, flowers_data: dict,
                  agent: Agent = None, growth_stage=0):
@@ -938,15 +1325,36 @@ class Flower:
             growth_stage (int, optional): The number of growth stages for
                 this flower. Defaults to 0 (the initial stage).
         """
+        flower_data = flowers_data[flower_type]
         self.position = position
         self.flower_type = flower_type
-        self.price = flowers_data[flower_type]['price']
-        self.pollution_reduction = (
-            flowers_data)[flower_type]["pollution_reduction"]
+        self.price = flower_data['price']
+        self.pollution_reduction = flower_data['pollution_reduction']
         self.num_growth_stage = len(self.pollution_reduction) - 1
-        self.current_growth_stage = growth_stage
+        self._detach(growth_stage)
         self.planted_by = agent
 
+    def _attach(self, growth_stages, index):
+        # Move the growth stage to the growth stage array of a cell
+        growth_stages[index] = self.current_growth_stage
+        self._growth_stages = growth_stages
+        self._index = index
+
+    def _detach(self, growth_stage=None):
+        # Keep the growth stage in an array owned by the flower
+        if growth_stage is None:
+            growth_stage = self.current_growth_stage
+        self._growth_stages = np.array(growth_stage, dtype=np.uint8)
+        self._index = ()
+
+    @property
+    def current_growth_stage(self):
+        return int(self._growth_stages[self._index])
+
+    @current_growth_stage.setter
+    def current_growth_stage(self, growth_stage):
+        self._growth_stages[self._index] = growth_stage
+
     def grow(self):
         """
         Advance the flower to the next growth stage if not fully grown.
@@ -954,8 +1362,9 @@ class Flower:
         By default, the flower grows 1 stage at each time step, up to the
         maximum stage defined for this flower type.
         """
-        if self.current_growth_stage < self.num_growth_stage:
-            self.current_growth_stage += 1
+        growth_stage = self._growth_stages[self._index]
+        if growth_stage < self.num_growth_stage:
+            self._growth_stages[self._index] = growth_stage + 1
 
     def is_grown(self):
         """
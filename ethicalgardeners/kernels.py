@@ -0,0 +1,262 @@
+"""
+The kernels module provides compiled functions for the hot loops of the
+simulation.
+
+The kernels are compiled with `Numba <https://numba.pydata.org/>`_, which is
+an optional dependency (``pip install "ethical-gardeners[perf]"``). They work
+on the NumPy arrays of the :py:class:`.GridWorld` rather than on
+:py:class:`.Cell` objects. When Numba is not installed,
+:py:data:`NUMBA_AVAILABLE` is False and the kernels are set to None: callers
+then fall back to their pure NumPy implementation.
+"""
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+"""Whether Numba is installed and the kernels of this module are compiled."""
+
+
+def _step_grid(cell_types, flower_types, growth_stages, pollution,
+               pollution_reductions, max_growth_stages, min_pollution,
+               max_pollution, pollution_increment, ground):
+    """
+    Update the pollution and the flowers of all cells of a grid in place.
+
+    The pollution of a cell with a flower decreases by the pollution reduction
+    of the flower at its current growth stage, down to `min_pollution`, then
+    the flower grows by one stage up to its last stage. The pollution of an
+    empty ground cell increases by `pollution_increment`, up to
+    `max_pollution`.
+
+    Args:
+        cell_types (:py:class:`numpy.ndarray`): 2D array of the cell types.
+        flower_types (:py:class:`numpy.ndarray`): 2D array of the flower
+            types, -1 for cells without a flower.
+        growth_stages (:py:class:`numpy.ndarray`): 2D array of the growth
+            stages of the flowers.
+        pollution (:py:class:`numpy.ndarray`): 2D array of the pollution of
+            the cells.
+        pollution_reductions (:py:class:`numpy.ndarray`): 2D array of the
+            pollution reduction of each flower type at each growth stage.
+        max_growth_stages (:py:class:`numpy.ndarray`): Last growth stage of
+            each flower type.
+        min_pollution (float): Minimum pollution level allowed.
+        max_pollution (float): Maximum pollution level allowed.
+        pollution_increment (float): Amount by which pollution increases in
+            empty cells.
+        ground (int): Value of the ground cell type.
+    """
+    height, width = pollution.shape
+    for i in prange(height):
+        for j in range(width):
+            flower_type = flower_types[i, j]
+            if flower_type >= 0:
+                growth_stage = growth_stages[i, j]
+                pollution[i, j] = max(
+                    pollution[i, j]
+                    - pollution_reductions[flower_type, growth_stage],
+                    min_pollution
+                )
+                if growth_stage < max_growth_stages[flower_type]:
+                    growth_stages[i, j] = growth_stage + 1
+            elif cell_types[i, j] == ground:
+                pollution[i, j] = min(pollution[i, j] + pollution_increment,
+                                      max_pollution)
+
+
+step_grid = (njit(parallel=True, fastmath=True, cache=True)(_step_grid)
+             if NUMBA_AVAILABLE else None)
+"""Compiled version of :py:func:`_step_grid`, None if Numba is missing."""
+
+step_grid_serial = (njit(fastmath=True, cache=True)(_step_grid)
+                    if NUMBA_AVAILABLE else None)
+"""
+Compiled version of :py:func:`_step_grid` running on a single thread, None if
+Numba is missing.
+"""
+
+PARALLEL_MIN_CELLS = 10000
+"""
+Number of cells from which :py:data:`step_grid` is used instead of
+:py:data:`step_grid_serial`. On smaller grids, starting the threads costs more
+than the update itself.
+"""
+
+
+def _cell_features(out, cell_types, pollution, flower_types, growth_stages,
+                   max_growth_stages, num_cell_types, num_flower_types,
+                   min_pollution, max_pollution, ground):
+    """
+    Write the normalized cell type, pollution, flower type and growth stage
+    of a block of cells in the first 4 features of `out`.
+
+    The features are the ones of :py:class:`.TotalObservation`. The state
+    arrays are the blocks of the arrays of the :py:class:`.GridWorld` to
+    observe.
+
+    Args:
+        out (:py:class:`numpy.ndarray`): 3D output array of shape
+            ``(rows, columns, n)`` with n >= 4.
+        cell_types (:py:class:`numpy.ndarray`): 2D array of the cell types.
+        pollution (:py:class:`numpy.ndarray`): 2D array of the pollution of
+            the cells.
+        flower_types (:py:class:`numpy.ndarray`): 2D array of the flower
+            types, -1 for cells without a flower.
+        growth_stages (:py:class:`numpy.ndarray`): 2D array of the growth
+            stages of the flowers.
+        max_growth_stages (:py:class:`numpy.ndarray`): Last growth stage of
+            each flower type.
+        num_cell_types (int): Number of cell types.
+        num_flower_types (int): Number of flower types.
+        min_pollution (float): Minimum pollution level allowed.
+        max_pollution (float): Maximum pollution level allowed.
+        ground (int): Value of the ground cell type.
+    """
+    # The normalizations are done by multiplying with the inverse of the
+    # ranges, computed once for the block
+    inv_cell_types = 1.0 / num_cell_types
+    inv_pollution_range = 1.0 / (max_pollution - min_pollution)
+    inv_flower_types = 1.0 / max(num_flower_types, 1)
+    for i in range(cell_types.shape[0]):
+        for j in range(cell_types.shape[1]):
+            cell_type = cell_types[i, j]
+            out[i, j, 0] = cell_type * inv_cell_types
+            if cell_type == ground:
+                out[i, j, 1] = ((pollution[i, j] - min_pollution)
+                                * inv_pollution_range)
+            else:
+                out[i, j, 1] = 0.0
+            # +1 so that the features are not 0 when there is a flower
+            flower_type = flower_types[i, j]
+            if flower_type >= 0:
+                out[i, j, 2] = (flower_type + 1) * inv_flower_types
+                out[i, j, 3] = (growth_stages[i, j] + 1.0) / (
+                    max_growth_stages[flower_type] + 1.0)
+            else:
+                out[i, j, 2] = 0.0
+                out[i, j, 3] = 0.0
+
+
+cell_features = (njit(cache=True)(_cell_features)
+                 if NUMBA_AVAILABLE else None)
+"""Compiled version of :py:func:`_cell_features`, None if Numba is missing."""
+
+
+def _batched_step(actions, agent, positions, cell_types, grid_agent_id,
+                  flower_types, growth_stages, planted_by, seeds,
+                  flowers_planted, flowers_harvested, money,
+                  turns_without_income, max_growth_stages, prices,
+                  seed_returns, deltas, harvest, first_plant, collisions_on,
+                  ground, active, valid):
+    """
+    Apply the action of one agent in each environment of a batch in place.
+
+    The rules are the same as in :py:class:`.ActionHandler`: invalid moves,
+    harvests of missing or growing flowers and plantings without seeds or on
+    an occupied cell are ignored. The arrays are the state arrays of
+    :py:class:`.SyncVectorGardeners`.
+
+    Args:
+        actions (:py:class:`numpy.ndarray`): Action of each environment.
+        agent (int): Index of the agent that acts.
+        positions (:py:class:`numpy.ndarray`): Position of each agent.
+        cell_types (:py:class:`numpy.ndarray`): Type of each cell.
+        grid_agent_id (:py:class:`numpy.ndarray`): Index of the agent in each
+            cell, -1 for empty cells.
+        flower_types (:py:class:`numpy.ndarray`): Type of the flower of each
+            cell, -1 for cells without a flower.
+        growth_stages (:py:class:`numpy.ndarray`): Growth stage of the flower
+            of each cell.
+        planted_by (:py:class:`numpy.ndarray`): Index of the agent that planted
+            the flower of each cell, -1 if none.
+        seeds (:py:class:`numpy.ndarray`): Number of seeds of each agent by
+            flower type, -1 for infinite seeds.
+        flowers_planted (:py:class:`numpy.ndarray`): Number of flowers each
+            agent has planted by flower type.
+        flowers_harvested (:py:class:`numpy.ndarray`): Number of flowers each
+            agent has harvested by flower type.
+        money (:py:class:`numpy.ndarray`): Money of each agent.
+        turns_without_income (:py:class:`numpy.ndarray`): Number of turns each
+            agent has not earned money.
+        max_growth_stages (:py:class:`numpy.ndarray`): Last growth stage of
+            each flower type.
+        prices (:py:class:`numpy.ndarray`): Price of each flower type.
+        seed_returns (:py:class:`numpy.ndarray`): Number of seeds returned by
+            a harvest in each environment.
+        deltas (:py:class:`numpy.ndarray`): Position offset of each movement
+            action.
+        harvest (int): Value of the harvest action.
+        first_plant (int): Value of the planting action of the first flower
+            type.
+        collisions_on (bool): Whether agents cannot share a cell.
+        ground (int): Value of the ground cell type.
+        active (:py:class:`numpy.ndarray`): Whether each environment acts.
+            The agents of the other environments are skipped.
+        valid (:py:class:`numpy.ndarray`): Output array set to whether the
+            action of each environment was performed or ignored.
+    """
+    height, width = cell_types.shape[1], cell_types.shape[2]
+    for n in prange(actions.shape[0]):
+        if not active[n]:
+            valid[n] = False
+            continue
+        action = actions[n]
+        row = positions[n, agent, 0]
+        col = positions[n, agent, 1]
+        turns_without_income[n, agent] += 1
+        valid[n] = True
+
+        if action < deltas.shape[0]:
+            new_row = row + deltas[action, 0]
+            new_col = col + deltas[action, 1]
+            if (0 <= new_row < height and 0 <= new_col < width
+                    and cell_types[n, new_row, new_col] == ground
+                    and not (collisions_on
+                             and grid_agent_id[n, new_row, new_col] >= 0)):
+                grid_agent_id[n, row, col] = -1
+                positions[n, agent, 0] = new_row
+                positions[n, agent, 1] = new_col
+                grid_agent_id[n, new_row, new_col] = agent
+            else:
+                valid[n] = False
+
+        elif action == harvest:
+            flower_type = flower_types[n, row, col]
+            if (flower_type >= 0 and growth_stages[n, row, col]
+                    == max_growth_stages[flower_type]):
+                planter = planted_by[n, row, col]
+                flower_types[n, row, col] = -1
+                growth_stages[n, row, col] = 0
+                planted_by[n, row, col] = -1
+                # Infinite seed counts (-1) are left unchanged
+                if seeds[n, agent, flower_type] >= 0:
+                    seeds[n, agent, flower_type] += seed_returns[n]
+                money[n, agent] += prices[flower_type]
+                flowers_harvested[n, agent, flower_type] += 1
+                # Initially planted flowers do not have a planter
+                if planter >= 0:
+                    flowers_planted[n, planter, flower_type] -= 1
+                turns_without_income[n, agent] = 0
+            else:
+                valid[n] = False
+
+        elif action >= first_plant:
+            flower_type = action - first_plant
+            num_seeds = seeds[n, agent, flower_type]
+            if (num_seeds != 0 and cell_types[n, row, col] == ground
+                    and flower_types[n, row, col] < 0):
+                if num_seeds > 0:
+                    seeds[n, agent, flower_type] = num_seeds - 1
+                flower_types[n, row, col] = flower_type
+                growth_stages[n, row, col] = 0
+                planted_by[n, row, col] = agent
+                flowers_planted[n, agent, flower_type] += 1
+            else:
+                valid[n] = False
+
+
+batched_step = (njit(parallel=True, cache=True)(_batched_step)
+                if NUMBA_AVAILABLE else None)
+"""Compiled version of :py:func:`_batched_step`, None if Numba is missing."""
@@ -13,15 +13,17 @@ from omegaconf import OmegaConf
 from ethicalgardeners import algorithms
 from ethicalgardeners.action import create_action_enum
 from ethicalgardeners.actionhandler import ActionHandler
-from ethicalgardeners.gardenersenv import GardenersEnv
+from ethicalgardeners.gardenersenv import GardenersEnv, GardenersParallelEnv
 from ethicalgardeners.metricscollector import MetricsCollector
-from ethicalgardeners.observation import TotalObservation, PartialObservation
+from ethicalgardeners.observation import (TotalObservation,
+                                          PartialObservation,
+                                          QuantizedObservation)
 from ethicalgardeners.renderer import GraphicalRenderer, ConsoleRenderer
 from ethicalgardeners.rewardfunctions import RewardFunctions
 from ethicalgardeners.gridworld import GridWorld
 
 
-def make_env(config=None):
+def make_env(config=None, parallel=False):
     """
     Create the environment using Hydra configuration.
 
@@ -30,19 +32,21 @@ def make_env(config=None):
     metrics collector, and renderers.
 
     Args:
-        config (OmegaConf): The configuration object containing environment
-            parameters.
+        config (OmegaConf or dict): The configuration object containing
+            environment parameters.
+        parallel (bool, optional): Whether to create a
+            :py:class:`.GardenersParallelEnv`, in which all agents act at once
+            each turn, instead of a :py:class:`.GardenersEnv`.
     """
-    if config is None:
-        config = OmegaConf.create({
-            "grid": {},
-            "observation": {},
-            "metrics": {},
-            "renderer": {
-                "graphical": {},
-                "console": {}
-            }
-        })
+    # The configuration is resolved once into plain dicts, which are much
+    # faster to access than OmegaConf nodes
+    config = _to_dict(config) if config is not None else {}
+
+    observation_config = config.get("observation", {})
+    metrics_config = config.get("metrics", {})
+    renderer_config = config.get("renderer", {})
+    graphical_config = renderer_config.get("graphical", {})
+    console_config = renderer_config.get("console", {})
 
     # Base simulation parameters
     num_iter = config.get("num_iterations", 1000)
@@ -55,56 +59,7 @@ def make_env(config=None):
     else:
         random_generator = np.random.RandomState()
 
-    # Common parameters for all grid initializations
-    min_pollution = config.grid.get("min_pollution", 0)
-    max_pollution = config.grid.get("max_pollution", 100)
-    pollution_increment = config.grid.get("pollution_increment", 1)
-    collisions_on = config.grid.get("collisions_on", True)
-    num_seeds_returned = config.grid.get("num_seeds_returned", 1)
-    flowers_data = config.grid.get("flowers_data", None)
-
-    # Random initialization parameters
-    width = None
-    height = None
-
-    # Grid initialization
-    grid_init_method = config.grid.get("init_method", "random")
-
-    init_config = {}
-    if grid_init_method == "from_file":
-        file_path = config.grid.file_path
-
-        init_config = {"file_path": file_path}
-
-    elif grid_init_method == "from_code":
-        grid_config = config.grid.get("config", None)
-
-        init_config = {"grid_config": grid_config}
-
-    elif grid_init_method == "random":
-        width = config.grid.get("width", 10)
-        height = config.grid.get("height", 10)
-        obstacles_ratio = config.grid.get("obstacles_ratio", 0.2)
-        nb_agent = config.grid.get("nb_agent", 2)
-
-        init_config = {
-            "obstacles_ratio": obstacles_ratio,
-            "nb_agent": nb_agent
-        }
-
-    grid_world = GridWorld.create_from_config(
-        init_method=grid_init_method,
-        init_config=init_config,
-        width=width,
-        height=height,
-        min_pollution=min_pollution,
-        max_pollution=max_pollution,
-        pollution_increment=pollution_increment,
-        collisions_on=collisions_on,
-        num_seeds_returned=num_seeds_returned,
-        random_generator=random_generator,
-        flowers_data=flowers_data
-    )
+    grid_world = make_grid_world(config, random_generator)
 
     # Create the action space from the number of flowers types
     num_flower_types = len(grid_world.flowers_data)
@@ -117,13 +72,13 @@ def make_env(config=None):
     )
 
     # Initialise observation strategy
-    observation_type = config.observation.get("type", "total")
+    observation_type = observation_config.get("type", "total")
     if observation_type == "total":
         observation_strategy = TotalObservation(
             grid_world
         )
     elif observation_type == "partial":
-        obs_range = config.observation.get("range", 1)
+        obs_range = observation_config.get("range", 1)
         observation_strategy = PartialObservation(
             obs_range
         )
@@ -133,24 +88,34 @@ def make_env(config=None):
             "Supported types are 'total' and 'partial'."
         )
 
+    observation_dtype = observation_config.get("dtype", "float32")
+    if observation_dtype == "uint8":
+        observation_strategy = QuantizedObservation(observation_strategy)
+    elif observation_dtype != "float32":
+        raise ValueError(
+            f"Unknown observation dtype: {observation_dtype}. "
+            "Supported dtypes are 'float32' and 'uint8'."
+        )
+
     # Initialise reward functions
     reward_functions = RewardFunctions(
         action_enum
     )
 
     # Initialise metrics collector
-    metrics_out_dir = config.metrics.get("out_dir_path", "outputs")
-    export_metrics = config.metrics.get("export_on", False)
-    send_metrics = config.metrics.get("send_on", False)
+    metrics_out_dir = metrics_config.get("out_dir_path", "outputs")
+    export_metrics = metrics_config.get("export_on", False)
+    send_metrics = metrics_config.get("send_on", False)
+    flush_every = metrics_config.get("flush_every", 100)
 
-    # Read `config.metrics.wandb` if present and convert to a plain dict
-    wandb_cfg = config.metrics.get("wandb", {})
-    wandb_params = dict(wandb_cfg)
+    # Read `config.metrics.wandb` if present
+    wandb_params = metrics_config.get("wandb", {})
 
     metrics_collector = MetricsCollector(
         metrics_out_dir,
         export_metrics,
         send_metrics,
+        flush_every=flush_every,
         **wandb_params
     )
 
@@ -171,55 +136,47 @@ def make_env(config=None):
     # Initialise renderers
     renderers = []
 
-    # Determine if the user wants to display the environment
+    # The renderers only display the environment in 'human' mode, so without
+    # a display they are only created to save a video for post analysis
+    display = render_mode == "human"
+
     # Initialize Graphical renderer based on configuration
-    if config.renderer.graphical.get("enabled", True):
-        post_analysis_on = config.renderer.graphical.get(
-            "post_analysis_on", False
-        )
-        out_dir = config.renderer.graphical.get("out_dir_path", "outputs")
-        cell_size = config.renderer.graphical.get("cell_size", 50)
-        colors = config.renderer.graphical.get("colors", None)
-
-        graphical_renderer = GraphicalRenderer(
-            cell_size=cell_size,
-            colors=colors,
-            post_analysis_on=post_analysis_on,
-            display=True,
-            out_dir_path=out_dir,
-        )
-        renderers.append(graphical_renderer)
+    post_analysis_on = graphical_config.get("post_analysis_on", False)
+    if graphical_config.get("enabled", True) and (display
+                                                  or post_analysis_on):
+        out_dir = graphical_config.get("out_dir_path", "outputs")
+        renderers.append(_make_graphical_renderer(
+            graphical_config, post_analysis_on, display, out_dir))
 
     # Initialize Console renderer based on configuration
-    if config.renderer.console.get("enabled", False):
-        post_analysis_on = config.renderer.console.get(
-            "post_analysis_on", False
-        )
-        out_dir = config.renderer.console.get("out_dir_path", "outputs")
-        characters = config.renderer.console.get("characters", None)
-
-        console_renderer = ConsoleRenderer(
-            characters=characters,
-            display=True,
-        )
-        renderers.append(console_renderer)
+    if console_config.get("enabled", False):
+        post_analysis_on = console_config.get("post_analysis_on", False)
+        out_dir = console_config.get("out_dir_path", "outputs")
+        characters = console_config.get("characters", None)
+
+        if display:
+            console_renderer = ConsoleRenderer(
+                characters=characters,
+                display=True,
+            )
+            renderers.append(console_renderer)
 
         # Add a Graphical renderer if post analysis is enabled to
         # create a video after the simulation
         if post_analysis_on:
-            cell_size = config.renderer.graphical.get("cell_size", 50)
-            colors = config.renderer.graphical.get("colors", None)
-
-            graphical_renderer = GraphicalRenderer(
-                cell_size=cell_size,
-                colors=colors,
-                post_analysis_on=post_analysis_on,
-                display=False,  # No real-time rendering
-                out_dir_path=out_dir
-            )
-            renderers.append(graphical_renderer)
+            # No real-time rendering
+            renderers.append(_make_graphical_renderer(
+                graphical_config, post_analysis_on, False, out_dir))
+
+    # The parallel environment is always rendered once per turn
+    if parallel:
+        env_class, env_options = GardenersParallelEnv, {}
+    else:
+        env_class = GardenersEnv
+        env_options = {
+            "render_per_turn": config.get("render_per_turn", False)}
 
-    return GardenersEnv(
+    return env_class(
         random_generator=random_generator,
         grid_world=grid_world,
         action_enum=action_enum,
@@ -229,10 +186,124 @@ def make_env(config=None):
         observation_strategy=observation_strategy,
         reward_functions=reward_functions,
         metrics_collector=metrics_collector,
-        renderers=renderers
+        renderers=renderers,
+        **env_options
     )
 
 
+def _make_graphical_renderer(graphical_config, post_analysis_on, display,
+                             out_dir_path):
+    """
+    Create a graphical renderer with the cell size, colors and video codec
+    of the graphical renderer configuration.
+
+    Args:
+        graphical_config (dict): The graphical renderer section of the
+            configuration.
+        post_analysis_on (bool): Whether to save the frames to create a video.
+        display (bool): Whether to display the environment in a window.
+        out_dir_path (str): Directory where the video is saved.
+
+    Returns:
+        :py:class:`.GraphicalRenderer`: The graphical renderer.
+    """
+    return GraphicalRenderer(
+        cell_size=graphical_config.get("cell_size", 50),
+        colors=graphical_config.get("colors", None),
+        post_analysis_on=post_analysis_on,
+        display=display,
+        out_dir_path=out_dir_path,
+        ffmpeg_codec=graphical_config.get("ffmpeg_codec", None),
+    )
+
+
+def make_grid_world(config, random_generator):
+    """
+    Create the grid world described by the `grid` section of a configuration.
+
+    Args:
+        config (OmegaConf or dict): The configuration object containing
+            environment parameters.
+        random_generator (:py:class:`numpy.random.RandomState`): Random number
+            generator used to initialise the grid.
+
+    Returns:
+        :py:class:`.GridWorld`: The initialised grid world.
+    """
+    grid = _to_dict(config.get("grid", {}))
+
+    # Common parameters for all grid initializations
+    min_pollution = grid.get("min_pollution", 0)
+    max_pollution = grid.get("max_pollution", 100)
+    pollution_increment = grid.get("pollution_increment", 1)
+    collisions_on = grid.get("collisions_on", True)
+    num_seeds_returned = grid.get("num_seeds_returned", 1)
+    flowers_data = grid.get("flowers_data", None)
+
+    # Random initialization parameters
+    width = None
+    height = None
+
+    # Grid initialization
+    grid_init_method = grid.get("init_method", "random")
+
+    init_config = {}
+    if grid_init_method == "from_file":
+        file_path = grid["file_path"]
+
+        init_config = {"file_path": file_path}
+
+    elif grid_init_method == "from_code":
+        grid_config = grid.get("config", None)
+
+        init_config = {"grid_config": grid_config}
+
+    elif grid_init_method == "random":
+        width = grid.get("width", 10)
+        height = grid.get("height", 10)
+        obstacles_ratio = grid.get("obstacles_ratio", 0.2)
+        nb_agent = grid.get("nb_agent", 2)
+
+        init_config = {
+            "obstacles_ratio": obstacles_ratio,
+            "nb_agent": nb_agent
+        }
+
+    grid_world = GridWorld.create_from_config(
+        init_method=grid_init_method,
+        init_config=init_config,
+        width=width,
+        height=height,
+        min_pollution=min_pollution,
+        max_pollution=max_pollution,
+        pollution_increment=pollution_increment,
+        collisions_on=collisions_on,
+        num_seeds_returned=num_seeds_returned,
+        random_generator=random_generator,
+        flowers_data=flowers_data
+    )
+
+    return grid_world
+
+
+def _to_dict(config):
+    """
+    Convert an OmegaConf configuration, or a section of it, to plain Python
+    containers, with its interpolations resolved in a single traversal.
+
+    Args:
+        config (OmegaConf or dict): The configuration. Plain dicts are
+            returned as is.
+
+    Returns:
+        dict: The configuration as a plain dict.
+    """
+    if OmegaConf.is_config(config):
+        return OmegaConf.to_container(config, resolve=True,
+                                      throw_on_missing=False)
+    return config
+
+
 def make_agent_algorithm():
     """
     Placeholder function to create an agent algorithm.
@@ -242,6 +313,52 @@ def make_agent_algorithm():
     return None
 
 
+class _RandomActionSampler:
+    """
+    Sample random valid actions from a buffer of pre-drawn random numbers.
+
+    Drawing the random numbers by blocks avoids going through
+    :py:meth:`gymnasium.spaces.Discrete.sample` at every step.
+
+    Attributes:
+        random_generator (:py:class:`numpy.random.Generator`): Generator of
+            the random numbers.
+        buffer (:py:class:`numpy.ndarray`): Pre-drawn random numbers in
+            [0, 1).
+        index (int): Index of the next random number of the buffer to use.
+    """
+
+    BUFFER_SIZE = 4096
+    """Number of random numbers drawn at once."""
+
+    def __init__(self):
+        """
+        Create the sampler with an empty buffer.
+        """
+        self.random_generator = np.random.default_rng()
+        self.buffer = np.empty(0)
+        self.index = 0
+
+    def __call__(self, action_mask):
+        """
+        Sample an action uniformly among the valid actions.
+
+        Args:
+            action_mask (:py:class:`numpy.ndarray`): Mask of the valid actions.
+
+        Returns:
+            int: The sampled action.
+        """
+        if self.index == len(self.buffer):
+            self.buffer = self.random_generator.random(self.BUFFER_SIZE)
+            self.index = 0
+        valid_actions = np.flatnonzero(action_mask)
+        action = valid_actions[int(self.buffer[self.index]
+                                   * len(valid_actions))]
+        self.index += 1
+        return int(action)
+
+
 def run_simulation(env, agent_algorithms=None, deterministic=None,
                    needs_action_mask=None, **kwargs):
     """
@@ -266,6 +383,10 @@ def run_simulation(env, agent_algorithms=None, deterministic=None,
     if deterministic is None:
         deterministic = [True for _ in env.possible_agents]
 
+    sample_action = _RandomActionSampler()
+    agent_indices = {agent: index
+                     for index, agent in enumerate(env.possible_agents)}
+
     for agent in env.agent_iter():
         observations, rewards, termination, truncation, infos = env.last()
         observation, action_mask = observations.values()
@@ -274,12 +395,10 @@ def run_simulation(env, agent_algorithms=None, deterministic=None,
             break
 
         if agent_algorithms is None:
-            action = env.action_space(agent).sample(
-                action_mask
-            )
+            action = sample_action(action_mask)
         else:
             # Use the corresponding agent algorithm to determine the action
-            agent_index = env.possible_agents.index(agent)
+            agent_index = agent_indices[agent]
             action = algorithms.predict_action(
                 agent_algorithms[agent_index],
                 observation,
@@ -295,6 +414,31 @@ def run_simulation(env, agent_algorithms=None, deterministic=None,
     env.close()
 
 
+def run_parallel_simulation(env):
+    """
+    Run the simulation loop for a parallel environment.
+
+    Each turn, every agent samples a random valid action and the environment
+    is stepped once with the actions of all agents.
+
+    Args:
+        env (GardenersParallelEnv): The environment to run the simulation in.
+    """
+    observations, infos = env.reset()
+    sample_action = _RandomActionSampler()
+
+    while env.agents:
+        actions = {
+            agent: sample_action(observations[agent]["action_mask"])
+            for agent in env.agents
+        }
+        observations, rewards, terminations, truncations, infos = env.step(
+            actions)
+
+    # Close the environment
+    env.close()
+
+
 def _find_config_path():
     """
     Return a valid path to the 'configs' directory prioritizing:
@@ -350,6 +494,11 @@ def main(config):
     if not valid_cfg:
         config = None
 
+    # All agents act at once each turn if the configuration asks for it
+    if config is not None and config.get("parallel", False):
+        run_parallel_simulation(make_env(config, parallel=True))
+        return
+
     # Initialise the environment with the provided configuration
     env = make_env(config)
 
@@ -19,6 +19,8 @@ The metrics tracked include:
 The module is designed to be configurable, allowing users to enable or disable
 metrics export and sending based on their research requirements.
 """
+import csv
+import os
 
 
 class MetricsCollector:
@@ -64,12 +66,14 @@ class MetricsCollector:
             * agent_selection (str): Currently selected agent.
         run (wandb.run): An WandB run instance for logging metrics. Can be
             provided externally or created internally if send_on is True.
+        flush_every (int): Number of exported rows kept in memory before
+            they are written to the CSV file.
         _run_id (int): Unique identifier for the run, used for file naming
             during export.
     """
 
     def __init__(self, out_dir_path, export_on, send_on, wandb_run=None,
-                 **wandb_params):
+                 flush_every=100, **wandb_params):
         """
         Create the metrics collector.
 
@@ -83,6 +87,10 @@ class MetricsCollector:
             wandb_run (wandb.run, optional): An existing WandB run instance to
                 use for logging metrics. If None, a new run will be created if
                 send_on is True.
+            flush_every (int, optional): Number of exported rows kept in
+                memory before they are written to the CSV file. The rows are
+                also written at the end of each episode and when the
+                collector is closed.
             **wandb_params: Additional parameters to pass to wandb.init() if
                 a new run is created. This can include project name, entity,
                 config, etc.
@@ -107,6 +115,8 @@ class MetricsCollector:
             "agent_selection": None,  # Currently selected agent
         }
         self._run_id = None  # Unique identifier for the run
+        self.flush_every = flush_every
+        self._pending_rows = []  # Exported rows not written to the file yet
 
         if export_on or send_on:
             import time
@@ -154,11 +164,11 @@ class MetricsCollector:
         """
         self.metrics["step"] += 1
         self.metrics["num_planted_flowers_per_agent"] = {
-            i: sum(grid_world.agents[i].flowers_planted.values()) for i in
+            i: int(grid_world.agents[i].flowers_planted.sum()) for i in
             range(len(grid_world.agents))
         }
         self.metrics["num_harvested_flowers_per_agent"] = {
-            i: sum(grid_world.agents[i].flowers_harvested.values()) for i in
+            i: int(grid_world.agents[i].flowers_harvested.sum()) for i in
             range(len(grid_world.agents))
         }
         self.metrics["total_planted_flowers"] = sum(
@@ -190,7 +200,7 @@ class MetricsCollector:
                     if (cell.pollution*100/max_pollution) > 90:
                         self.metrics["num_cells_pollution_above_90"] += 1
 
-        if len(grid_world.grid) > 0:
+        if num_cells > 0:
             self.metrics["avg_pollution_percent"] /= num_cells
 
         self.metrics["rewards"] = rewards
@@ -210,15 +220,19 @@ class MetricsCollector:
         WandB session and ensure all metrics are saved.
         """
         self.metrics["episode"] += 1
+        self.flush_metrics()
 
     def close(self):
         """
         Close the metrics collector.
 
-        This method finishes the current WandB run if send_on is True. It
-        should be called when the metrics collector is no longer needed to
-        ensure all resources are properly released.
+        This method writes the exported rows still in memory and finishes the
+        current WandB run if send_on is True. It should be called when the
+        metrics collector is no longer needed to ensure all resources are
+        properly released.
         """
+        self.flush_metrics()
+
         if self.send_on:
             if self.run:
                 self.run.finish()
@@ -253,41 +267,47 @@ class MetricsCollector:
 
         This method exports the current metrics to a CSV file in the specified
         output directory if export_on is True. A new file is created for each
-        run of the program, and metrics are appended to this file at each call.
+        run of the program, and metrics are appended to this file. The rows
+        are kept in memory and written every :py:attr:`flush_every` calls, so
+        the file is not reopened at each step; call :py:meth:`flush_metrics`
+        to write them earlier.
         """
         if self.export_on:
-            import os
-            try:
-                import csv
-            except ImportError:
-                raise ImportError(
-                    "Error while importing csv module. "
-                )
+            self._pending_rows.append(self._prepare_metrics())
+
+            if len(self._pending_rows) >= self.flush_every:
+                self.flush_metrics()
+
+    def flush_metrics(self):
+        """
+        Write the exported rows kept in memory to the CSV file.
+
+        The header of the file is written with the first row, from the names
+        of its metrics.
+        """
+        if not self._pending_rows:
+            return
 
-            # Create output directory if it doesn't exist
-            if not os.path.exists(self.out_dir_path):
-                os.makedirs(self.out_dir_path)
+        # Create output directory if it doesn't exist, which environments
+        # running in other processes may do at the same time
+        os.makedirs(self.out_dir_path, exist_ok=True)
 
-            # Generate filename with run_id
-            filename = os.path.join(self.out_dir_path,
-                                    "simulation_metrics.csv")
+        filename = os.path.join(self.out_dir_path, "simulation_metrics.csv")
 
-            # Prepare row with metrics
-            metrics_row = self._prepare_metrics()
+        # Check if file exists to determine if we need to write headers
+        file_exists = os.path.isfile(filename)
 
-            # Check if file exists to determine if we need to write headers
-            file_exists = os.path.isfile(filename)
+        # Write or append to CSV
+        with open(filename, 'a' if file_exists else 'w',
+                  newline='') as csvfile:
+            writer = csv.writer(csvfile)
 
-            # Write or append to CSV
-            with open(filename, 'a' if file_exists else 'w',
-                      newline='') as csvfile:
-                writer = csv.DictWriter(csvfile,
-                                        fieldnames=list(metrics_row.keys()))
+            if not file_exists:
+                writer.writerow(self._pending_rows[0].keys())
 
-                if not file_exists:
-                    writer.writeheader()
+            writer.writerows(row.values() for row in self._pending_rows)
 
-                writer.writerow(metrics_row)
+        self._pending_rows = []
 
     def send_metrics(self):
         """
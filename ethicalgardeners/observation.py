@@ -13,6 +13,9 @@ implementing custom observation methods
    - :py:class:`TotalObservation`: Complete grid visibility
    - :py:class:`PartialObservation`: Limited visibility range
 
+3. :py:class:`QuantizedObservation`: A strategy wrapping another one to
+   return its observations as 8-bit integers
+
 Observations are formatted as numpy arrays compatible with Gymnasium
 environments.
 
@@ -22,10 +25,12 @@ ObservationStrategy class and implementing the required methods.
 from abc import ABC, abstractmethod
 from gymnasium.spaces import Box
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from ethicalgardeners.agent import Agent
 from ethicalgardeners.constants import FEATURES_PER_CELL
 from ethicalgardeners.gridworld import CellType
+from ethicalgardeners.kernels import cell_features
 
 
 class ObservationStrategy(ABC):
@@ -71,6 +76,40 @@ class ObservationStrategy(ABC):
         """
         pass
 
+    def get_observations(self, grid_world, agents):
+        """
+        Generate the observations of several agents at once.
+
+        The default implementation calls :py:meth:`get_observation` for each
+        agent. Strategies can override it to share work between the agents.
+
+        Args:
+            grid_world (:py:class:`.GridWorld`): The current state of the grid.
+            agents (list): The agents for which to generate the observations.
+
+        Returns:
+            list: The observation of each agent, in the order of `agents`.
+        """
+        return [self.get_observation(grid_world, agent) for agent in agents]
+
+    def is_visible(self, agent: Agent, position):
+        """
+        Check whether a cell appears in the observation of an agent.
+
+        The environment only regenerates the observations in which a cell
+        changed by an action is visible. The default implementation considers
+        every cell visible, so observations are always regenerated.
+
+        Args:
+            agent (:py:class:`.Agent`): The observing agent.
+            position (tuple): The (x, y) coordinates of the cell.
+
+        Returns:
+            bool: True if a change of the cell can change the observation of
+            the agent, False otherwise.
+        """
+        return True
+
 
 class TotalObservation(ObservationStrategy):
     """
@@ -145,71 +184,40 @@ class TotalObservation(ObservationStrategy):
         Returns:
             numpy.ndarray: A 3D array containing the full grid state.
         """
-        obs = np.zeros(self.observation_shape, dtype=np.float32)
+        return self.get_observations(grid_world, [agent])[0]
 
-        for x in range(self.observation_shape[0]):
-            for y in range(self.observation_shape[1]):
-                cell = grid_world.get_cell((x, y))
-
-                # Feature 1: Cell type (normalized)
-                obs[x, y, 0] = cell.cell_type.value / len(CellType)
-
-                # Feature 2: Pollution level (normalized)
-                pollution_normalized = 0.0
-                if cell.pollution is not None:
-                    pollution_normalized = (
-                            (cell.pollution - grid_world.min_pollution) /
-                            (grid_world.max_pollution -
-                             grid_world.min_pollution)
-                    )
-
-                obs[x, y, 1] = pollution_normalized
-
-                # Feature 3: Flower presence and type (normalized)
-                if cell.has_flower():
-                    # +1 because flower types start at 0 so it avoids
-                    # the flower type being 0 even when there is a flower
-                    flower_type_normalized = (
-                        (cell.flower.flower_type + 1) /
-                        len(grid_world.flowers_data)
-                    )
-                    obs[x, y, 2] = flower_type_normalized
-
-                    # Feature 4: Flower growth stage (normalized)
-                    # +1 because growth stages start at 0 so it avoids
-                    # the growth stage being 0 even when there is a flower
-                    growth_stage_normalized = (
-                        (cell.flower.current_growth_stage + 1) /
-                        (cell.flower.num_growth_stage + 1)
-                    )
-                    obs[x, y, 3] = growth_stage_normalized
-
-                # Feature 5: Agent presence (normalized)
-                if cell.has_agent():
-                    # Find the index of the agent in the grid world
-                    agent_idx = grid_world.agents.index(cell.agent)
-
-                    if agent_idx is not None:
-                        # +1 because agent indices start at 0
-                        agent_normalized = (
-                                (agent_idx + 1) / len(grid_world.agents)
-                        )
-                        obs[x, y, 4] = agent_normalized
-
-                # Feature 6: Agent X position (normalized)
-                # width - 1 because the X position starts at 0
-                obs[x, y, 5] = (
-                        agent.position[0] / (grid_world.width - 1)
-                )
-
-                # Feature 7: Agent Y position (normalized)
-                # height - 1 because the Y position starts at 0
-                obs[x, y, 6] = (
-                        agent.position[1] /
-                        (grid_world.height - 1)
-                )
+    def get_observations(self, grid_world, agents):
+        """
+        Generate complete observations of the entire grid for several agents.
 
-        return obs
+        All agents see the same cells, so the features of the cells are
+        computed once and only the position of each agent differs.
+
+        Args:
+            grid_world (:py:class:`.GridWorld`): The current state of the grid.
+            agents (list): The agents for which to generate the observations.
+
+        Returns:
+            list: The observation of each agent, in the order of `agents`.
+        """
+        width, height = self.observation_shape[:2]
+
+        observations = []
+        for agent in agents:
+            agent_x, agent_y = agent.position
+
+            obs = np.empty(self.observation_shape, dtype=np.float32)
+            if observations:
+                obs[..., :5] = observations[0][..., :5]
+            else:
+                _cell_features(grid_world, 0, width, 0, height, out=obs)
+
+            # width - 1 and height - 1 because the positions start at 0
+            obs[..., 5] = agent_x / (grid_world.width - 1)
+            obs[..., 6] = agent_y / (grid_world.height - 1)
+            observations.append(obs)
+
+        return observations
 
 
 class PartialObservation(ObservationStrategy):
@@ -276,6 +284,22 @@ class PartialObservation(ObservationStrategy):
         return Box(low=0, high=1, shape=self.observation_shape,
                    dtype=np.float32)
 
+    def is_visible(self, agent: Agent, position):
+        """
+        Check whether a cell is within the visibility range of an agent.
+
+        Args:
+            agent (:py:class:`.Agent`): The observing agent.
+            position (tuple): The (x, y) coordinates of the cell.
+
+        Returns:
+            bool: True if the cell is in the square area centered on the
+            agent, False otherwise.
+        """
+        agent_x, agent_y = agent.position
+        return (abs(position[0] - agent_x) <= self.obs_range
+                and abs(position[1] - agent_y) <= self.obs_range)
+
     def get_observation(self, grid_world, agent: Agent):
         """
         Generate a partial observation centered on the agent's position.
@@ -292,68 +316,283 @@ class PartialObservation(ObservationStrategy):
             numpy.ndarray: A 3D array containing the visible portion of the
             grid with all features.
         """
-        obs = np.zeros(self.observation_shape, dtype=np.float32)
+        r = self.obs_range
         agent_x, agent_y = agent.position
+        obs = np.zeros(self.observation_shape, dtype=np.float32)
+
+        # Visible part of the grid, the rest of the window stays at zero
+        row_start = max(agent_x - r, 0)
+        row_end = min(agent_x + r + 1, grid_world.height)
+        col_start = max(agent_y - r, 0)
+        col_end = min(agent_y + r + 1, grid_world.width)
+        window = obs[col_start - agent_y + r:col_end - agent_y + r,
+                     row_start - agent_x + r:row_end - agent_x + r]
 
-        for i in range(self.observation_shape[0]):
-            for j in range(self.observation_shape[1]):
-                x = agent_x + j - self.obs_range
-                y = agent_y + i - self.obs_range
-
-                if 0 <= y < grid_world.height and 0 <= x < grid_world.width:
-                    cell = grid_world.get_cell((x, y))
-
-                    # Feature 1: Cell type (normalized)
-                    obs[i, j, 0] = cell.cell_type.value / len(CellType)
-
-                    # Feature 2: Pollution level (normalized)
-                    pollution_normalized = 0
-                    if cell.pollution is not None:
-                        pollution_normalized = (
-                                (cell.pollution - grid_world.min_pollution) /
-                                (grid_world.max_pollution -
-                                 grid_world.min_pollution)
-                        )
-
-                    obs[i, j, 1] = pollution_normalized
-
-                    # Feature 3: Flower presence and type (normalized)
-                    if cell.has_flower():
-                        # +1 because flower types start at 0 so it avoids
-                        # the flower type being 0 even when there is a flower
-                        flower_type_normalized = (
-                            (cell.flower.flower_type + 1) /
-                            len(grid_world.flowers_data)
-                        )
-                        obs[i, j, 2] = flower_type_normalized
-
-                        # Feature 4: Flower growth stage (normalized)
-                        # +1 because growth stages start at 0 so it avoids
-                        # the growth stage being 0 even when there is a flower
-                        growth_stage_normalized = (
-                            (cell.flower.current_growth_stage + 1) /
-                            (cell.flower.num_growth_stage + 1)
-                        )
-                        obs[i, j, 3] = growth_stage_normalized
-
-                    # Feature 5: Agent presence (normalized)
-                    if cell.has_agent():
-                        # Find the index of the agent in the grid world
-                        agent_idx = grid_world.agents.index(cell.agent)
-
-                        if agent_idx is not None:
-                            # +1 because agent indices start at 0
-                            agent_normalized = (
-                                (agent_idx + 1) / len(grid_world.agents)
-                            )
-                            obs[i, j, 4] = agent_normalized
-
-                    # Feature 6: Agent X position (normalized)
-                    # width - 1 because the X position starts at 0
-                    obs[i, j, 5] = agent_x / (grid_world.width - 1)
-
-                    # Feature 7: Agent Y position (normalized)
-                    # height - 1 because the Y position starts at 0
-                    obs[i, j, 6] = agent_y / (grid_world.height - 1)
+        # The first axis of the observation follows the columns of the grid
+        # and the second one its rows
+        _cell_features(grid_world, row_start, row_end, col_start, col_end,
+                       out=window.transpose(1, 0, 2))
+
+        # width - 1 and height - 1 because the positions start at 0
+        window[..., 5] = agent_x / (grid_world.width - 1)
+        window[..., 6] = agent_y / (grid_world.height - 1)
 
         return obs
+
+    def get_observations(self, grid_world, agents):
+        """
+        Generate the partial observations of several agents at once.
+
+        When the windows of the agents cover at least as many cells as the
+        grid, the features of the whole grid are computed once, padded with
+        empty cells, and the window of every agent is extracted with a single
+        indexing of a sliding window view. Otherwise, each window is computed
+        on its own as in :py:meth:`get_observation`.
+
+        Args:
+            grid_world (:py:class:`.GridWorld`): The current state of the grid.
+            agents (list): The agents for which to generate the observations.
+
+        Returns:
+            numpy.ndarray or list: The observation of each agent, in the order
+            of `agents`.
+        """
+        r = self.obs_range
+        size = 2 * r + 1
+        height, width = grid_world.cell_types.shape
+        if len(agents) * size * size < height * width:
+            return super().get_observations(grid_world, agents)
+
+        # Features 6 and 7 are set to 1 inside the grid, then scaled by the
+        # position of each agent, so the padding stays at zero
+        padded = np.zeros((height + 2 * r, width + 2 * r, FEATURES_PER_CELL),
+                          dtype=np.float32)
+        inside = padded[r:r + height, r:r + width]
+        _cell_features(grid_world, 0, height, 0, width, out=inside)
+        inside[..., 5:] = 1
+
+        positions = np.array([agent.position for agent in agents],
+                             dtype=np.intp).reshape(-1, 2)
+        windows = sliding_window_view(padded, (size, size), axis=(0, 1))
+
+        # The window of an agent starts r cells before it in the padded grid,
+        # which is its own position. As in get_observation, the first axis of
+        # the observation follows the columns of the grid.
+        obs = windows[positions[:, 0], positions[:, 1]].transpose(0, 3, 2, 1)
+        obs = np.ascontiguousarray(obs)
+
+        # width - 1 and height - 1 because the positions start at 0
+        obs[..., 5] *= (positions[:, 0] / (grid_world.width - 1)).astype(
+            np.float32)[:, None, None]
+        obs[..., 6] *= (positions[:, 1] / (grid_world.height - 1)).astype(
+            np.float32)[:, None, None]
+
+        return obs
+
+
+class QuantizedObservation(ObservationStrategy):
+    """
+    Strategy that returns the observations of another strategy as unsigned
+    8-bit integers.
+
+    The features of the observations are between 0 and 1, they are scaled to
+    integers between 0 and 255. The observations take 4 times less memory
+    than the float32 ones, e.g., in replay buffers or when they are sent to
+    other processes, at the cost of a resolution of 1/255.
+
+    Attributes:
+        strategy (:py:class:`ObservationStrategy`): The strategy generating
+            the observations to quantize.
+    """
+
+    SCALE = 255
+    """Value of a feature equal to 1 once quantized."""
+
+    def __init__(self, strategy):
+        """
+        Create the quantized observation strategy.
+
+        Args:
+            strategy (:py:class:`ObservationStrategy`): The strategy
+                generating the observations to quantize.
+        """
+        super().__init__()
+        self.strategy = strategy
+
+    def observation_space(self, agent: Agent):
+        """
+        Define the observation space as a Box of unsigned 8-bit integers with
+        the shape of the wrapped strategy's observations.
+
+        Args:
+            agent (:py:class:`.Agent`): The agent for which to define the
+                observation space.
+
+        Returns:
+            gymnasium.spaces.Box: A box space of integers between 0 and 255.
+        """
+        space = self.strategy.observation_space(agent)
+        return Box(low=0, high=self.SCALE, shape=space.shape, dtype=np.uint8)
+
+    def get_observation(self, grid_world, agent: Agent):
+        """
+        Generate the observation of the wrapped strategy and quantize it.
+
+        Args:
+            grid_world (:py:class:`.GridWorld`): The current state of the grid.
+            agent (:py:class:`.Agent`): The agent for which to generate the
+                observation.
+
+        Returns:
+            numpy.ndarray: The quantized observation.
+        """
+        return self._quantize(self.strategy.get_observation(grid_world, agent))
+
+    def get_observations(self, grid_world, agents):
+        """
+        Generate the observations of several agents with the wrapped strategy
+        and quantize them.
+
+        Args:
+            grid_world (:py:class:`.GridWorld`): The current state of the grid.
+            agents (list): The agents for which to generate the observations.
+
+        Returns:
+            list: The quantized observation of each agent, in the order of
+            `agents`.
+        """
+        observations = self.strategy.get_observations(grid_world, agents)
+        return [self._quantize(observation) for observation in observations]
+
+    def is_visible(self, agent: Agent, position):
+        """
+        Check whether a cell appears in the observation of an agent for the
+        wrapped strategy.
+
+        Args:
+            agent (:py:class:`.Agent`): The observing agent.
+            position (tuple): The (x, y) coordinates of the cell.
+
+        Returns:
+            bool: True if a change of the cell can change the observation of
+            the agent, False otherwise.
+        """
+        return self.strategy.is_visible(agent, position)
+
+    def _quantize(self, observation):
+        """
+        Scale an observation to integers between 0 and :py:attr:`SCALE`,
+        rounded to the nearest integer.
+
+        Args:
+            observation (numpy.ndarray): The observation, with features
+                between 0 and 1.
+
+        Returns:
+            numpy.ndarray: The quantized observation.
+        """
+        return np.rint(observation * self.SCALE).astype(np.uint8)
+
+
+def _cell_features(grid_world, row_start, row_end, col_start, col_end,
+                   out=None):
+    """
+    Compute the features of a block of cells that do not depend on the
+    observing agent.
+
+    The features are computed on the arrays of the grid world rather than
+    cell by cell, and can be written directly in the observation.
+
+    There are only a few operations per feature, so the time is spent reading
+    the grid arrays and writing the observation rather than computing.
+    Observations are faster with fewer bytes to move (shared features across
+    agents, written in place, or the uint8 :py:class:`QuantizedObservation`)
+    rather than with more vectorized arithmetic.
+
+    Args:
+        grid_world (:py:class:`.GridWorld`): The current state of the grid.
+        row_start (int): First row of the block.
+        row_end (int): Row after the last row of the block.
+        col_start (int): First column of the block.
+        col_end (int): Column after the last column of the block.
+        out (:py:class:`numpy.ndarray`, optional): Array of shape
+            ``(rows, columns, n)`` with n >= 5 whose first 5 features are
+            overwritten. If None, a new array is allocated.
+
+    Returns:
+        numpy.ndarray: Array of shape ``(rows, columns, 5)`` with the
+        normalized cell type, pollution, flower type, flower growth stage and
+        agent of each cell of the block, as described in
+        :py:class:`TotalObservation`.
+    """
+    block = (slice(row_start, row_end), slice(col_start, col_end))
+    cell_types = grid_world.cell_types[block]
+
+    if out is None:
+        out = np.empty(cell_types.shape + (5,), dtype=np.float32)
+    features = out[..., :5]
+
+    # The compiled kernel computes the features in one pass over the cells
+    if cell_features is not None:
+        cell_features(features, cell_types, grid_world.pollution[block],
+                      grid_world.flower_types[block],
+                      grid_world.growth_stages[block],
+                      grid_world.max_growth_stages, len(CellType),
+                      len(grid_world.flowers_data),
+                      float(grid_world.min_pollution),
+                      float(grid_world.max_pollution), int(CellType.GROUND))
+    else:
+        _numpy_cell_features(grid_world, block, features)
+
+    # The index of the agent of each cell is read from the grid rather than
+    # searched in the list of agents. +1 because agent indices start at 0
+    agent_indices = grid_world.cell_agent_indices[block]
+    features[..., 4] = np.where(agent_indices >= 0,
+                                (agent_indices + 1)
+                                / max(len(grid_world.agents), 1), 0)
+
+    return features
+
+
+def _numpy_cell_features(grid_world, block, features):
+    """
+    Write the first 4 features of a block of cells with NumPy, when the
+    compiled :py:func:`.kernels.cell_features` kernel is not available.
+
+    Args:
+        grid_world (:py:class:`.GridWorld`): The current state of the grid.
+        block (tuple): Slices of the rows and columns of the block.
+        features (:py:class:`numpy.ndarray`): Array of shape
+            ``(rows, columns, n)`` with n >= 4 to write the features in.
+    """
+    cell_types = grid_world.cell_types[block]
+    flower_types = grid_world.flower_types[block]
+    has_flower = flower_types >= 0
+    # Cells without a flower read the data of flower type 0, then are masked
+    flower_types = flower_types.clip(0)
+
+    # Multiplications by the inverse of the ranges, as in the kernel
+    features[..., 0] = cell_types * (1.0 / len(CellType))
+    features[..., 1] = np.where(
+        cell_types == CellType.GROUND,
+        (grid_world.pollution[block].astype(np.float64)
+         - grid_world.min_pollution)
+        * (1.0 / (grid_world.max_pollution - grid_world.min_pollution)),
+        0.0)
+    # +1 because flower types and growth stages start at 0 so it avoids the
+    # feature being 0 even when there is a flower
+    if len(grid_world.flowers_data) > 0:
+        features[..., 2] = np.where(
+            has_flower,
+            (flower_types + 1) * (1.0 / len(grid_world.flowers_data)),
+            0.0)
+    else:
+        features[..., 2] = 0
+    if len(grid_world.max_growth_stages) > 0:
+        features[..., 3] = np.where(
+            has_flower,
+            (grid_world.growth_stages[block] + 1.0)
+            / (grid_world.max_growth_stages[flower_types] + 1.0),
+            0.0)
+    else:
+        features[..., 3] = 0
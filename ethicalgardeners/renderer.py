@@ -29,9 +29,17 @@ Each renderer visualizes the grid world, including:
 * Flowers and their growth stages
 * Pollution levels in each cell
 """
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
 import warnings
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from ethicalgardeners.gridworld import CellType
 from ethicalgardeners.constants import AGENT_PALETTE, FLOWER_PALETTE
 
@@ -184,39 +192,46 @@ class ConsoleRenderer(Renderer):
         self._grid_world = grid_world
         self._agents = agents
 
-        # Create a grid representation of the world
+        # Create a grid representation of the world from the arrays of the
+        # grid, read as lists
+        cell_types = grid_world.cell_types.tolist()
+        pollution = grid_world.pollution.tolist()
+        flower_types = grid_world.flower_types.tolist()
+        growth_stages = grid_world.growth_stages.tolist()
+        agent_indices = grid_world.cell_agent_indices.tolist()
+
+        ground_char = self.characters.get('ground', ' ')
+        obstacle_char = self.characters.get('obstacle', '#')
+        flower_char = self.characters.get('flower', 'F')
+        agent_char = self.characters.get('agent', 'A')
+        no_pollution = f" {' ' * len(str(grid_world.max_pollution))}"
+
         self.grid_representation = []
         for i in range(grid_world.height):
             row = []
             row.append("|")  # Start of row
             for j in range(grid_world.width):
-                cell = grid_world.get_cell((i, j))
-
                 # Empty cell by default
-                cell_char = self.characters.get('ground', ' ')
+                cell_char = ground_char
 
                 # Check cell type and update character accordingly
-                if cell.cell_type == CellType.OBSTACLE:
-                    cell_char = self.characters.get('obstacle', '#')
+                if cell_types[i][j] == CellType.OBSTACLE:
+                    cell_char = obstacle_char
 
                 # Verify if the cell contains a flower
-                if cell.has_flower():
-                    cell_char = self.characters.get('flower', 'F')
-                    flower_type = cell.flower.flower_type
-                    growth_stage = cell.flower.current_growth_stage
-                    cell_char = f"{cell_char}{flower_type}_{growth_stage}"
+                if flower_types[i][j] >= 0:
+                    cell_char = (f"{flower_char}{flower_types[i][j]}_"
+                                 f"{growth_stages[i][j]}")
 
                 # Verify if the cell contains an agent (above all)
-                if cell.has_agent():
-                    cell_char = self.characters.get('agent', 'A')
-                    agent_id = grid_world.agents.index(cell.agent)
-                    cell_char = f"{cell_char}{agent_id}"
-
-                # Add the pollution level
-                if cell.pollution is not None:
-                    cell_char += f" {cell.pollution}"
+                if agent_indices[i][j] >= 0:
+                    cell_char = f"{agent_char}{agent_indices[i][j]}"
+
+                # Add the pollution level of ground cells
+                if cell_types[i][j] == CellType.GROUND:
+                    cell_char += f" {pollution[i][j]}"
                 else:
-                    cell_char += f" {' ' * len(str(grid_world.max_pollution))}"
+                    cell_char += no_pollution
 
                 row.append(cell_char)
                 row.append('|')  # Separator for cells
@@ -279,21 +294,28 @@ class GraphicalRenderer(Renderer):
         pygame (:py:mod:`pygame`): Reference to the Pygame module for graphical
             rendering.
         window (:py:class:`pygame.Surface`): The Pygame surface where the
-            environment is rendered.
+            environment is rendered, None until the first render. Without a
+            display, it is an off-screen surface.
         clock (:py:class:`pygame.time.Clock`): Clock object to control
             rendering frame rate.
         font (:py:class:`pygame.font.Font`): Font object for rendering text in
             the environment (e.g., for displaying agent information).
-        post_analysis_on (bool): Flag indicating whether to save frames for
-            post-simulation video generation.
+        post_analysis_on (bool): Flag indicating whether to write the frames
+            to a video for post-simulation analysis.
         out_dir_path (str): Directory path where output files will be saved
             when post_analysis_on is True.
-        frames (list): Collection of rendered frames for video generation
-            when post_analysis_on is True.
+        ffmpeg_codec (str): FFmpeg video encoder used to write the video, None
+            to encode it with OpenCV.
+    """
+
+    FRAME_QUEUE_SIZE = 8
+    """
+    Number of captured frames that can wait to be encoded before rendering
+    waits for the encoding thread.
     """
 
     def __init__(self, cell_size=32, colors=None, post_analysis_on=False,
-                 display=False, out_dir_path=None):
+                 display=False, out_dir_path=None, ffmpeg_codec=None):
         """
         Create the graphical renderer.
 
@@ -310,9 +332,14 @@ class GraphicalRenderer(Renderer):
             out_dir_path (str, optional): Directory path where output files
                 will be saved. Required if post_analysis_on is True. Defaults
                 to None.
+            ffmpeg_codec (str, optional): FFmpeg video encoder used to write
+                the video, e.g. 'h264_nvenc' or 'h264_vaapi' for hardware
+                encoding. If None, or if FFmpeg cannot use it, the video is
+                encoded by OpenCV with the mp4v codec. Defaults to None.
         """
         super().__init__(display)
         self.cell_size = cell_size
+        self.ffmpeg_codec = ffmpeg_codec
         self.colors = colors if colors else {
             'background': (200, 200, 200),  # Light gray background
             'obstacle': (100, 100, 100),  # Gray for obstacles
@@ -343,49 +370,91 @@ class GraphicalRenderer(Renderer):
             self.display = False
             self.post_analysis_on = False
 
-        # Create Pygame window and clock
+        # Pygame window and clock, created by the first render
         self.window = None
         self.clock = None
-
-        self.frames = []  # List to store frames for video generation
+        self._window_size = None
+        # Whether a frame was rendered since the display was last updated
+        self._new_frame = False
+        # Rendered text of each pollution level and agent ID, created with
+        # the font
+        self._pollution_texts = {}
+        self._agent_texts = {}
+
+        # Video in which the frames are written, opened by the first frame,
+        # and error raised by the encoding thread while writing it
+        self._video = None
+        self._video_path = None
+        self._video_error = None
 
     def init(self, grid_world):
         """
-        Initialize the Pygame window based on the grid world dimensions.
+        Prepare the Pygame window based on the grid world dimensions.
 
-        This method creates the Pygame window with dimensions calculated from
-        the grid world size and the cell size. It sets up the display surface
-        where the environment will be rendered.
+        The window dimensions are calculated from the grid world size and the
+        cell size. Pygame and the window are only initialized by the first
+        call to :py:meth:`render`, so that environments that are never
+        rendered do not pay for them.
 
         Args:
             grid_world (:py:class:`.GridWorld`): The grid world environment to
                 be rendered.
         """
         if self.display or self.post_analysis_on:
-            self.pygame.init()
+            # Calculate window dimensions based on grid size and cell size
+            self._window_size = (grid_world.width * self.cell_size,
+                                 grid_world.height * self.cell_size)
+
+            # Pixels of the cells, drawn in the window at each render
+            self._pixels = np.empty(self._window_size + (3,), dtype=np.uint8)
+
+            # Pixel coordinates of the pollution text and of the center of
+            # each cell, by index of the cell in the flattened grid
+            cell_size = self.cell_size
+            self._text_positions = [
+                (j * cell_size + 2, i * cell_size + 2)
+                for i in range(grid_world.height)
+                for j in range(grid_world.width)
+            ]
+            self._cell_centers = [
+                (j * cell_size + cell_size // 2,
+                 i * cell_size + cell_size // 2)
+                for i in range(grid_world.height)
+                for j in range(grid_world.width)
+            ]
+
+            # Generate colors for agents and flowers
+            self._generate_colors(grid_world)
 
-            self.clock = self.pygame.time.Clock()
+    def _open_window(self):
+        """
+        Initialize Pygame and create the window, its clock and its font.
 
-            # Calculate window dimensions based on grid size and cell size
-            window_width = grid_world.width * self.cell_size
-            window_height = grid_world.height * self.cell_size
+        Without a display, the frames are only recorded, so the window is an
+        off-screen surface and no display is needed.
+        """
+        self.clock = self.pygame.time.Clock()
+
+        if self.display:
+            self.pygame.init()
 
             # Create the pygame window
-            self.window = self.pygame.display.set_mode(
-                (window_width, window_height)
-            )
+            self.window = self.pygame.display.set_mode(self._window_size)
             self.pygame.display.set_caption("Ethical Gardeners Simulation")
+        else:
+            self.pygame.font.init()
+            self.window = self.pygame.Surface(self._window_size)
 
-            # Create a font for displaying text
-            self.font = self.pygame.font.SysFont('Arial', 12)
-
-            # Generate colors for agents and flowers
-            self._generate_colors(grid_world)
+        # Create a font for displaying text
+        self.font = self.pygame.font.SysFont('Arial', 12)
+        self._pollution_texts = {}
+        self._agent_texts = {}
 
     def _generate_colors(self, grid_world):
         """
         Generate distinct colors for each agent and flower type using
-        predefined palettes.
+        predefined palettes, and the color and radius of the flowers at each
+        growth stage.
 
         Args:
             grid_world (:py:class:`.GridWorld`): The grid world containing
@@ -406,6 +475,28 @@ class GraphicalRenderer(Renderer):
             self.flower_colors[flower_type] = FLOWER_PALETTE[
                 palette_index]
 
+        # Color and radius of the flowers of each type at each growth stage
+        self._flower_styles = {}
+        for flower_type in grid_world.flowers_data:
+            # Use flower_colors dictionary to get the base color
+            base_color = self.flower_colors.get(flower_type, (0, 200, 0))
+            max_growth_stage = int(grid_world.max_growth_stages[flower_type])
+
+            for growth_stage in range(max_growth_stage + 1):
+                # Adjust color based on flower type and growth stage
+                growth_ratio = growth_stage / max(1, max_growth_stage)
+                flower_color = (
+                    int(base_color[0] * (0.5 + 0.5 * growth_ratio)),
+                    int(base_color[1] * (0.5 + 0.5 * growth_ratio)),
+                    int(base_color[2] * (0.5 + 0.5 * growth_ratio))
+                )
+
+                # Size of the circle depends on growth stage
+                flower_radius = int(
+                    self.cell_size * 0.3 * (0.5 + 0.5 * growth_ratio))
+                self._flower_styles[flower_type, growth_stage] = (
+                    flower_color, flower_radius)
+
     def render(self, grid_world, agents: dict):
         """
         Render the current state of the grid world using Pygame.
@@ -413,8 +504,7 @@ class GraphicalRenderer(Renderer):
         This method draws the grid world, including cells, agents, flowers,
         and pollution levels. Doesn't display the frame directly; instead,
         it prepares the frame for rendering in the Pygame window. If
-        post_analysis_on is True, saves the current frame for later video
-        generation.
+        post_analysis_on is True, writes the current frame to the video.
 
         Args:
             grid_world (:py:class:`.GridWorld`): The current state of the world
@@ -423,90 +513,77 @@ class GraphicalRenderer(Renderer):
                 the Agent instance of the agents to display.
         """
         if self.display or self.post_analysis_on:
-            # Fill the window with a background color
-            self.window.fill(self.colors['background'])
-
-            # Draw each cell in the grid
-            for i in range(grid_world.height):
-                for j in range(grid_world.width):
-                    cell = grid_world.get_cell((i, j))
-                    cell_rect = self.pygame.Rect(
-                        j * self.cell_size,
-                        i * self.cell_size,
-                        self.cell_size,
-                        self.cell_size
-                    )
-
-                    # Determine cell color based on cell type
-                    if cell.cell_type == CellType.GROUND:
-                        # Shade ground cells based on pollution level
-                        # Darker green = more polluted
-                        # lighter green = less polluted
-                        pollution_ratio = (
-                                cell.pollution / grid_world.max_pollution)
-                        green_value = 255 - int(pollution_ratio * 110)
-                        cell_color = (
-                            self.colors['ground'][0],
-                            green_value,
-                            self.colors['ground'][2]
-                        )
-                    elif cell.cell_type == CellType.OBSTACLE:
-                        cell_color = self.colors['obstacle']
-
-                    # Draw cell
-                    self.pygame.draw.rect(self.window, cell_color, cell_rect)
-                    self.pygame.draw.rect(self.window, (0, 0, 0),
-                                          cell_rect, 1)  # Black border
-
-                    # Draw flower if present
-                    if cell.has_flower():
-                        flower = cell.flower
-                        flower_type = flower.flower_type
-
-                        # Use flower_colors dictionary to get the base color
-                        base_color = self.flower_colors.get(flower_type,
-                                                            (0, 200, 0))
-
-                        # Adjust color based on flower type and growth stage
-                        growth_ratio = (flower.current_growth_stage /
-                                        max(1, flower.num_growth_stage))
-                        flower_color = (
-                            int(base_color[0] * (0.5 + 0.5 * growth_ratio)),
-                            int(base_color[1] * (0.5 + 0.5 * growth_ratio)),
-                            int(base_color[2] * (0.5 + 0.5 * growth_ratio))
-                        )
-
-                        # Draw flower as a circle, size depends on growth stage
-                        flower_radius = int(
-                            self.cell_size * 0.3 * (0.5 + 0.5 * growth_ratio))
-                        self.pygame.draw.circle(
-                            self.window,
-                            flower_color,
-                            (j * self.cell_size + self.cell_size // 2,
-                             i * self.cell_size + self.cell_size // 2),
-                            flower_radius
-                        )
-
-                    # Draw pollution level as text if it's not None
-                    if cell.pollution is not None:
-                        pollution_text = self.font.render(
-                            f"{int(cell.pollution)}", True, (0, 0, 0)
-                        )
-                    else:
-                        pollution_text = self.font.render(
-                            "", True, (0, 0, 0)
-                        )
-
-                    self.window.blit(
-                        pollution_text,
-                        (j * self.cell_size + 2, i * self.cell_size + 2)
-                    )
+            if self.window is None:
+                self._open_window()
+
+            cell_size = self.cell_size
+            cell_types = grid_world.cell_types
+            ground = cell_types == CellType.GROUND
+
+            # Color of each cell from the arrays of the grid. Ground cells are
+            # shaded based on pollution level: darker green = more polluted,
+            # lighter green = less polluted
+            cell_colors = np.empty(cell_types.shape + (3,), dtype=np.uint8)
+            cell_colors[...] = self.colors['background']
+            cell_colors[ground] = self.colors['ground']
+            pollution_ratios = (grid_world.pollution[ground].astype(np.float64)
+                                / grid_world.max_pollution)
+            cell_colors[ground, 1] = 255 - (pollution_ratios * 110).astype(int)
+            cell_colors[cell_types == CellType.OBSTACLE] = self.colors[
+                'obstacle']
+
+            # Scale the cells to their size in pixels, with a black border,
+            # and draw them all at once. The first axis of a surface array is
+            # the x axis of the window. A single column of pixels is built
+            # per column of cells, then copied in the pixel buffer for each
+            # of its pixels
+            columns = cell_colors.swapaxes(0, 1).repeat(cell_size, axis=1)
+            columns[:, ::cell_size] = 0
+            columns[:, cell_size - 1::cell_size] = 0
+            pixels = self._pixels
+            pixels.reshape(grid_world.width, cell_size,
+                           *columns.shape[1:])[...] = columns[:, None]
+            pixels[::cell_size] = 0
+            pixels[cell_size - 1::cell_size] = 0
+            self.pygame.surfarray.blit_array(self.window, pixels)
+
+            # Draw the flowers
+            flower_types = grid_world.flower_types.ravel()
+            growth_stages = grid_world.growth_stages.ravel()
+            flower_styles = self._flower_styles
+            for index in np.flatnonzero(flower_types >= 0).tolist():
+                flower_color, flower_radius = flower_styles[
+                    int(flower_types[index]), int(growth_stages[index])]
+
+                # Draw flower as a circle, size depends on growth stage
+                self.pygame.draw.circle(
+                    self.window,
+                    flower_color,
+                    self._cell_centers[index],
+                    flower_radius
+                )
+
+            # Draw the pollution level of the ground cells as text. The text
+            # of each level is only rendered once
+            text_positions = self._text_positions
+            pollution_texts = []
+            for index, pollution in zip(np.flatnonzero(ground).tolist(),
+                                        grid_world.pollution[ground].tolist()):
+                pollution = int(pollution)
+                pollution_text = self._pollution_texts.get(pollution)
+                if pollution_text is None:
+                    pollution_text = self.font.render(f"{pollution}", True,
+                                                      (0, 0, 0))
+                    self._pollution_texts[pollution] = pollution_text
+                pollution_texts.append((pollution_text,
+                                        text_positions[index]))
+            self.window.blits(pollution_texts, doreturn=False)
 
             # Draw agents
             for agent_id, agent in agents.items():
                 i, j = agent.position
                 # Get the index of the agent in the grid world
-                agent_idx = grid_world.agents.index(agent)
+                agent_idx = grid_world.agent_indices[agent]
 
                 # Use the agent_colors dictionary to get the agent's color
                 agent_color = self.agent_colors.get(agent_idx,
@@ -523,9 +600,12 @@ class GraphicalRenderer(Renderer):
                 )
                 self.pygame.draw.rect(self.window, agent_color, agent_rect)
 
-                # Draw agent ID
-                id_text = self.font.render(str(agent_id), True,
-                                           (255, 255, 255))
+                # Draw agent ID, rendered once per agent
+                id_text = self._agent_texts.get(agent_id)
+                if id_text is None:
+                    id_text = self.font.render(str(agent_id), True,
+                                               (255, 255, 255))
+                    self._agent_texts[agent_id] = id_text
                 self.window.blit(
                     id_text,
                     (j * self.cell_size + self.cell_size // 2 - 4,
@@ -534,18 +614,23 @@ class GraphicalRenderer(Renderer):
 
             # If post_analysis is enabled, save the current frame
             if self.post_analysis_on:
-                frame = self.pygame.surfarray.array3d(self.window)
-                frame = frame.swapaxes(0, 1)
-                self.frames.append(frame)
+                self._write_frame()
+
+            self._new_frame = True
 
     def display_render(self):
         """
         Display the rendered frame in the Pygame window.
 
-        This method updates the Pygame display with the current frame.
+        This method updates the Pygame display with the current frame. The
+        display is only flipped when a frame was rendered since the last
+        flip.
         """
-        if self.display:
-            self.pygame.display.flip()
+        # The window is opened by the first render
+        if self.display and self.window is not None:
+            if self._new_frame:
+                self.pygame.display.flip()
+                self._new_frame = False
 
             # Handle Pygame events to prevent window from becoming unresponsive
             for event in self.pygame.event.get():
@@ -557,18 +642,67 @@ class GraphicalRenderer(Renderer):
         Finalize the rendering process and clean up resources.
 
         This method shuts down the Pygame display and, if post_analysis_on is
-        True, generates and saves a video from the collected frames using
-        opencv.
+        True, closes the video in which the frames were written.
+
+        Raises:
+            RuntimeError: If the video could not be written and the error was
+                not raised by a previous render.
         """
-        if self.display or self.post_analysis_on:
-            self._create_video()
+        if self._video is not None:
+            # Wait for the frames left to encode
+            self._frames.put(None)
+            self._encoder.join()
+            self._video.release()
+            self._video = None
+
+            if self._video_error is None:
+                print(f"Video saved at {self._video_path}")
 
+        if self.window is not None:
             self.pygame.quit()
+            self.window = None
+
+        self._raise_video_error()
+
+    def _open_video(self):
+        """
+        Open the video in which the frames are written, with the dimensions
+        of the window, and start the thread encoding the frames.
+
+        The video is encoded by FFmpeg with :py:attr:`ffmpeg_codec` if it is
+        set and works on this machine, by OpenCV with the mp4v codec
+        otherwise. If OpenCV is needed but not installed, a warning is raised
+        and post_analysis_on is disabled.
+        """
+        width, height = self._window_size
+        self._video_path = os.path.join(self.out_dir_path,
+                                        'simulation_video.mp4')
+
+        # The frames are captured with the channels in the order of the
+        # pixels of the window when it is known, so that they are copied
+        # without reordering them, in RGB order otherwise
+        self._frame_channels = _surface_channels(self.window)
+        if self._frame_channels not in _FRAME_FORMATS:
+            self._frame_channels = "RGB"
+        ffmpeg_format, opencv_conversion = _FRAME_FORMATS[
+            self._frame_channels]
+
+        if self.ffmpeg_codec is not None:
+            if _ffmpeg_codec_available(self.ffmpeg_codec, width, height):
+                # Create output directory if it doesn't exist
+                os.makedirs(self.out_dir_path, exist_ok=True)
+                self._video = _FFmpegVideoWriter(
+                    self._video_path, width, height, self.ffmpeg_codec,
+                    ffmpeg_format)
+            else:
+                warnings.warn(
+                    f"Cannot encode videos with the FFmpeg codec "
+                    f"'{self.ffmpeg_codec}': FFmpeg is not found or the "
+                    f"codec is not available. The video is encoded with "
+                    f"OpenCV instead."
+                )
 
-    def _create_video(self):
-        # If post_analysis is enabled and we have frames, create a video
-        if self.post_analysis_on and self.frames:
-            import os
+        if self._video is None:
             try:
                 import cv2
             except ImportError:
@@ -579,25 +713,283 @@ class GraphicalRenderer(Renderer):
                     "or `pip install ethicalgardeners[viz]`"
                 )
                 print("Couldn't create video, OpenCV not installed.")
+                self.post_analysis_on = False
                 return
 
             # Create output directory if it doesn't exist
             os.makedirs(self.out_dir_path, exist_ok=True)
+            self._video = _OpenCVVideoWriter(
+                cv2, self._video_path, width, height,
+                getattr(cv2, opencv_conversion))
+
+        # The frames are encoded by a thread so that the simulation goes on
+        # meanwhile. The thread and the renderer exchange a fixed number of
+        # frame buffers, so rendering waits when the encoding falls behind
+        self._frames = queue.Queue()
+        self._free_frames = queue.Queue()
+        for _ in range(self.FRAME_QUEUE_SIZE):
+            self._free_frames.put(np.empty(
+                (height, width, len(self._frame_channels)), dtype=np.uint8))
+        self._encoder = threading.Thread(target=self._encode_frames,
+                                         daemon=True)
+        self._encoder.start()
+
+    def _encode_frames(self):
+        """
+        Write the captured frames to the video until None is received, in
+        the encoding thread.
+
+        If the video cannot be written, the error is kept to be raised by the
+        renderer and the next frames are dropped. The frame buffers are
+        always handed back, so that rendering never waits for a frame that
+        will not be encoded.
+        """
+        failed = False
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+
+            if not failed:
+                try:
+                    self._video.write(frame)
+                except Exception as error:
+                    self._video_error = error
+                    failed = True
+            self._free_frames.put(frame)
+
+    def _raise_video_error(self):
+        """
+        Raise the error of the encoding thread, if any, only once.
 
-            # Define video properties based on the first frame
-            height, width, _ = self.frames[0].shape
-            output_path = os.path.join(self.out_dir_path,
-                                       'simulation_video.mp4')
+        Raises:
+            RuntimeError: If the video could not be written.
+        """
+        error, self._video_error = self._video_error, None
+        if error is not None:
+            raise RuntimeError(
+                f"Error while writing the video {self._video_path}: {error}"
+            ) from error
+
+    def _write_frame(self):
+        """
+        Write the current content of the window to the video.
 
-            # Create video writer
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            video = cv2.VideoWriter(output_path, fourcc, 10, (width, height))
+        The frame is handed to the encoding thread, so at most
+        :py:attr:`FRAME_QUEUE_SIZE` frames are kept in memory. The video is
+        opened by the first frame.
 
-            # Write each frame to the video
-            for frame in self.frames:
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                video.write(frame)
+        Raises:
+            RuntimeError: If the encoding thread could not write a previous
+                frame.
+        """
+        if self._video is None:
+            self._open_video()
+            if self._video is None:
+                return
+        self._raise_video_error()
+
+        # The pixels are copied from a view on the window straight into a
+        # contiguous (height, width, channels) frame
+        frame = self._free_frames.get()
+        if self._frame_channels == "RGB":
+            pixels = self.pygame.surfarray.pixels3d(self.window)
+            np.copyto(frame, pixels.swapaxes(0, 1))
+        else:
+            # The bytes of the pixels are copied as they are, row by row
+            pixels = self.pygame.surfarray.pixels2d(self.window)
+            np.copyto(frame, pixels.T.view(np.uint8).reshape(frame.shape))
+        # The window stays locked while a view on its pixels exists
+        del pixels
+
+        self._frames.put(frame)
+
+
+_FRAME_FORMATS = {
+    "BGRX": ("bgr0", "COLOR_BGRA2BGR"),
+    "RGBX": ("rgb0", "COLOR_RGBA2BGR"),
+    "RGB": ("rgb24", "COLOR_RGB2BGR"),
+}
+"""
+FFmpeg pixel format and name of the OpenCV conversion to BGR of the
+captured frames, by order of their channels in memory.
+"""
 
-            video.release()
 
-            print(f"Video saved at {output_path}")
+def _surface_channels(surface):
+    """
+    Return the order in memory of the channels of the pixels of a 32-bit
+    surface.
+
+    Args:
+        surface (:py:class:`pygame.Surface`): The surface.
+
+    Returns:
+        str: The channel of each byte of a pixel, 'R', 'G', 'B' or 'X' for
+        unused or alpha bytes (e.g. 'BGRX'), or None if the pixels do not
+        have 4 bytes.
+    """
+    if surface.get_bytesize() != 4:
+        return None
+
+    color_masks = surface.get_masks()[:3]
+    channels = ""
+    for byte in range(4):
+        shift = 8 * byte if sys.byteorder == "little" else 8 * (3 - byte)
+        mask = 0xFF << shift
+        channels += "RGB"[color_masks.index(mask)] if (
+            mask in color_masks) else "X"
+    return channels
+
+
+def _ffmpeg_executable():
+    """
+    Return the path of the FFmpeg executable.
+
+    The FFmpeg installed on the system is used if there is one, otherwise the
+    one shipped with the optional imageio-ffmpeg package
+    (``pip install imageio-ffmpeg``).
+
+    Returns:
+        str: Path of the FFmpeg executable, or None if FFmpeg is not found.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is not None:
+        return ffmpeg
+
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        return None
+
+
+def _ffmpeg_codec_available(codec, width, height):
+    """
+    Check that FFmpeg is found and can encode a frame of the given
+    dimensions with a codec.
+
+    Hardware encoders such as h264_nvenc are listed by FFmpeg even on
+    machines without the matching hardware, so a frame is actually encoded.
+
+    Args:
+        codec (str): Name of the FFmpeg video encoder.
+        width (int): Width of the frames in pixels.
+        height (int): Height of the frames in pixels.
+
+    Returns:
+        bool: True if the frames can be encoded with the codec.
+    """
+    ffmpeg = _ffmpeg_executable()
+    if ffmpeg is None:
+        return False
+
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-loglevel", "error", "-f", "lavfi",
+             "-i", f"color=size={width}x{height}", "-frames:v", "1",
+             "-c:v", codec, "-f", "null", "-"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+class _OpenCVVideoWriter:
+    """
+    Video writer encoding frames with the mp4v codec of OpenCV.
+
+    Attributes:
+        cv2 (:py:mod:`cv2`): Reference to the OpenCV module.
+        video (:py:class:`cv2.VideoWriter`): The OpenCV video writer.
+        conversion (int): OpenCV color conversion code from the frames to BGR.
+        bgr_frame (:py:class:`numpy.ndarray`): Buffer in which each frame is
+            converted to the BGR order expected by OpenCV.
+    """
+
+    def __init__(self, cv2, path, width, height, conversion):
+        """
+        Open the video.
+
+        Args:
+            cv2 (:py:mod:`cv2`): Reference to the OpenCV module.
+            path (str): Path of the video file.
+            width (int): Width of the frames in pixels.
+            height (int): Height of the frames in pixels.
+            conversion (int): OpenCV color conversion code from the frames to
+                BGR, e.g. ``cv2.COLOR_RGB2BGR``.
+        """
+        self.cv2 = cv2
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.video = cv2.VideoWriter(path, fourcc, 10, (width, height))
+        self.conversion = conversion
+        self.bgr_frame = np.empty((height, width, 3), dtype=np.uint8)
+
+    def write(self, frame):
+        """
+        Write a frame to the video.
+
+        Args:
+            frame (:py:class:`numpy.ndarray`): Frame of shape
+                ``(height, width, channels)``.
+        """
+        self.cv2.cvtColor(frame, self.conversion, dst=self.bgr_frame)
+        self.video.write(self.bgr_frame)
+
+    def release(self):
+        """
+        Close the video.
+        """
+        self.video.release()
+
+
+class _FFmpegVideoWriter:
+    """
+    Video writer piping raw frames to an FFmpeg process, which can encode
+    them with a hardware encoder such as h264_nvenc or h264_vaapi.
+
+    Attributes:
+        process (:py:class:`subprocess.Popen`): The FFmpeg process, reading
+            the raw frames on its standard input.
+    """
+
+    def __init__(self, path, width, height, codec, pixel_format):
+        """
+        Start the FFmpeg process writing the video.
+
+        Args:
+            path (str): Path of the video file.
+            width (int): Width of the frames in pixels.
+            height (int): Height of the frames in pixels.
+            codec (str): Name of the FFmpeg video encoder.
+            pixel_format (str): FFmpeg pixel format of the frames, e.g.
+                'rgb24'.
+        """
+        self.process = subprocess.Popen(
+            [_ffmpeg_executable(), "-y", "-loglevel", "error",
+             "-f", "rawvideo", "-pix_fmt", pixel_format,
+             "-s", f"{width}x{height}", "-r", "10", "-i", "-",
+             "-c:v", codec, path],
+            stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        """
+        Write a frame to the video.
+
+        Args:
+            frame (:py:class:`numpy.ndarray`): Contiguous frame of shape
+                ``(height, width, channels)``.
+        """
+        self.process.stdin.write(frame.data)
+
+    def release(self):
+        """
+        Close the standard input of FFmpeg and wait for the video to be
+        written.
+        """
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass  # FFmpeg has already stopped
+        self.process.wait()
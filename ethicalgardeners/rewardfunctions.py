@@ -13,10 +13,12 @@ This module defines some reward function used to compute rewards for agents:
   biodiversity reward based on the number of different flower types planted
   by all the agents and how much the agent helps increase diversity.
 """
+from functools import lru_cache
 from math import log
 
 from ethicalgardeners.agent import Agent
 from ethicalgardeners.constants import MAX_PENALTY_TURNS
+from ethicalgardeners.gridworld import GridSnapshot
 
 
 class RewardFunctions:
@@ -56,8 +58,9 @@ class RewardFunctions:
         rewards, normalized to a range between -1 and 1.
 
         Args:
-            grid_world_prev (:py:class:`.GridWorld`): The grid world
-                environment before the action.
+            grid_world_prev (:py:class:`.GridSnapshot` or
+                :py:class:`.GridWorld`): The state of the cell of the agent
+                before the action, or the whole grid world before the action.
             grid_world (:py:class:`.GridWorld`): The grid world environment.
             agent (:py:class:`.Agent`): The agent performing the action.
             action (:py:attr:`action_enum`): The action performed.
@@ -67,12 +70,12 @@ class RewardFunctions:
             biodiversity rewards, as well as the total reward averaged across
             these components.
         """
-        ecology_reward = self.compute_ecology_reward(grid_world_prev,
-                                                     grid_world, agent, action)
-        wellbeing_reward = self.compute_wellbeing_reward(grid_world_prev,
-                                                         grid_world, agent,
-                                                         action)
-        biodiversity_reward = self.compute_biodiversity_reward(grid_world_prev,
+        snapshot = _previous_cell(grid_world_prev, agent)
+        ecology_reward = self.compute_ecology_reward(snapshot, grid_world,
+                                                     agent, action)
+        wellbeing_reward = self.compute_wellbeing_reward(snapshot, grid_world,
+                                                         agent, action)
+        biodiversity_reward = self.compute_biodiversity_reward(snapshot,
                                                                grid_world,
                                                                agent, action)
 
@@ -97,8 +100,9 @@ class RewardFunctions:
 
 
         Args:
-            grid_world_prev (:py:class:`.GridWorld`): The grid world
-                environment before the action.
+            grid_world_prev (:py:class:`.GridSnapshot` or
+                :py:class:`.GridWorld`): The state of the cell of the agent
+                before the action, or the whole grid world before the action.
             grid_world (:py:class:`.GridWorld`): The grid world environment.
             agent (:py:class:`.Agent`): The agent performing the action.
             action (:py:attr:`action_enum`): The action performed.
@@ -141,20 +145,18 @@ class RewardFunctions:
         elif action == self.action_enum.HARVEST:
             p_max = grid_world.max_pollution
             p_min = grid_world.min_pollution
-            position = agent.position
-            prev_cell = grid_world_prev.get_cell(position)
-            cell = grid_world.get_cell(position)
+            cell = grid_world.get_cell(agent.position)
 
             # Check if a flower has been harvested in the cell
             if cell.has_flower():
                 return 0.0
 
             # Check if the previous cell had a flower
-            if not prev_cell.has_flower():
+            snapshot = _previous_cell(grid_world_prev, agent)
+            if not snapshot.has_flower():
                 return 0.0
 
-            flower = prev_cell.flower
-            flower_type = flower.flower_type
+            flower_type = snapshot.flower_type
             if len(grid_world.flowers_data[
                        flower_type]['pollution_reduction']) == 0:
                 return 0.0
@@ -192,8 +194,9 @@ class RewardFunctions:
         without income, normalized to a maximum penalty.
 
         Args:
-            grid_world_prev (:py:class:`.GridWorld`): The grid world
-                environment before the action.
+            grid_world_prev (:py:class:`.GridSnapshot` or
+                :py:class:`.GridWorld`): The state of the cell of the agent
+                before the action, or the whole grid world before the action.
             grid_world (:py:class:`.GridWorld`): The grid world environment.
             agent (:py:class:`.Agent`): The agent performing the action.
             action (:py:attr:`action_enum`): The action performed.
@@ -203,29 +206,23 @@ class RewardFunctions:
         """
         # Reward computed only for harvesting actions
         if action == self.action_enum.HARVEST:
-            position = agent.position
-            prev_cell = grid_world_prev.get_cell(position)
-            cell = grid_world.get_cell(position)
+            cell = grid_world.get_cell(agent.position)
 
             # Check if a flower has been harvested in the cell
             if cell.has_flower():
                 return 0.0
 
             # Check if the previous cell had a flower
-            if not prev_cell.has_flower():
+            snapshot = _previous_cell(grid_world_prev, agent)
+            if not snapshot.has_flower():
                 return 0.0
 
-            flower = prev_cell.flower
-            flower_type = flower.flower_type
-
-            # Get the monetary value of the flower
-            flower_value = grid_world.flowers_data[flower_type]['price']
+            flower_prices = grid_world.flower_prices
 
-            # Normalize the reward based on the maximum possible value
-            highest_flower_value = max(
-                grid_world.flowers_data[ft]['price'] for ft in
-                grid_world.flowers_data)
-            return flower_value / highest_flower_value
+            # Get the monetary value of the flower and normalize it based on
+            # the maximum possible value
+            return float(flower_prices[snapshot.flower_type]
+                         / flower_prices.max())
         else:
             # Calculate penalty for not earning money
             return -min(agent.turns_without_income / MAX_PENALTY_TURNS, 1.0)
@@ -242,8 +239,9 @@ class RewardFunctions:
         the impact.
 
         Args:
-            grid_world_prev (:py:class:`.GridWorld`): The grid world
-                environment before the action.
+            grid_world_prev (:py:class:`.GridSnapshot` or
+                :py:class:`.GridWorld`): The state of the cell of the agent
+                before the action, or the whole grid world before the action.
             grid_world (:py:class:`.GridWorld`): The grid world environment.
             agent (:py:class:`.Agent`): The agent performing the action.
             action (:py:attr:`action_enum`): The action performed.
@@ -265,36 +263,20 @@ class RewardFunctions:
         # Get the flower type that has been planted
         planted_flower_type = cell.flower.flower_type
 
-        # Count the number of different flower types planted by all agents
-        flowers = {flower_type: 0 for flower_type in
-                   grid_world.flowers_data.keys()}
-        total_flowers = 0
-
+        # Count the number of flowers of each type planted by all agents
+        flowers = [0] * len(grid_world.flowers_data)
         for agent in grid_world.agents:
-            for flower_type, count in agent.flowers_planted.items():
-                flowers[flower_type] += count
-                total_flowers += count
-
-        # Create a dictionary to hold the flower counts before planting
-        prev_flowers = dict(flowers)  # Copy current flower counts
-        prev_flowers[planted_flower_type] -= 1  # Remove the planted flower
-        prev_total = total_flowers - 1
-
-        # Compute the ratio of each flower type and use Shannon-Wiener index
-        # to compute biodiversity
-        # before
-        prev_biodiversity = 0
-        for flower_type in prev_flowers:
-            if prev_flowers[flower_type] > 0:
-                ratio = prev_flowers[flower_type] / prev_total
-                prev_biodiversity -= ratio * log(ratio)
-
-        # after
-        biodiversity = 0
-        for flower_type in flowers:
-            if flowers[flower_type] > 0:
-                ratio = flowers[flower_type] / total_flowers
-                biodiversity -= ratio * log(ratio)
+            for flower_type, count in enumerate(agent.flowers_planted):
+                flowers[flower_type] += int(count)
+
+        # Counts before planting, without the planted flower
+        prev_flowers = list(flowers)
+        prev_flowers[planted_flower_type] -= 1
+
+        # Compute the biodiversity before and after with the Shannon-Wiener
+        # index
+        prev_biodiversity = _shannon_index(tuple(prev_flowers))
+        biodiversity = _shannon_index(tuple(flowers))
 
         max_biodiversity = log(len(grid_world.flowers_data))
 
@@ -303,3 +285,48 @@ class RewardFunctions:
             return (biodiversity - prev_biodiversity) / max_biodiversity
         else:
             return 0.0
+
+
+def _previous_cell(grid_world_prev, agent):
+    """
+    Get the state of the cell of the agent before its action.
+
+    The reward functions used to receive a copy of the whole grid world
+    before the action, which is still accepted and reduced to the cell of the
+    agent.
+
+    Args:
+        grid_world_prev (:py:class:`.GridSnapshot` or :py:class:`.GridWorld`):
+            The state of the cell of the agent before the action, or the
+            whole grid world before the action.
+        agent (:py:class:`.Agent`): The agent performing the action.
+
+    Returns:
+        GridSnapshot: The state of the cell of the agent before the action.
+    """
+    if isinstance(grid_world_prev, GridSnapshot):
+        return grid_world_prev
+    return grid_world_prev.snapshot(agent.position)
+
+
+@lru_cache(maxsize=65536)
+def _shannon_index(counts):
+    """
+    Compute the Shannon-Wiener index of the given flower counts.
+
+    The counts of flowers recur often during an episode, so the index is
+    memoized on them.
+
+    Args:
+        counts (tuple): Number of flowers of each type.
+
+    Returns:
+        float: The Shannon-Wiener index, 0 if there is no flower.
+    """
+    total = sum(counts)
+    index = 0
+    for count in counts:
+        if count > 0:
+            ratio = count / total
+            index -= ratio * log(ratio)
+    return index
@@ -0,0 +1,1199 @@
+"""
+The vecenv module provides a vectorized version of the Ethical Gardeners
+environment, which simulates a batch of independent grid worlds at once.
+
+Instead of keeping one :py:class:`.GridWorld` made of cells, agents and flowers
+per environment, :py:class:`SyncVectorGardeners` stores the state of all the
+worlds in NumPy arrays with a leading dimension of size `num_envs`. A call to
+:py:meth:`~SyncVectorGardeners.step` then applies the actions of all the
+environments with a few array operations, which amortizes the Python overhead
+of the simulation across the whole batch.
+
+The rules of the simulation are the same as in :py:class:`.GardenersEnv`:
+agents act one after the other, the pollution and the flowers are updated once
+all agents have acted, and each environment returns the observation of the
+next agent to act with the reward of the agent that just acted. All the
+environments are stepped in lockstep, so the same agent acts in every
+environment at each step.
+
+The vectorized environment does not render and does not collect metrics.
+
+If Numba is installed, the actions and the updates of the cells are applied
+by the compiled kernels of the :py:mod:`.kernels` module. Otherwise, they are
+applied with NumPy array operations.
+
+:py:class:`SharedVectorGardeners` spreads the batch over several worker
+processes. Its arrays are allocated in shared memory, so the processes
+exchange the actions and the results of a step without pickling them.
+"""
+import multiprocessing
+import os
+from collections.abc import Mapping
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError
+
+import numpy as np
+from gymnasium.spaces import Box, Discrete, MultiDiscrete
+from omegaconf import OmegaConf
+
+from ethicalgardeners.action import create_action_enum
+from ethicalgardeners.constants import (FEATURES_PER_CELL, MAX_PENALTY_TURNS,
+                                        MIN_SEED_RETURNS, MAX_SEED_RETURNS)
+from ethicalgardeners.gridworld import CellType
+from ethicalgardeners.kernels import (PARALLEL_MIN_CELLS, batched_step,
+                                      step_grid, step_grid_serial)
+from ethicalgardeners.main import make_grid_world
+
+_DELTAS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int32)
+"""Position offset of the UP, DOWN, LEFT and RIGHT actions, by action value."""
+
+_REWARD_NAMES = ('ecology', 'wellbeing', 'biodiversity', 'total')
+"""Names of the reward components computed for each step."""
+
+# Commands sent to the workers of SharedVectorGardeners
+_STEP, _RESET, _CLOSE = range(3)
+
+
+class SyncVectorGardeners:
+    """
+    Batch of Ethical Gardeners environments stepped together in one process.
+
+    The state of the environments is stored in arrays of shape
+    ``(num_envs, ...)``. Grid arrays have the shape
+    ``(num_envs, height, width)`` and use -1 for empty cells in the
+    :py:attr:`flower_types`, :py:attr:`planted_by` and :py:attr:`grid_agent_id`
+    arrays. Agent arrays have the shape ``(num_envs, num_agents, ...)``.
+
+    Attributes:
+        num_envs (int): Number of environments in the batch.
+        num_iter (int): Maximum number of iterations of an episode.
+        grid_world (:py:class:`.GridWorld`): Grid world used to generate the
+            initial state of each environment at reset.
+        action_enum (:py:class:`._ActionEnum`): Enumeration of possible
+            actions in the environments.
+        observation_type (str): Type of observation, 'total' or 'partial'.
+        obs_range (int): Visibility range of the partial observations.
+        single_observation_space (gymnasium.spaces.Box): Observation space of
+            one environment.
+        single_action_space (gymnasium.spaces.Discrete): Action space of one
+            environment.
+        observation_space (gymnasium.spaces.Box): Observation space of the
+            batch.
+        action_space (gymnasium.spaces.MultiDiscrete): Action space of the
+            batch.
+        random_generators (list): Random number generator of each environment.
+        cell_types (:py:class:`numpy.ndarray`): Type of each cell.
+        pollution (:py:class:`numpy.ndarray`): Pollution of each cell.
+        flower_types (:py:class:`numpy.ndarray`): Type of the flower of each
+            cell.
+        growth_stages (:py:class:`numpy.ndarray`): Growth stage of the flower
+            of each cell.
+        planted_by (:py:class:`numpy.ndarray`): Index of the agent that planted
+            the flower of each cell.
+        grid_agent_id (:py:class:`numpy.ndarray`): Index of the agent in each
+            cell.
+        positions (:py:class:`numpy.ndarray`): Position of each agent.
+        money (:py:class:`numpy.ndarray`): Money of each agent.
+        seeds (:py:class:`numpy.ndarray`): Number of seeds of each agent by
+            flower type, -1 for infinite seeds.
+        flowers_planted (:py:class:`numpy.ndarray`): Number of flowers each
+            agent has planted on the grid by flower type.
+        flowers_harvested (:py:class:`numpy.ndarray`): Number of flowers each
+            agent has harvested by flower type.
+        turns_without_income (:py:class:`numpy.ndarray`): Number of turns each
+            agent has not earned money.
+        agent_selection (int): Index of the agent that acts at the next step.
+        num_moves (int): Number of steps executed in the current episode.
+        actions_in_current_turn (int): Number of actions taken in the current
+            turn.
+    """
+
+    def __init__(self, num_envs, config=None):
+        """
+        Create the batch of environments.
+
+        Args:
+            num_envs (int): Number of environments in the batch.
+            config (OmegaConf, optional): The configuration object containing
+                environment parameters, as for :py:func:`.make_env`. The
+                renderer and metrics sections are ignored.
+        """
+        if config is None:
+            config = OmegaConf.create({"grid": {}, "observation": {}})
+
+        self.num_envs = num_envs
+        self.num_iter = config.get("num_iterations", 1000)
+        self._random_seed = config.get("random_seed", None)
+
+        self.grid_world = make_grid_world(
+            config, np.random.RandomState(self._random_seed))
+        grid_world = self.grid_world
+
+        self.height = grid_world.height
+        self.width = grid_world.width
+        self.num_agents = len(grid_world.agents)
+        self.num_flower_types = len(grid_world.flowers_data)
+        self.action_enum = create_action_enum(self.num_flower_types)
+        self._harvest = self.action_enum.HARVEST.value
+        self._first_plant = (
+            self.action_enum.get_planting_action_for_type(0).value
+            if self.num_flower_types > 0 else len(self.action_enum))
+
+        # Flower lookup tables indexed by flower type
+        flowers_data = [grid_world.flowers_data[t]
+                        for t in range(self.num_flower_types)]
+        self._prices = grid_world.flower_prices[:self.num_flower_types]
+        self._reduction_sums = np.array(
+            [sum(data['pollution_reduction']) for data in flowers_data],
+            dtype=np.float64)
+        self._final_reductions = np.array(
+            [data['pollution_reduction'][-1]
+             if data['pollution_reduction'] else 0.0
+             for data in flowers_data], dtype=np.float64)
+
+        self.observation_type = config.observation.get("type", "total")
+        self.obs_range = config.observation.get("range", 1)
+        if config.observation.get("dtype", "float32") != "float32":
+            raise ValueError(
+                "The vectorized environments only support float32 "
+                "observations.")
+        if self.observation_type == "total":
+            obs_shape = (self.width, self.height, FEATURES_PER_CELL)
+        elif self.observation_type == "partial":
+            obs_shape = (2 * self.obs_range + 1, 2 * self.obs_range + 1,
+                         FEATURES_PER_CELL)
+        else:
+            raise ValueError(
+                f"Unknown observation type: {self.observation_type}. "
+                "Supported types are 'total' and 'partial'."
+            )
+
+        self.single_observation_space = Box(low=0, high=1, shape=obs_shape,
+                                            dtype=np.float32)
+        self.single_action_space = Discrete(len(self.action_enum))
+        self.observation_space = Box(low=0, high=1,
+                                     shape=(num_envs,) + obs_shape,
+                                     dtype=np.float32)
+        self.action_space = MultiDiscrete(
+            [len(self.action_enum)] * num_envs)
+
+        self.random_generators = None
+        self._allocate_state()
+
+    def _allocate(self, name, shape, dtype):
+        """
+        Allocate the array holding one part of the state of the environments.
+
+        Subclasses can override this method to place the state in another
+        kind of memory.
+
+        Args:
+            name (str): Name of the attribute that will hold the array.
+            shape (tuple): Shape of the array.
+            dtype (numpy.dtype): Type of the elements of the array.
+
+        Returns:
+            :py:class:`numpy.ndarray`: The allocated array.
+        """
+        return np.zeros(shape, dtype=dtype)
+
+    def _allocate_state(self):
+        """
+        Allocate the arrays holding the state of all the environments.
+        """
+        grid_shape = (self.num_envs, self.height, self.width)
+        agent_shape = (self.num_envs, self.num_agents)
+        counter_shape = agent_shape + (self.num_flower_types,)
+
+        for name, shape, dtype in [
+            ('cell_types', grid_shape, np.uint8),
+            ('pollution', grid_shape, self.grid_world.pollution.dtype),
+            ('flower_types', grid_shape, np.int8),
+            ('growth_stages', grid_shape, np.uint8),
+            ('planted_by', grid_shape, np.int16),
+            ('grid_agent_id', grid_shape, np.int16),
+            ('positions', agent_shape + (2,), np.int32),
+            ('money', agent_shape, np.float64),
+            ('seeds', counter_shape, np.int32),
+            ('flowers_planted', counter_shape, np.int32),
+            ('flowers_harvested', counter_shape, np.int32),
+            ('turns_without_income', agent_shape, np.int32),
+        ]:
+            setattr(self, name, self._allocate(name, shape, dtype))
+
+        self.agent_selection = 0
+        self.num_moves = 0
+        self.actions_in_current_turn = 0
+
+    def reset(self, seed=None, options=None):
+        """
+        Reset all the environments to their initial state.
+
+        The environment at index `n` is seeded with `seed + n`, so it starts
+        from the same state as a :py:class:`.GardenersEnv` reset with this
+        seed. If no seed is given, the random generators of the previous
+        episode are kept, or created from the `random_seed` of the
+        configuration at the first reset.
+
+        Args:
+            seed (int, optional): Random seed of the first environment.
+            options (dict, optional): Additional options for reset
+                customization.
+
+        Returns:
+            tuple: A tuple containing:
+                - observations (:py:class:`numpy.ndarray`): Observations of
+                  the first agent to act in each environment.
+                - infos (dict): Additional information, with the action masks
+                  of the first agent to act under the 'action_mask' key.
+        """
+        if seed is None and self.random_generators is None:
+            seed = self._random_seed
+        if seed is not None or self.random_generators is None:
+            self.random_generators = [
+                np.random.RandomState(None if seed is None else seed + n)
+                for n in range(self.num_envs)
+            ]
+
+        for n, random_generator in enumerate(self.random_generators):
+            self._load_world(n, self.grid_world.reset(random_generator))
+
+        self.agent_selection = 0
+        self.num_moves = 0
+        self.actions_in_current_turn = 0
+
+        return self._get_observations(), {'action_mask': self.action_masks()}
+
+    def _load_world(self, env_index, grid_world):
+        """
+        Copy the state of a grid world into the arrays of an environment.
+
+        Args:
+            env_index (int): Index of the environment to overwrite.
+            grid_world (:py:class:`.GridWorld`): The grid world to copy.
+        """
+        n = env_index
+        self.cell_types[n] = grid_world.cell_types
+        self.pollution[n] = grid_world.pollution
+        self.flower_types[n] = grid_world.flower_types
+        self.growth_stages[n] = grid_world.growth_stages
+
+        agent_index = {id(agent): k for k, agent in
+                       enumerate(grid_world.agents)}
+
+        self.planted_by[n] = -1
+        for i, j in zip(*np.nonzero(grid_world.flower_types >= 0)):
+            planter = grid_world.flowers[i, j].planted_by
+            if planter is not None:
+                self.planted_by[n, i, j] = agent_index[id(planter)]
+
+        self.grid_agent_id[n] = -1
+        for k, agent in enumerate(grid_world.agents):
+            self.positions[n, k] = agent.position
+            self.money[n, k] = agent.money
+            self.seeds[n, k] = agent.seeds
+            self.flowers_planted[n, k] = agent.flowers_planted
+            self.flowers_harvested[n, k] = agent.flowers_harvested
+            self.turns_without_income[n, k] = agent.turns_without_income
+            # As in the grid world, the last agent placed in a cell is the
+            # one the cell refers to
+            self.grid_agent_id[(n,) + tuple(agent.position)] = k
+
+    def step(self, actions):
+        """
+        Execute one step in all the environments.
+
+        The current agent of every environment performs the action given for
+        this environment. Invalid actions are ignored, as in
+        :py:class:`.ActionHandler`, but without warnings. When the episode is
+        over, all the environments are reset and the last observations are
+        returned in the infos.
+
+        The actions can also be given for a subset of the environments as a
+        dictionary. The agents of the other environments are skipped: they
+        do not act, their turns without income are not counted and their
+        rewards are 0. The environments stay in lockstep, so the turn still
+        moves on to the next agent and the cells of all the environments are
+        updated at the end of the turn.
+
+        Args:
+            actions (:py:class:`numpy.ndarray` or dict): Action of each
+                environment, or mapping from the index of some environments
+                to their action.
+
+        Returns:
+            tuple: A tuple containing:
+                - observations (:py:class:`numpy.ndarray`): Observations of
+                  the next agent to act in each environment.
+                - rewards (:py:class:`numpy.ndarray`): Reward of the agent
+                  that acted in each environment.
+                - terminations (:py:class:`numpy.ndarray`): Whether each
+                  environment reached a terminal state.
+                - truncations (:py:class:`numpy.ndarray`): Whether each
+                  episode was truncated.
+                - infos (dict): Additional information with the following
+                  keys:
+
+                  - 'rewards': Dictionary of the arrays of each reward
+                    component, as computed by :py:class:`.RewardFunctions`.
+                  - 'action_mask': Action masks of the next agent to act.
+                  - 'action_valid': Whether the action of each environment
+                    was performed, False if it was invalid or skipped.
+                  - 'final_observation' and 'final_action_mask': Observations
+                    and action masks before the reset, only at the end of an
+                    episode.
+        """
+        return self._step(*self._batch_actions(actions))
+
+    def _batch_actions(self, actions):
+        """
+        Convert the actions given to :py:meth:`step` to an array of actions
+        and a mask of the environments that act.
+
+        Args:
+            actions (:py:class:`numpy.ndarray` or dict): Action of each
+                environment, or mapping from the index of some environments
+                to their action.
+
+        Returns:
+            tuple: The action of each environment, WAIT for skipped ones, and
+            whether each environment acts.
+        """
+        if not isinstance(actions, Mapping):
+            return (np.asarray(actions, dtype=np.int64),
+                    np.ones(self.num_envs, dtype=bool))
+
+        envs = np.fromiter(actions.keys(), dtype=np.int64, count=len(actions))
+        batch = np.full(self.num_envs, self.action_enum.WAIT.value,
+                        dtype=np.int64)
+        batch[envs] = np.fromiter(actions.values(), dtype=np.int64,
+                                  count=len(actions))
+        active = np.zeros(self.num_envs, dtype=bool)
+        active[envs] = True
+        return batch, active
+
+    def _step(self, actions, active):
+        """
+        Execute one step in all the environments, see :py:meth:`step`.
+
+        Args:
+            actions (:py:class:`numpy.ndarray`): Action of each environment.
+            active (:py:class:`numpy.ndarray`): Whether each environment acts.
+
+        Returns:
+            tuple: The same tuple as :py:meth:`step`.
+        """
+        agent = self.agent_selection
+        envs = np.arange(self.num_envs)
+        rows = self.positions[:, agent, 0].copy()
+        cols = self.positions[:, agent, 1].copy()
+        prev_flower_types = self.flower_types[envs, rows, cols]
+
+        seed_returns = self._seed_returns(actions, rows, cols)
+        valid = np.ones(self.num_envs, dtype=bool)
+
+        if batched_step is not None:
+            batched_step(actions, agent, self.positions, self.cell_types,
+                         self.grid_agent_id, self.flower_types,
+                         self.growth_stages, self.planted_by, self.seeds,
+                         self.flowers_planted, self.flowers_harvested,
+                         self.money, self.turns_without_income,
+                         self.grid_world.max_growth_stages, self._prices,
+                         seed_returns, _DELTAS, self._harvest,
+                         self._first_plant,
+                         bool(self.grid_world.collisions_on),
+                         int(CellType.GROUND), active, valid)
+        else:
+            # Every action is invalid until it is performed, except waiting.
+            # Skipped environments wait, so they are only excluded from the
+            # waiting agents.
+            valid[:] = (actions == self.action_enum.WAIT.value) & active
+            valid[self._move(np.flatnonzero(actions < 4), actions,
+                             agent)] = True
+            harvested = self._harvest_flowers(
+                np.flatnonzero(actions == self._harvest), agent, rows, cols,
+                seed_returns)
+            valid[harvested] = True
+            valid[self._plant_flowers(
+                np.flatnonzero(actions >= self._first_plant), actions, agent,
+                rows, cols)] = True
+
+            self.turns_without_income[:, agent] += active
+            self.turns_without_income[harvested, agent] = 0
+
+        # Update pollution once all agents have acted
+        self.actions_in_current_turn += 1
+        if self.actions_in_current_turn >= self.num_agents:
+            self._update_cells()
+            self.actions_in_current_turn = 0
+
+        rewards = self._compute_rewards(actions, agent, rows, cols,
+                                        prev_flower_types)
+        for reward in rewards.values():
+            reward[~active] = 0.0
+
+        self.num_moves += 1
+        self.agent_selection = (agent + 1) % self.num_agents
+
+        terminations = np.zeros(self.num_envs, dtype=bool)
+        truncations = np.full(self.num_envs, self.num_moves >= self.num_iter)
+
+        observations = self._get_observations()
+        infos = {'rewards': rewards, 'action_mask': self.action_masks(),
+                 'action_valid': valid}
+        if self.num_moves >= self.num_iter:
+            infos['final_observation'] = observations
+            infos['final_action_mask'] = infos['action_mask']
+            observations, reset_infos = self.reset()
+            infos['action_mask'] = reset_infos['action_mask']
+
+        return (observations, rewards['total'], terminations, truncations,
+                infos)
+
+    def _is_grown(self, envs, rows, cols):
+        """
+        Check whether cells of some environments hold a fully grown flower.
+
+        Args:
+            envs (:py:class:`numpy.ndarray`): Indices of the environments.
+            rows (:py:class:`numpy.ndarray`): Row of the cell to check in each
+                environment.
+            cols (:py:class:`numpy.ndarray`): Column of the cell to check in
+                each environment.
+
+        Returns:
+            :py:class:`numpy.ndarray`: Whether each cell holds a fully grown
+            flower.
+        """
+        flower_types = self.flower_types[envs, rows, cols].astype(np.intp)
+        return (flower_types >= 0) & (
+            self.growth_stages[envs, rows, cols]
+            == self.grid_world.max_growth_stages[flower_types.clip(0)])
+
+    def _seed_returns(self, actions, rows, cols):
+        """
+        Compute the number of seeds a harvest returns in each environment.
+
+        When the number of seeds returned is random, a number is drawn from
+        the random generator of each environment where a flower is harvested,
+        as in :py:meth:`.GridWorld.next_seed_return`.
+
+        Args:
+            actions (:py:class:`numpy.ndarray`): Action of each environment.
+            rows (:py:class:`numpy.ndarray`): Row of the agent in each
+                environment.
+            cols (:py:class:`numpy.ndarray`): Column of the agent in each
+                environment.
+
+        Returns:
+            :py:class:`numpy.ndarray`: Number of seeds returned in each
+            environment, 0 if the system of seeds is disabled.
+        """
+        seed_returns = np.zeros(self.num_envs, dtype=np.int32)
+        num_seeds_returned = self.grid_world.num_seeds_returned
+        if num_seeds_returned is None:
+            return seed_returns
+
+        if num_seeds_returned != -3:
+            seed_returns[:] = num_seeds_returned
+            return seed_returns
+
+        envs = np.flatnonzero(actions == self._harvest)
+        envs = envs[self._is_grown(envs, rows[envs], cols[envs])]
+        for n in envs:
+            seed_returns[n] = self.random_generators[n].randint(
+                MIN_SEED_RETURNS, MAX_SEED_RETURNS)
+        return seed_returns
+
+    def _valid_moves(self, envs, rows, cols):
+        """
+        Check whether positions are valid moves in some environments.
+
+        Args:
+            envs (:py:class:`numpy.ndarray`): Indices of the environments.
+            rows (:py:class:`numpy.ndarray`): Row of the position to check in
+                each environment.
+            cols (:py:class:`numpy.ndarray`): Column of the position to check
+                in each environment.
+
+        Returns:
+            :py:class:`numpy.ndarray`: Whether each move is valid.
+        """
+        valid = ((rows >= 0) & (rows < self.height)
+                 & (cols >= 0) & (cols < self.width))
+        rows = np.where(valid, rows, 0)
+        cols = np.where(valid, cols, 0)
+        valid &= self.cell_types[envs, rows, cols] == CellType.GROUND
+        if self.grid_world.collisions_on:
+            valid &= self.grid_agent_id[envs, rows, cols] < 0
+        return valid
+
+    def _move(self, envs, actions, agent):
+        """
+        Move the current agent in the environments where it moves.
+
+        Args:
+            envs (:py:class:`numpy.ndarray`): Indices of the environments where
+                the agent moves.
+            actions (:py:class:`numpy.ndarray`): Action of each environment.
+            agent (int): Index of the agent that acts.
+
+        Returns:
+            :py:class:`numpy.ndarray`: Indices of the environments where the
+            agent moved.
+        """
+        old = self.positions[envs, agent]
+        new = old + _DELTAS[actions[envs]]
+        valid = self._valid_moves(envs, new[:, 0], new[:, 1])
+        envs, old, new = envs[valid], old[valid], new[valid]
+
+        self.grid_agent_id[envs, old[:, 0], old[:, 1]] = -1
+        self.positions[envs, agent] = new
+        self.grid_agent_id[envs, new[:, 0], new[:, 1]] = agent
+
+        return envs
+
+    def _harvest_flowers(self, envs, agent, rows, cols, seed_returns):
+        """
+        Harvest the fully grown flowers under the current agent in the
+        environments where it harvests.
+
+        Args:
+            envs (:py:class:`numpy.ndarray`): Indices of the environments where
+                the agent harvests.
+            agent (int): Index of the agent that acts.
+            rows (:py:class:`numpy.ndarray`): Row of the agent in each
+                environment.
+            cols (:py:class:`numpy.ndarray`): Column of the agent in each
+                environment.
+            seed_returns (:py:class:`numpy.ndarray`): Number of seeds returned
+                by a harvest in each environment.
+
+        Returns:
+            :py:class:`numpy.ndarray`: Indices of the environments where a
+            flower was harvested.
+        """
+        rows, cols = rows[envs], cols[envs]
+        grown = self._is_grown(envs, rows, cols)
+        envs, rows, cols = envs[grown], rows[grown], cols[grown]
+        flower_types = self.flower_types[envs, rows, cols].astype(np.intp)
+        planters = self.planted_by[envs, rows, cols]
+
+        self.flower_types[envs, rows, cols] = -1
+        self.growth_stages[envs, rows, cols] = 0
+        self.planted_by[envs, rows, cols] = -1
+
+        # Infinite seed counts (-1) are left unchanged
+        seeds = self.seeds[envs, agent, flower_types]
+        self.seeds[envs, agent, flower_types] = (
+            seeds + seed_returns[envs] * (seeds >= 0))
+
+        self.money[envs, agent] += self._prices[flower_types]
+        self.flowers_harvested[envs, agent, flower_types] += 1
+
+        # Initially planted flowers do not have a planter
+        planted = planters >= 0
+        self.flowers_planted[envs[planted], planters[planted],
+                             flower_types[planted]] -= 1
+
+        return envs
+
+    def _plant_flowers(self, envs, actions, agent, rows, cols):
+        """
+        Plant flowers under the current agent in the environments where it
+        plants.
+
+        Args:
+            envs (:py:class:`numpy.ndarray`): Indices of the environments where
+                the agent plants.
+            actions (:py:class:`numpy.ndarray`): Action of each environment.
+            agent (int): Index of the agent that acts.
+            rows (:py:class:`numpy.ndarray`): Row of the agent in each
+                environment.
+            cols (:py:class:`numpy.ndarray`): Column of the agent in each
+                environment.
+
+        Returns:
+            :py:class:`numpy.ndarray`: Indices of the environments where a
+            flower was planted.
+        """
+        rows, cols = rows[envs], cols[envs]
+        flower_types = actions[envs] - self._first_plant
+        seeds = self.seeds[envs, agent, flower_types]
+        valid = ((seeds != 0)
+                 & (self.cell_types[envs, rows, cols] == CellType.GROUND)
+                 & (self.flower_types[envs, rows, cols] < 0))
+        envs, rows, cols = envs[valid], rows[valid], cols[valid]
+        flower_types, seeds = flower_types[valid], seeds[valid]
+
+        self.seeds[envs, agent, flower_types] = seeds - (seeds > 0)
+        self.flower_types[envs, rows, cols] = flower_types
+        self.growth_stages[envs, rows, cols] = 0
+        self.planted_by[envs, rows, cols] = agent
+        self.flowers_planted[envs, agent, flower_types] += 1
+
+        return envs
+
+    def _update_cells(self):
+        """
+        Update the pollution and the flowers of all cells of all environments.
+
+        This is the batched equivalent of :py:meth:`.GridWorld.update_cell`.
+        """
+        grid_world = self.grid_world
+        if step_grid is not None:
+            # The update is the same for every cell, so the grids of all the
+            # environments are passed as one tall grid
+            shape = (-1, self.width)
+            kernel = (step_grid if self.cell_types.size >= PARALLEL_MIN_CELLS
+                      else step_grid_serial)
+            kernel(self.cell_types.reshape(shape),
+                   self.flower_types.reshape(shape),
+                   self.growth_stages.reshape(shape),
+                   self.pollution.reshape(shape),
+                   grid_world.pollution_reductions,
+                   grid_world.max_growth_stages,
+                   float(grid_world.min_pollution),
+                   float(grid_world.max_pollution),
+                   float(grid_world.pollution_increment),
+                   int(CellType.GROUND))
+            return
+
+        has_flower = self.flower_types >= 0
+        is_empty_ground = (self.cell_types == CellType.GROUND) & ~has_flower
+        flower_types = self.flower_types.clip(0)
+        reductions = grid_world.pollution_reductions[flower_types,
+                                                     self.growth_stages]
+
+        # As in GridWorld, the results are exact for pollution stored as bytes
+        np.copyto(self.pollution,
+                  np.maximum(self.pollution - reductions,
+                             grid_world.min_pollution),
+                  where=has_flower, casting='unsafe')
+        np.copyto(self.pollution,
+                  np.minimum(self.pollution + grid_world.pollution_increment,
+                             grid_world.max_pollution),
+                  where=is_empty_ground, casting='unsafe')
+        np.minimum(self.growth_stages + has_flower,
+                   grid_world.max_growth_stages[flower_types],
+                   out=self.growth_stages)
+
+    def _compute_rewards(self, actions, agent, rows, cols, prev_flower_types):
+        """
+        Compute the rewards of the current agent in all the environments.
+
+        The rewards are the same as the ones computed by
+        :py:class:`.RewardFunctions` for a single environment.
+
+        Args:
+            actions (:py:class:`numpy.ndarray`): Action of each environment.
+            agent (int): Index of the agent that acted.
+            rows (:py:class:`numpy.ndarray`): Row of the agent in each
+                environment before its action.
+            cols (:py:class:`numpy.ndarray`): Column of the agent in each
+                environment before its action.
+            prev_flower_types (:py:class:`numpy.ndarray`): Type of the flower
+                under the agent in each environment before its action.
+
+        Returns:
+            dict: Dictionary of arrays with the 'ecology', 'wellbeing',
+            'biodiversity' and 'total' rewards of each environment.
+        """
+        grid_world = self.grid_world
+        p_max = grid_world.max_pollution
+        p_min = grid_world.min_pollution
+        envs = np.arange(self.num_envs)
+
+        # Agents only stay in place when planting or harvesting
+        flower_types = self.flower_types[envs, rows, cols].astype(np.intp)
+        has_flower = flower_types >= 0
+        flower_types = flower_types.clip(0)
+        prev_flower_types = prev_flower_types.astype(np.intp)
+        cell_pollution = self.pollution[envs, rows, cols].astype(np.float64)
+
+        is_plant = actions >= self._first_plant
+        is_harvest = actions == self._harvest
+        harvested = is_harvest & ~has_flower & (prev_flower_types >= 0)
+        prev_flower_types = prev_flower_types.clip(0)
+
+        ecology = np.zeros(self.num_envs)
+        r_max = (p_max - p_min) * 1/0.01
+        if r_max > 0:
+            planted = is_plant & has_flower
+            r_plant = (self._reduction_sums[flower_types] * 1 / (
+                cell_pollution - p_max + 0.01))
+            ecology[planted] = r_plant[planted] / r_max
+
+            r_harvest = (self._final_reductions[prev_flower_types]
+                         * (cell_pollution - p_min))
+            ecology[harvested] = r_harvest[harvested] / (p_max - p_min)
+
+        wellbeing = np.where(
+            is_harvest, 0.0,
+            -np.minimum(self.turns_without_income[:, agent]
+                        / MAX_PENALTY_TURNS, 1.0))
+        if self.num_flower_types > 0:
+            wellbeing[harvested] = (self._prices[prev_flower_types[harvested]]
+                                    / self._prices.max())
+
+        biodiversity = np.zeros(self.num_envs)
+        max_biodiversity = (np.log(self.num_flower_types)
+                            if self.num_flower_types > 0 else 0.0)
+        planted = is_plant & has_flower
+        if max_biodiversity > 0 and planted.any():
+            flowers = self.flowers_planted.sum(axis=1)
+            prev_flowers = flowers.copy()
+            prev_flowers[envs, flower_types] -= 1
+            biodiversity = ((self._shannon_index(flowers)
+                             - self._shannon_index(prev_flowers))
+                            / max_biodiversity)
+            biodiversity[~planted] = 0.0
+
+        return {'ecology': ecology,
+                'wellbeing': wellbeing,
+                'biodiversity': biodiversity,
+                'total': (ecology + wellbeing + biodiversity) / 3}
+
+    @staticmethod
+    def _shannon_index(flowers):
+        """
+        Compute the Shannon-Wiener index of the flowers of each environment.
+
+        Args:
+            flowers (:py:class:`numpy.ndarray`): Number of flowers of each
+                type in each environment.
+
+        Returns:
+            :py:class:`numpy.ndarray`: The Shannon-Wiener index of each
+            environment.
+        """
+        total = flowers.sum(axis=1, keepdims=True)
+        present = (flowers > 0) & (total > 0)
+        ratios = np.divide(flowers, total, out=np.ones(flowers.shape),
+                           where=present)
+        return -(ratios * np.log(ratios)).sum(axis=1)
+
+    def action_masks(self):
+        """
+        Compute the action masks of the next agent to act.
+
+        Returns:
+            :py:class:`numpy.ndarray`: Array of shape
+            ``(num_envs, num_actions)`` with 1 for valid actions and 0 for
+            invalid ones, as computed by :py:class:`.ActionHandler`.
+        """
+        agent = self.agent_selection
+        envs = np.arange(self.num_envs)
+        rows = self.positions[:, agent, 0]
+        cols = self.positions[:, agent, 1]
+        masks = np.ones((self.num_envs, len(self.action_enum)), dtype=np.int8)
+
+        for action, (d_row, d_col) in enumerate(_DELTAS):
+            masks[:, action] = self._valid_moves(envs, rows + d_row,
+                                                 cols + d_col)
+
+        masks[:, self._harvest] = self._is_grown(envs, rows, cols)
+
+        seeds = self.seeds[:, agent]
+        can_plant_on = ((self.cell_types[envs, rows, cols] == CellType.GROUND)
+                        & (self.flower_types[envs, rows, cols] < 0))
+        masks[:, self._first_plant:] = (seeds != 0) & can_plant_on[:, None]
+
+        return masks
+
+    def _cell_features(self):
+        """
+        Compute the features of all cells of all environments that do not
+        depend on the observing agent.
+
+        Returns:
+            :py:class:`numpy.ndarray`: Array of shape
+            ``(num_envs, height, width, 5)`` with the normalized cell type,
+            pollution, flower type, flower growth stage and agent of each
+            cell, as described in :py:class:`.TotalObservation`.
+        """
+        grid_world = self.grid_world
+        features = np.zeros(self.cell_types.shape + (5,))
+        has_flower = self.flower_types >= 0
+        flower_types = self.flower_types.clip(0)
+
+        features[..., 0] = self.cell_types / len(CellType)
+        features[..., 1] = np.where(
+            self.cell_types == CellType.GROUND,
+            (self.pollution.astype(np.float64) - grid_world.min_pollution)
+            / (grid_world.max_pollution - grid_world.min_pollution),
+            0.0)
+        if self.num_flower_types > 0:
+            features[..., 2] = np.where(
+                has_flower, (flower_types + 1) / self.num_flower_types, 0.0)
+        features[..., 3] = np.where(
+            has_flower,
+            (self.growth_stages + 1.0)
+            / (grid_world.max_growth_stages[flower_types] + 1.0),
+            0.0)
+        features[..., 4] = np.where(
+            self.grid_agent_id >= 0,
+            (self.grid_agent_id + 1.0) / self.num_agents, 0.0)
+
+        return features
+
+    def _get_observations(self):
+        """
+        Generate the observations of the next agent to act.
+
+        Returns:
+            :py:class:`numpy.ndarray`: Array of shape
+            ``(num_envs,) + single_observation_space.shape`` with the
+            observation of each environment, as generated by
+            :py:class:`.TotalObservation` or :py:class:`.PartialObservation`.
+        """
+        agent = self.agent_selection
+        agent_x = self.positions[:, agent, 0] / (self.width - 1)
+        agent_y = self.positions[:, agent, 1] / (self.height - 1)
+        features = self._cell_features()
+
+        if self.observation_type == "total":
+            obs = np.empty(self.observation_space.shape, dtype=np.float32)
+            obs[..., :5] = features[:, :self.width, :self.height]
+            obs[..., 5] = agent_x[:, None, None]
+            obs[..., 6] = agent_y[:, None, None]
+            return obs
+
+        # Pad the grid with empty cells so that the window of every agent
+        # lies inside the padded grid
+        r = self.obs_range
+        size = 2 * r + 1
+        padded = np.zeros((self.num_envs, self.height + 2 * r,
+                           self.width + 2 * r, FEATURES_PER_CELL))
+        inside = padded[:, r:r + self.height, r:r + self.width]
+        inside[..., :5] = features
+        inside[..., 5] = agent_x[:, None, None]
+        inside[..., 6] = agent_y[:, None, None]
+
+        window_rows = self.positions[:, agent, 0, None] + np.arange(size)
+        window_cols = self.positions[:, agent, 1, None] + np.arange(size)
+        window = padded[np.arange(self.num_envs)[:, None, None],
+                        window_rows[:, :, None], window_cols[:, None, :]]
+
+        # As in PartialObservation, the first axis of the observation follows
+        # the columns of the grid and the second one its rows
+        return window.transpose(0, 2, 1, 3).astype(np.float32)
+
+    def close(self):
+        """
+        Close the environments.
+
+        The environments of this class do not hold any resource, this method
+        exists for compatibility with the vectorized environments of
+        Gymnasium and :py:class:`SharedVectorGardeners`.
+        """
+
+
+class SharedVectorGardeners(SyncVectorGardeners):
+    """
+    Batch of Ethical Gardeners environments stepped by worker processes.
+
+    The state arrays of :py:class:`SyncVectorGardeners`, the actions and the
+    results of a step are allocated in shared memory. Each worker owns a
+    contiguous slice of the environments and steps it with a
+    :py:class:`SyncVectorGardeners` whose arrays are views on this slice.
+    The main process and the workers only synchronize with a barrier, so no
+    data is pickled at each step.
+
+    The environments give the same results as a :py:class:`SyncVectorGardeners`
+    of the same size reset with the same seed. The state arrays can be read
+    from the main process between two steps.
+
+    The workers must be stopped with :py:meth:`close` once the environments
+    are no longer used.
+
+    Attributes:
+        num_workers (int): Number of worker processes.
+    """
+
+    def __init__(self, num_envs, config=None, num_workers=None):
+        """
+        Create the batch of environments and start the worker processes.
+
+        Args:
+            num_envs (int): Number of environments in the batch.
+            config (OmegaConf, optional): The configuration object containing
+                environment parameters, as for :py:class:`SyncVectorGardeners`.
+            num_workers (int, optional): Number of worker processes. Defaults
+                to the number of CPUs, and is at most `num_envs`.
+        """
+        if config is None:
+            config = OmegaConf.create({"grid": {}, "observation": {}})
+
+        self.num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+        self._shared_memories = {}
+        super().__init__(num_envs, config)
+
+        # Buffers exchanged with the workers
+        num_actions = len(self.action_enum)
+        for name, shape, dtype in [
+            ('_command', (2,), np.int64),
+            ('_actions', (num_envs,), np.int64),
+            ('_active', (num_envs,), bool),
+            ('_observations', self.observation_space.shape, np.float32),
+            ('_final_observations', self.observation_space.shape,
+             np.float32),
+            ('_masks', (num_envs, num_actions), np.int8),
+            ('_final_masks', (num_envs, num_actions), np.int8),
+            ('_rewards', (len(_REWARD_NAMES), num_envs), np.float64),
+            ('_action_valid', (num_envs,), bool),
+        ]:
+            setattr(self, name, self._allocate(name, shape, dtype))
+
+        shared_arrays = {
+            name: (shared_memory.name, getattr(self, name).shape,
+                   getattr(self, name).dtype.str)
+            for name, shared_memory in self._shared_memories.items()
+        }
+        # Workers are spawned rather than forked, as forking a process that
+        # already runs the threads of Numba is not safe
+        context = multiprocessing.get_context('spawn')
+        self._barrier = context.Barrier(self.num_workers + 1)
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        self._workers = [
+            context.Process(target=_run_worker,
+                            args=(config, shared_arrays, start, end,
+                                  self._barrier),
+                            daemon=True)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._reset_once = False
+
+    def _allocate(self, name, shape, dtype):
+        """
+        Allocate an array in a new block of shared memory.
+
+        Args:
+            name (str): Name of the attribute that will hold the array.
+            shape (tuple): Shape of the array.
+            dtype (numpy.dtype): Type of the elements of the array.
+
+        Returns:
+            :py:class:`numpy.ndarray`: The allocated array, filled with zeros.
+        """
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        shared_memory = SharedMemory(create=True, size=max(size, 1))
+        self._shared_memories[name] = shared_memory
+        array = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+        array.fill(0)
+        return array
+
+    def _run(self, command):
+        """
+        Make all the workers execute a command and wait for them to finish.
+
+        Args:
+            command (int): The command to execute.
+
+        Raises:
+            RuntimeError: If a worker failed.
+        """
+        self._command[0] = command
+        try:
+            # The first wait starts the workers, the second one waits for
+            # them to finish
+            self._barrier.wait()
+            if command != _CLOSE:
+                self._barrier.wait()
+        except BrokenBarrierError:
+            raise RuntimeError("A worker process of the environments failed."
+                               ) from None
+
+    def reset(self, seed=None, options=None):
+        """
+        Reset all the environments to their initial state.
+
+        The environments are seeded as in
+        :py:meth:`SyncVectorGardeners.reset`.
+
+        Args:
+            seed (int, optional): Random seed of the first environment.
+            options (dict, optional): Additional options for reset
+                customization.
+
+        Returns:
+            tuple: A tuple containing:
+                - observations (:py:class:`numpy.ndarray`): Observations of
+                  the first agent to act in each environment.
+                - infos (dict): Additional information, with the action masks
+                  of the first agent to act under the 'action_mask' key.
+        """
+        if seed is None and not self._reset_once:
+            seed = self._random_seed
+        self._reset_once = True
+
+        self._command[1] = -1 if seed is None else seed
+        self._run(_RESET)
+
+        self.agent_selection = 0
+        self.num_moves = 0
+        self.actions_in_current_turn = 0
+
+        return self._observations.copy(), {'action_mask': self._masks.copy()}
+
+    def step(self, actions):
+        """
+        Execute one step in all the environments.
+
+        Args:
+            actions (:py:class:`numpy.ndarray` or dict): Action of each
+                environment, or mapping from the index of some environments
+                to their action, as in :py:meth:`SyncVectorGardeners.step`.
+
+        Returns:
+            tuple: The same tuple as :py:meth:`SyncVectorGardeners.step`.
+        """
+        self._actions[:], self._active[:] = self._batch_actions(actions)
+        self._run(_STEP)
+
+        self.num_moves += 1
+        self.agent_selection = (self.agent_selection + 1) % self.num_agents
+        self.actions_in_current_turn = ((self.actions_in_current_turn + 1)
+                                        % self.num_agents)
+
+        rewards = {name: self._rewards[k].copy()
+                   for k, name in enumerate(_REWARD_NAMES)}
+        terminations = np.zeros(self.num_envs, dtype=bool)
+        truncations = np.full(self.num_envs, self.num_moves >= self.num_iter)
+        infos = {'rewards': rewards, 'action_mask': self._masks.copy(),
+                 'action_valid': self._action_valid.copy()}
+        if self.num_moves >= self.num_iter:
+            # The workers have already reset their environments
+            infos['final_observation'] = self._final_observations.copy()
+            infos['final_action_mask'] = self._final_masks.copy()
+            self.agent_selection = 0
+            self.num_moves = 0
+            self.actions_in_current_turn = 0
+
+        return (self._observations.copy(), rewards['total'], terminations,
+                truncations, infos)
+
+    def close(self):
+        """
+        Stop the worker processes and release the shared memory.
+        """
+        if not self._shared_memories:
+            return
+
+        if all(worker.is_alive() for worker in self._workers):
+            try:
+                self._run(_CLOSE)
+            except RuntimeError:
+                pass
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+        # The arrays must be released before the memory they view
+        for name in self._shared_memories:
+            setattr(self, name, None)
+        for shared_memory in self._shared_memories.values():
+            try:
+                shared_memory.close()
+            except BufferError:
+                # An array viewing the memory is still referenced elsewhere
+                pass
+            shared_memory.unlink()
+        self._shared_memories = {}
+
+
+class _SharedSlice(SyncVectorGardeners):
+    """
+    Environments of one worker of :py:class:`SharedVectorGardeners`, whose
+    state arrays are views on a slice of the shared arrays.
+    """
+
+    def __init__(self, config, arrays, start, end):
+        """
+        Create the environments of a worker.
+
+        Args:
+            config (OmegaConf): The configuration of the environments.
+            arrays (dict): The shared arrays of all the environments, keyed by
+                attribute name.
+            start (int): Index of the first environment of the worker.
+            end (int): Index after the last environment of the worker.
+        """
+        self._arrays = arrays
+        self._slice = slice(start, end)
+        super().__init__(end - start, config)
+
+    def _allocate(self, name, shape, dtype):
+        return self._arrays[name][self._slice]
+
+
+def _run_worker(config, shared_arrays, start, end, barrier):
+    """
+    Run the environments of one worker of :py:class:`SharedVectorGardeners`
+    until it is closed.
+
+    Args:
+        config (OmegaConf): The configuration of the environments.
+        shared_arrays (dict): Name of the shared memory, shape and type of
+            each shared array, keyed by attribute name.
+        start (int): Index of the first environment of the worker.
+        end (int): Index after the last environment of the worker.
+        barrier (:py:class:`multiprocessing.Barrier`): Barrier synchronizing
+            the workers with the main process.
+    """
+    try:
+        # The workers already run in parallel, so each one uses one thread
+        from numba import set_num_threads
+        set_num_threads(1)
+    except ImportError:
+        pass
+
+    shared_memories = []
+    try:
+        arrays = {}
+        for name, (memory_name, shape, dtype) in shared_arrays.items():
+            shared_memory = SharedMemory(name=memory_name)
+            shared_memories.append(shared_memory)
+            arrays[name] = np.ndarray(shape, dtype=dtype,
+                                      buffer=shared_memory.buf)
+        envs = _SharedSlice(config, arrays, start, end)
+        command = arrays['_command']
+        part = slice(start, end)
+
+        while True:
+            barrier.wait()
+            if command[0] == _CLOSE:
+                break
+
+            if command[0] == _RESET:
+                seed = None if command[1] < 0 else int(command[1]) + start
+                observations, infos = envs.reset(seed=seed)
+            else:
+                observations, _, _, _, infos = envs._step(
+                    arrays['_actions'][part], arrays['_active'][part])
+                for k, name in enumerate(_REWARD_NAMES):
+                    arrays['_rewards'][k, part] = infos['rewards'][name]
+                arrays['_action_valid'][part] = infos['action_valid']
+                if 'final_observation' in infos:
+                    arrays['_final_observations'][part] = (
+                        infos['final_observation'])
+                    arrays['_final_masks'][part] = infos['final_action_mask']
+
+            arrays['_observations'][part] = observations
+            arrays['_masks'][part] = infos['action_mask']
+            barrier.wait()
+    except BaseException:
+        # Wake up the main process instead of leaving it waiting
+        barrier.abort()
+        raise
+    finally:
+        # The arrays must be released before the memory they view
+        envs = arrays = command = None
+        for shared_memory in shared_memories:
+            try:
+                shared_memory.close()
+            except BufferError:
+                pass
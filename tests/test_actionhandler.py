@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import numpy as np
 
@@ -24,6 +24,8 @@ class TestActionHandler(unittest.TestCase):
                                             self.action_enum)
         self.agent = Mock(spec=Agent)
         self.agent.position = (3, 3)
+        self.agent.row, self.agent.col = self.agent.position
+        self.agent.cell = None  # Cells are looked up in the mock grid world
         self.agent.turns_without_income = 0
         self.agent.flowers_planted = {0: 0}
         self.agent.flowers_harvested = {0: 0}
@@ -47,6 +49,32 @@ class TestActionHandler(unittest.TestCase):
         # Verify that agent.move was called with the correct action
         self.agent.move.assert_called_with(new_position)
 
+    def test_handle_action_dispatch(self):
+        """Test that handle_action calls the method matching each action.
+
+        Verifies that the dispatch table sends movements, harvests, waits and
+        plantings to their handler with the right arguments.
+        """
+        with patch.object(ActionHandler, 'move_agent') as move_agent, \
+                patch.object(ActionHandler, 'harvest_flower') as harvest, \
+                patch.object(ActionHandler, 'wait') as wait, \
+                patch.object(ActionHandler, 'plant_flower') as plant_flower:
+            handler = ActionHandler(self.grid_world, create_action_enum(2))
+            action_enum = handler.action_enum
+
+            handler.handle_action(self.agent, action_enum.LEFT)
+            handler.handle_action(self.agent, action_enum.HARVEST)
+            handler.handle_action(self.agent, action_enum.WAIT)
+            handler.handle_action(self.agent, action_enum.PLANT_TYPE_1)
+
+        move_agent.assert_called_once_with(self.agent,
+                                           action=action_enum.LEFT)
+        harvest.assert_called_once_with(self.agent)
+        wait.assert_called_once_with(self.agent)
+        plant_flower.assert_called_once_with(self.agent, flower_type=1)
+        # Every action is counted as a turn without income
+        self.assertEqual(self.agent.turns_without_income, 4)
+
     def test_move_agent_invalid(self):
         """Test move_agent with invalid move.
 
@@ -55,13 +83,16 @@ class TestActionHandler(unittest.TestCase):
         # Mock valid_move to return False
         self.grid_world.valid_move.return_value = False
 
-        self.action_handler.move_agent(self.agent, self.action_enum.UP)
+        moved = self.action_handler.move_agent(self.agent,
+                                               self.action_enum.UP)
 
         # Verify that valid_move was called
         self.grid_world.valid_move.assert_called_once()
 
-        # Verify that agent.move was not called
+        # Verify that agent.move was not called and the move is reported as
+        # invalid
         self.agent.move.assert_not_called()
+        self.assertFalse(moved)
 
     def test_plant_flower_success(self):
         """Test planting a flower successfully.
@@ -117,10 +148,10 @@ class TestActionHandler(unittest.TestCase):
         mock_cell.flower = mock_flower
         mock_flower.is_grown.return_value = True
         mock_flower.flower_type = 0
+        mock_flower.price = 10.0
         mock_flower.planted_by = self.agent
 
         self.grid_world.get_cell.return_value = mock_cell
-        self.grid_world.flowers_data = {0: {'price': 10.0}}
         self.grid_world.num_seeds_returned = 2
 
         self.action_handler.harvest_flower(self.agent)
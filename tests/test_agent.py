@@ -107,3 +107,43 @@ class TestAgent(unittest.TestCase):
         # Verify that the seed count is decremented
         self.assertTrue(self.agent.use_seed(flower_type))
         self.assertEqual(self.agent.seeds[flower_type], 2)
+
+    def test_seeds_from_dict_or_list(self):
+        """Test that seeds given as a dict or a list give the same counters.
+
+        Verifies that the seed counts are stored in an array indexed by flower
+        type, with planting and harvesting counters of the same size.
+        """
+        from_dict = Agent((0, 0), seeds={1: 4, 0: 2, 2: -1})
+        from_list = Agent((0, 0), seeds=[2, 4, -1])
+
+        self.assertEqual(from_dict.seeds.tolist(), [2, 4, -1])
+        self.assertEqual(from_list.seeds.tolist(), [2, 4, -1])
+        self.assertEqual(from_dict.flowers_planted.tolist(), [0, 0, 0])
+        self.assertEqual(from_dict.flowers_harvested.tolist(), [0, 0, 0])
+
+    def test_invalid_seed_counts(self):
+        """Test that negative seed counts other than -1 are rejected."""
+        with self.assertRaises(ValueError):
+            Agent((0, 0), seeds=[2, -2, 1])
+
+    def test_position_from_row_and_col(self):
+        """Test that the position is built from the row and column.
+
+        Verifies that moving the agent updates its row and column, and that
+        the position property reflects them.
+        """
+        self.agent.move((2, 7))
+
+        self.assertEqual((self.agent.row, self.agent.col), (2, 7))
+        self.assertEqual(self.agent.position, (2, 7))
+
+    def test_no_instance_dict(self):
+        """Test that the agent only has the attributes of its slots.
+
+        Verifies that no attribute outside of ``__slots__`` can be set on an
+        agent, so agents do not carry a per-instance dictionary.
+        """
+        self.assertFalse(hasattr(self.agent, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.agent.inventory = []
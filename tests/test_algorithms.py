@@ -0,0 +1,58 @@
+import unittest
+import warnings
+from importlib.util import find_spec
+
+import numpy as np
+from omegaconf import OmegaConf
+
+from ethicalgardeners.algorithms import make_vec_env
+from ethicalgardeners.main import make_env
+
+
+@unittest.skipIf(find_spec('supersuit') is None
+                 or find_spec('stable_baselines3') is None,
+                 "supersuit and stable_baselines3 are not installed")
+class TestMakeVecEnv(unittest.TestCase):
+    """
+    Tests for the :py:func:`.make_vec_env` SuperSuit vectorized environment.
+    """
+
+    def test_steps(self):
+        """
+        Test that the vectorized environment has one environment per agent
+        of each copy and returns observations without the action mask.
+        """
+        config = OmegaConf.create({
+            'num_iterations': 10,
+            'grid': {'init_method': 'random', 'width': 5, 'height': 5,
+                     'nb_agent': 2},
+            'observation': {'type': 'partial', 'range': 1},
+            'metrics': {'export_on': False, 'send_on': False},
+            'renderer': {'graphical': {'enabled': False},
+                         'console': {'enabled': False}}
+        })
+        vec_env = make_vec_env(make_env, config, n_envs=2, num_cpus=0)
+        self.addCleanup(vec_env.close)
+        observation_space = make_env(config, parallel=True).observation_space(
+            'agent_0')
+
+        self.assertEqual(vec_env.num_envs, 4)
+        self.assertEqual(vec_env.observation_space, observation_space)
+        observations = vec_env.reset()
+        self.assertEqual(observations.shape,
+                         (4,) + observation_space.shape)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for _ in range(3):
+                actions = np.array([vec_env.action_space.sample()
+                                    for _ in range(vec_env.num_envs)])
+                observations, rewards, dones, _ = vec_env.step(actions)
+        self.assertEqual(observations.shape,
+                         (4,) + observation_space.shape)
+        self.assertEqual(rewards.shape, (4,))
+        self.assertFalse(dones.any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,7 @@ class TestCell(unittest.TestCase):
 
         # Create a mock flower with a pollution reduction value
         self.mock_flower = Mock()
+        self.mock_flower.flower_type = 0
         self.mock_flower.get_pollution_reduction.return_value = 5
 
     def test_update_pollution_with_flower_above_min(self):
@@ -78,3 +78,20 @@ class TestFlower(unittest.TestCase):
 
         # Verify it's considered fully grown
         self.assertTrue(self.flower.is_grown())
+
+    def test_pollution_reduction_at_final_stage(self):
+        """Test the pollution reduction of a fully grown flower.
+
+        This test verifies that the final growth stage is a valid index in the
+        pollution reduction values, for each flower type, and gives the last
+        value.
+        """
+        for flower_type, data in self.flowers_data.items():
+            flower = Flower(self.position, flower_type, self.flowers_data)
+
+            for _ in range(len(data["pollution_reduction"])):
+                flower.grow()
+
+            self.assertTrue(flower.is_grown())
+            self.assertEqual(flower.get_pollution_reduction(),
+                             data["pollution_reduction"][-1])
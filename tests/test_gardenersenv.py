@@ -2,10 +2,17 @@ import unittest
 import os
 import shutil
 import tempfile
+import warnings
+from unittest.mock import Mock
+
+import numpy as np
 from omegaconf import OmegaConf
+from pettingzoo.test import parallel_api_test
+from pettingzoo.utils.conversions import parallel_to_aec
 
 from ethicalgardeners.action import create_action_enum
 from ethicalgardeners.main import make_env
+from ethicalgardeners.renderer import GraphicalRenderer
 
 
 class TestGardenersEnv(unittest.TestCase):
@@ -114,6 +121,9 @@ class TestGardenersEnv(unittest.TestCase):
             num_flower_type=3)  # Default has 3 flower types
         self.assertEqual(self.env.action_space('agent_0').n,
                          len(action_enum))
+        # The action space is built once and shared by the agents
+        self.assertIs(self.env.action_space('agent_0'),
+                      self.env.action_space('agent_1'))
 
     def test_movement_actions(self):
         """
@@ -154,6 +164,10 @@ class TestGardenersEnv(unittest.TestCase):
                                -0.1333333333333333)  # With 4 turn out of 10
         # without earning money
 
+        # The agent keeps a reference to the cell it is on
+        self.assertIs(agent.cell, self.env.grid_world.get_cell(start))
+        self.assertIs(agent.cell.agent, agent)
+
     def test_plant_and_harvest_flowers(self):
         """
         Test planting and harvesting actions change state, metrics, and
@@ -191,6 +205,7 @@ class TestGardenersEnv(unittest.TestCase):
         self.env.metrics_collector.export_on = True
         action_enum = create_action_enum(num_flower_type=3)
         self.env.step(action_enum.UP.value)
+        self.env.metrics_collector.flush_metrics()
 
         files = os.listdir(self.temp_dir)
         self.assertTrue(any(f.endswith('.csv') for f in files))
@@ -208,3 +223,296 @@ class TestGardenersEnv(unittest.TestCase):
         self.env.step(action_enum.get_planting_action_for_type(0).value)
         self.assertEqual(agent.seeds[0], before)
         self.assertLessEqual(self.env.rewards['agent_0'], 0)
+
+    def test_reset_selects_first_agent(self):
+        """
+        Test that a reset in the middle of a turn gives the turn back to the
+        first agent.
+        """
+        wait = create_action_enum(num_flower_type=3).WAIT.value
+        self.env.step(wait)
+        self.assertEqual(self.env.agent_selection, 'agent_1')
+
+        self.env.reset()
+        self.assertEqual(self.env.agent_selection, 'agent_0')
+        self.env.step(wait)
+        self.assertEqual(self.env.agent_selection, 'agent_1')
+
+    def test_render_after_each_action(self):
+        """
+        Test that the environment is rendered after each action by default,
+        with and without a display.
+        """
+        wait = create_action_enum(num_flower_type=3).WAIT.value
+        renderer = Mock()
+        self.env.renderers = [renderer]
+
+        self.env.render_mode = 'none'
+        for _ in range(3):
+            self.env.step(wait)
+        self.assertEqual(renderer.render.call_count, 3)
+        renderer.display_render.assert_not_called()
+
+        self.env.render_mode = 'human'
+        for _ in range(2):
+            self.env.step(wait)
+        self.assertEqual(renderer.render.call_count, 5)
+        self.assertEqual(renderer.display_render.call_count, 2)
+
+    def test_render_once_per_turn_without_display(self):
+        """
+        Test that with render_per_turn, the environment is rendered once per
+        turn and at the end of the episode without a display, and after each
+        action in 'human' mode.
+        """
+        self.config.render_per_turn = True
+        self.env.close()
+        self.env = make_env(self.config)
+        self.env.reset()
+        wait = create_action_enum(num_flower_type=3).WAIT.value
+        renderer = Mock()
+        self.env.renderers = [renderer]
+
+        self.env.render_mode = 'none'
+        for _ in range(4):
+            self.env.step(wait)
+        self.assertEqual(renderer.render.call_count, 2)
+        renderer.display_render.assert_not_called()
+
+        self.env.render_mode = 'human'
+        for _ in range(2):
+            self.env.step(wait)
+        self.assertEqual(renderer.render.call_count, 4)
+        self.assertEqual(renderer.display_render.call_count, 2)
+
+        # The last action of an episode is rendered even in the middle of a
+        # turn
+        self.env.render_mode = 'none'
+        self.env.num_iter = self.env.num_moves + 1
+        self.env.step(wait)
+        self.assertEqual(renderer.render.call_count, 5)
+
+    def test_renderers_without_display(self):
+        """
+        Test that the renderers are only created without a display when they
+        save a video for post analysis.
+        """
+        self.config.render_mode = 'none'
+        self.config.renderer.graphical.enabled = True
+        self.config.renderer.console.enabled = True
+        env = make_env(self.config)
+        self.addCleanup(env.close)
+        self.assertEqual(env.renderers, [])
+
+        self.config.renderer.console.post_analysis_on = True
+        env = make_env(self.config)
+        self.addCleanup(env.close)
+        self.assertEqual(len(env.renderers), 1)
+        self.assertIsInstance(env.renderers[0], GraphicalRenderer)
+        self.assertFalse(env.renderers[0].display)
+
+    def test_observations_computed_when_observed(self):
+        """
+        Test that the observations changed by a turn are only recomputed for
+        the agents that are observed.
+        """
+        wait = create_action_enum(num_flower_type=3).WAIT.value
+        strategy = self.env.observation_strategy
+        strategy.get_observations = Mock(wraps=strategy.get_observations)
+
+        # Each step only computes the observation of the next agent, and the
+        # second action ends the turn so the other observation is stale
+        self.env.step(wait)
+        self.env.step(wait)
+        self.assertEqual(strategy.get_observations.call_count, 2)
+        self.assertEqual(self.env._stale_agents, {'agent_1'})
+
+        observation = self.env.observe('agent_1')
+        self.assertEqual(strategy.get_observations.call_count, 3)
+        self.assertEqual(self.env._stale_agents, set())
+        np.testing.assert_array_equal(
+            observation['observation'],
+            strategy.get_observation(self.env.grid_world,
+                                     self.env.agents['agent_1']))
+
+        # The kept observation is returned again without a copy
+        self.assertIs(self.env.observe('agent_1')['observation'],
+                      observation['observation'])
+        self.assertFalse(observation['observation'].flags.writeable)
+
+    def test_truncation_after_num_iterations(self):
+        """
+        Test that all agents are truncated once the number of iterations is
+        reached, and that the episode is finished only once.
+        """
+        self.config.num_iterations = 3
+        env = make_env(self.config)
+        env.reset()
+        self.addCleanup(env.close)
+        wait = create_action_enum(num_flower_type=3).WAIT.value
+        episode = env.metrics_collector.metrics['episode']
+
+        for _ in range(2):
+            env.step(wait)
+            self.assertFalse(any(env.truncations.values()))
+        env.step(wait)
+        self.assertTrue(all(env.truncations.values()))
+        self.assertEqual(env.metrics_collector.metrics['episode'],
+                         episode + 1)
+
+        # Steps of truncated agents are ignored
+        env.step(None)
+        self.assertEqual(env.num_moves, 3)
+        self.assertEqual(env.metrics_collector.metrics['episode'],
+                         episode + 1)
+
+    def test_masks_and_observations_stay_up_to_date(self):
+        """
+        Test that the action masks and observations updated after each action
+        match the ones recomputed from scratch, with agents blocking each
+        other.
+        """
+        self.config.grid.config.agents[1].position = (1, 3)
+
+        for observation in [{'type': 'total'},
+                            {'type': 'partial', 'range': 1}]:
+            with self.subTest(observation=observation['type']):
+                self.config.observation = observation
+                env = make_env(self.config)
+                env.reset()
+                self.addCleanup(env.close)
+                random_generator = np.random.RandomState(0)
+
+                for _ in range(60):
+                    action_mask = env.observe(
+                        env.agent_selection)['action_mask']
+                    env.step(random_generator.choice(
+                        np.flatnonzero(action_mask)))
+
+                    for agent_id, agent in env.agents.items():
+                        observation = env.observe(agent_id)
+                        env.action_handler.update_action_mask(agent)
+                        np.testing.assert_array_equal(
+                            observation['action_mask'], agent.action_mask)
+                        np.testing.assert_array_equal(
+                            observation['observation'],
+                            env.observation_strategy.get_observation(
+                                env.grid_world, agent))
+
+    def test_seeded_episodes_match_baseline(self):
+        """
+        Test that episodes following a seeded reset, with random seed
+        returns, give the positions, money and seeds of the agents obtained
+        with the original implementation of the environment.
+        """
+        config = OmegaConf.create({
+            'random_seed': 0,
+            'num_iterations': 300,
+            'grid': {'init_method': 'random', 'width': 6, 'height': 6,
+                     'nb_agent': 2, 'num_seeds_returned': -3},
+            'observation': {'type': 'partial', 'range': 1},
+            'metrics': {'export_on': False, 'send_on': False},
+            'renderer': {'graphical': {'enabled': False},
+                         'console': {'enabled': False}}
+        })
+        env = make_env(config)
+        self.addCleanup(env.close)
+        random_generator = np.random.RandomState(1)
+        expected = [
+            ([(2, 2), (1, 5)], [81, 68], [[12, 18, 6], [6, 20, 25]]),
+            ([(4, 3), (0, 2)], [72, 86], [[13, 15, 15], [16, 11, 20]]),
+            ([(4, 0), (4, 4)], [76, 99], [[9, 22, 16], [15, 17, 22]]),
+        ]
+
+        for episode, (positions, money, seeds) in enumerate(expected):
+            # Only the first episode is seeded, the next ones go on with the
+            # random generator of the environment
+            env.reset(seed=5 if episode == 0 else None)
+            for agent_id in env.agent_iter():
+                _, _, termination, truncation, _ = env.last()
+                if termination or truncation:
+                    break
+                mask = env.observe(agent_id)['action_mask']
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    env.step(random_generator.choice(np.flatnonzero(mask)))
+
+            agents = [env.agents[agent_id]
+                      for agent_id in env.possible_agents]
+            self.assertEqual([agent.position for agent in agents], positions)
+            self.assertEqual([agent.money for agent in agents], money)
+            self.assertEqual([list(agent.seeds) for agent in agents],
+                             seeds)
+
+    def test_parallel_env_matches_turn_of_aec_env(self):
+        """
+        Test that a turn of the parallel environment gives the same state as
+        each agent acting in turn in the AEC environment, and that the
+        episode ends after `num_iterations` actions.
+        """
+        self.config.num_iterations = 4
+        parallel_env = make_env(self.config, parallel=True)
+        observations, _ = parallel_env.reset()
+        self.addCleanup(parallel_env.close)
+        action_enum = create_action_enum(num_flower_type=3)
+        actions = {'agent_0': action_enum.get_planting_action_for_type(1),
+                   'agent_1': action_enum.UP}
+
+        for agent_id in parallel_env.agents:
+            self.env.step(actions[agent_id].value)
+        observations, rewards, _, truncations, infos = parallel_env.step(
+            {agent_id: action.value for agent_id, action in actions.items()})
+
+        for agent_id in parallel_env.possible_agents:
+            self.assertEqual(
+                parallel_env.agents_by_id[agent_id].position,
+                self.env.agents[agent_id].position)
+            self.assertTrue(
+                (observations[agent_id]['observation']
+                 == self.env.observe(agent_id)['observation']).all())
+            self.assertTrue(infos[agent_id]['action_valid'])
+        self.assertEqual(rewards.keys(), set(actions))
+        self.assertFalse(any(truncations.values()))
+
+        _, _, _, truncations, _ = parallel_env.step(
+            {agent_id: action_enum.WAIT.value
+             for agent_id in parallel_env.agents})
+        self.assertTrue(all(truncations.values()))
+        self.assertEqual(parallel_env.agents, [])
+
+    def test_parallel_env_to_aec(self):
+        """
+        Test that the parallel environment can be stepped through the AEC
+        interface.
+        """
+        self.config.num_iterations = 6
+        aec_env = parallel_to_aec(make_env(self.config, parallel=True))
+        aec_env.reset()
+        self.addCleanup(aec_env.close)
+
+        num_steps = 0
+        for agent_id in aec_env.agent_iter():
+            observation, _, termination, truncation, _ = aec_env.last()
+            if termination or truncation:
+                aec_env.step(None)
+                continue
+            aec_env.step(aec_env.action_space(agent_id).sample(
+                observation['action_mask']))
+            num_steps += 1
+
+        self.assertEqual(num_steps, 6)
+
+    def test_parallel_api(self):
+        """
+        Test that the parallel environment passes the PettingZoo API test
+        with each observation type and dtype.
+        """
+        for observation_type in ['total', 'partial']:
+            for dtype in ['float32', 'uint8']:
+                with self.subTest(observation_type=observation_type,
+                                  dtype=dtype):
+                    self.config.observation = {'type': observation_type,
+                                               'range': 1, 'dtype': dtype}
+                    parallel_env = make_env(self.config, parallel=True)
+                    self.addCleanup(parallel_env.close)
+                    parallel_api_test(parallel_env, num_cycles=50)
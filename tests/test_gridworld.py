@@ -3,7 +3,8 @@ import tempfile
 import numpy as np
 import os
 
-from ethicalgardeners.gridworld import GridWorld, CellType
+from ethicalgardeners.constants import MIN_SEED_RETURNS, MAX_SEED_RETURNS
+from ethicalgardeners.gridworld import GridWorld, Cell, CellType, Flower
 
 
 class TestWorldGrid(unittest.TestCase):
@@ -90,8 +91,8 @@ class TestWorldGrid(unittest.TestCase):
         # Check agent placement
         self.assertTrue(self.test_grid.grid[2][3].has_agent())
         self.assertEqual(self.test_grid.grid[2][3].agent.money, 100.0)
-        self.assertEqual(self.test_grid.grid[2][3].agent.seeds,
-                         {0: 5, 1: 10, 2: 3})
+        self.assertEqual(self.test_grid.grid[2][3].agent.seeds.tolist(),
+                         [5, 10, 3])
 
     def test_init_random(self):
         """
@@ -243,8 +244,8 @@ class TestWorldGrid(unittest.TestCase):
                          (2, 2))
         self.assertEqual(self.test_grid.grid[2][2].agent.money,
                          50.0)
-        self.assertEqual(self.test_grid.grid[2][2].agent.seeds,
-                         {0: 3, 1: 3, 2: 3})
+        self.assertEqual(self.test_grid.grid[2][2].agent.seeds.tolist(),
+                         [3, 3, 3])
 
         # Check flower
         self.assertTrue(self.test_grid.grid[3][3].has_flower())
@@ -283,3 +284,216 @@ class TestWorldGrid(unittest.TestCase):
         self.assertEqual(
             self.test_grid.flowers_data[0]['pollution_reduction'],
             [0, 0, 0, 0, 5])
+
+    def test_cells_are_views_on_arrays(self):
+        """
+        Test that the cells of the grid read and write the grid arrays.
+
+        This test verifies that:
+        1. The arrays reflect the cells, agents and flowers of the grid
+        2. Modifying a cell or a flower modifies the arrays
+        3. Removing a flower resets its entries in the arrays
+        """
+        self.test_grid = GridWorld.init_from_code(
+            {'grid_config': self.test_config}
+        )
+
+        self.assertEqual(self.test_grid.cell_types.shape, (4, 4))
+        self.assertEqual(self.test_grid.cell_types[1, 1],
+                         CellType.OBSTACLE.value)
+        self.assertIsNone(self.test_grid.get_cell((1, 1)).pollution)
+        self.assertIs(self.test_grid.cell_agents[2, 2],
+                      self.test_grid.agents[0])
+        self.assertEqual(self.test_grid.flower_types[3, 3], 0)
+        self.assertEqual(self.test_grid.growth_stages[3, 3], 2)
+        np.testing.assert_array_equal(
+            self.test_grid.pollution_reductions, [[0, 1, 2, 3]])
+        np.testing.assert_array_equal(self.test_grid.flower_prices, [10])
+
+        cell = self.test_grid.get_cell((3, 3))
+        cell.pollution = 20
+        cell.flower.grow()
+        self.assertEqual(self.test_grid.pollution[3, 3], 20)
+        self.assertEqual(self.test_grid.growth_stages[3, 3], 3)
+
+        self.test_grid.remove_flower((3, 3))
+        self.assertFalse(cell.has_flower())
+
+        # The views are created once and shared by later accesses
+        self.assertIs(self.test_grid.get_cell((3, 3)), cell)
+        self.assertIs(self.test_grid.grid[3][3], cell)
+        self.assertEqual(self.test_grid.flower_types[3, 3], -1)
+        self.assertEqual(self.test_grid.growth_stages[3, 3], 0)
+
+    def test_occupancy_follows_agents(self):
+        """
+        Test that the occupancy grid follows the agents of the grid.
+
+        This test verifies that:
+        1. Placing an agent marks its cell as occupied
+        2. Moving an agent updates the occupancy and the cells
+        3. Occupied cells are only invalid moves when collisions are enabled
+        """
+        self.test_grid = GridWorld.init_from_code(
+            {'grid_config': self.test_config}
+        )
+        agent = self.test_grid.agents[0]
+        self.assertEqual(self.test_grid.occupancy[2, 2], 1)
+        self.assertEqual(self.test_grid.occupancy.sum(), 1)
+        self.assertEqual(self.test_grid.agent_indices, {agent: 0})
+        self.assertEqual(self.test_grid.cell_agent_indices[2, 2], 0)
+        self.assertEqual((self.test_grid.cell_agent_indices >= 0).sum(), 1)
+
+        self.test_grid.move_agent(agent, (2, 3))
+        agent.move((2, 3))
+        self.assertEqual(self.test_grid.occupancy[2, 2], 0)
+        self.assertEqual(self.test_grid.occupancy[2, 3], 1)
+        self.assertIsNone(self.test_grid.cell_agents[2, 2])
+        self.assertIs(self.test_grid.cell_agents[2, 3], agent)
+        self.assertEqual(self.test_grid.cell_agent_indices[2, 2], -1)
+        self.assertEqual(self.test_grid.cell_agent_indices[2, 3], 0)
+        self.assertIs(agent.cell, self.test_grid.get_cell((2, 3)))
+
+        self.assertTrue(self.test_grid.valid_move((2, 3)))
+        self.test_grid.collisions_on = True
+        self.assertFalse(self.test_grid.valid_move((2, 3)))
+        self.assertTrue(self.test_grid.valid_move((2, 2)))
+
+    def test_snapshot_saves_cell_state(self):
+        """
+        Test that a snapshot keeps the state of a cell after the cell changes.
+        """
+        self.test_grid = GridWorld.init_from_code(
+            {'grid_config': self.test_config}
+        )
+        snapshot = self.test_grid.snapshot((3, 3))
+        self.test_grid.remove_flower((3, 3))
+
+        self.assertEqual(snapshot.position, (3, 3))
+        self.assertTrue(snapshot.has_flower())
+        self.assertEqual(snapshot.flower_type, 0)
+        self.assertEqual(snapshot.growth_stage, 2)
+        self.assertEqual(snapshot.pollution,
+                         self.test_grid.get_cell((3, 3)).pollution)
+        self.assertFalse(self.test_grid.snapshot((3, 3)).has_flower())
+        self.assertIsNone(self.test_grid.snapshot((0, 0)).pollution)
+
+    def test_next_seed_return_matches_single_draws(self):
+        """
+        Test that the seed returns are the numbers the random generator gives
+        when they are drawn one by one, and that they leave the generator in
+        the same state for its other draws.
+        """
+        self.test_grid = GridWorld.init_from_code(
+            {'grid_config': self.test_config},
+            random_generator=np.random.RandomState(7)
+        )
+        random_generator = np.random.RandomState(7)
+        expected = [random_generator.randint(MIN_SEED_RETURNS,
+                                             MAX_SEED_RETURNS)
+                    for _ in range(10)]
+
+        self.assertEqual(
+            [self.test_grid.next_seed_return() for _ in expected], expected)
+        self.assertEqual(self.test_grid.random_generator.rand(),
+                         random_generator.rand())
+
+    def test_pollution_stored_as_bytes_when_exact(self):
+        """
+        Test that the pollution is stored in bytes only when its levels are
+        always integers between 0 and 255, and that it then evolves as when
+        it is stored in floats.
+        """
+        self.test_grid = GridWorld.init_from_code(
+            {'grid_config': self.test_config}
+        )
+        self.assertEqual(self.test_grid.pollution.dtype, np.uint8)
+
+        float_grid = GridWorld.init_from_code(
+            {'grid_config': dict(self.test_config, pollution_increment=0.5)}
+        )
+        self.assertEqual(float_grid.pollution.dtype, np.float64)
+        float_grid.pollution_increment = 1
+        float_grid.get_cell((0, 1)).pollution = 2
+        self.test_grid.get_cell((0, 1)).pollution = 2
+        for grid in [float_grid, self.test_grid]:
+            grid.place_flower((0, 1), 0, growth_stage=3)
+            grid.place_flower((3, 2), 0, growth_stage=1)
+
+        for _ in range(60):
+            float_grid.update_cell()
+            self.test_grid.update_cell()
+            np.testing.assert_array_equal(self.test_grid.pollution,
+                                          float_grid.pollution)
+        self.assertEqual(self.test_grid.get_cell((0, 2)).pollution, 50)
+        self.assertEqual(self.test_grid.get_cell((0, 1)).pollution, 0)
+        # The cells give Python numbers of the type of the storage
+        self.assertIsInstance(self.test_grid.get_cell((0, 2)).pollution, int)
+        self.assertIsInstance(float_grid.get_cell((0, 2)).pollution, float)
+
+    def test_pollution_stored_as_floats_when_not_exact(self):
+        """
+        Test that setting the pollution of a cell of a grid stored in bytes
+        to a fractional or out of range level stores the levels as floats,
+        for all the cells, before and after a reset.
+        """
+        for level in [12.7, 300, -1]:
+            with self.subTest(level=level):
+                self.test_grid = GridWorld.init_from_code(
+                    {'grid_config': self.test_config}
+                )
+                cell = self.test_grid.get_cell((0, 1))
+                other_cell = self.test_grid.get_cell((0, 2))
+                self.assertEqual(self.test_grid.pollution.dtype, np.uint8)
+
+                cell.pollution = level
+                self.assertEqual(self.test_grid.pollution.dtype, np.float64)
+                self.assertEqual(cell.pollution, level)
+                self.assertEqual(self.test_grid.pollution[0, 1], level)
+                other_cell.pollution = 0.5
+                self.assertEqual(self.test_grid.pollution[0, 2], 0.5)
+
+                self.test_grid.reset()
+                self.assertEqual(self.test_grid.pollution.dtype, np.uint8)
+                cell = self.test_grid.get_cell((0, 1))
+                cell.pollution = level
+                self.assertEqual(self.test_grid.pollution[0, 1], level)
+
+    def test_update_pollution_matches_cells(self):
+        """
+        Test that the vectorized pollution update of the grid gives the same
+        result as updating each cell on its own.
+
+        This test verifies that cells with a flower are decreased down to the
+        minimum pollution, empty ground cells are increased up to the maximum
+        pollution and obstacles are left unchanged.
+        """
+        self.test_grid = GridWorld.init_from_code(
+            {'grid_config': self.test_config}
+        )
+        self.test_grid.place_flower((0, 1), 0, growth_stage=3)
+        self.test_grid.get_cell((0, 1)).pollution = 2
+        self.test_grid.get_cell((0, 2)).pollution = 50
+
+        expected = {}
+        for i in range(self.test_grid.height):
+            for j in range(self.test_grid.width):
+                grid_cell = self.test_grid.grid[i][j]
+                cell = Cell(grid_cell.cell_type, grid_cell.pollution)
+                if grid_cell.has_flower():
+                    cell.flower = Flower(
+                        (i, j), grid_cell.flower.flower_type,
+                        self.test_grid.flowers_data,
+                        growth_stage=grid_cell.flower.current_growth_stage)
+                cell.update_pollution(self.test_grid.min_pollution,
+                                      self.test_grid.max_pollution)
+                expected[(i, j)] = cell.pollution
+
+        self.test_grid.update_pollution()
+
+        for position, pollution in expected.items():
+            self.assertEqual(self.test_grid.get_cell(position).pollution,
+                             pollution)
+        self.assertEqual(expected[(0, 1)], 0)
+        self.assertEqual(expected[(0, 2)], 50)
+        self.assertIsNone(expected[(0, 0)])
@@ -0,0 +1,133 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from omegaconf import OmegaConf
+
+from ethicalgardeners.gridworld import GridWorld
+from ethicalgardeners.kernels import NUMBA_AVAILABLE
+from ethicalgardeners.observation import PartialObservation, TotalObservation
+from ethicalgardeners.vecenv import SyncVectorGardeners
+
+
+@unittest.skipUnless(NUMBA_AVAILABLE, "Numba is not installed")
+class TestKernels(unittest.TestCase):
+    """Unit tests for the compiled kernels of the :py:mod:`.kernels` module.
+    """
+
+    def setUp(self):
+        """Initialize necessary objects before tests.
+
+        This method sets up two identical random grids with flowers at
+        different growth stages and cells at different pollution levels.
+        """
+        self.grids = []
+        for _ in range(2):
+            grid_world = GridWorld.init_random(
+                {"obstacles_ratio": 0.2, "nb_agent": 2}, width=8, height=6,
+                random_generator=np.random.RandomState(42)
+            )
+            random_generator = np.random.RandomState(0)
+            grid_world.pollution[:] = random_generator.uniform(
+                0, 100, grid_world.pollution.shape)
+            for i in range(grid_world.height):
+                for j in range(grid_world.width):
+                    if grid_world.valid_position((i, j)) and (i + j) % 3 == 0:
+                        flower_type = (i * j) % 3
+                        grid_world.place_flower(
+                            (i, j), flower_type,
+                            growth_stage=(i + j) % (
+                                grid_world.max_growth_stages[flower_type]
+                                + 1))
+            self.grids.append(grid_world)
+
+    def test_step_grid_matches_numpy(self):
+        """Test that the compiled grid update matches the NumPy one.
+
+        This test verifies that the pollution and the growth stages of the
+        grid are the same after several updates with the compiled kernel, on
+        one or several threads, and with the pure NumPy fallback.
+        """
+        compiled, reference = self.grids
+
+        for step in range(6):
+            # Alternate between the serial and the parallel kernels
+            with patch('ethicalgardeners.gridworld.PARALLEL_MIN_CELLS',
+                       step % 2 * (compiled.cell_types.size + 1)):
+                compiled.update_cell()
+            with patch('ethicalgardeners.gridworld.step_grid', None):
+                reference.update_cell()
+
+        np.testing.assert_allclose(compiled.pollution, reference.pollution,
+                                   rtol=1e-6)
+        np.testing.assert_array_equal(compiled.growth_stages,
+                                      reference.growth_stages)
+
+    def test_cell_features_match_numpy(self):
+        """Test that the observations computed with the compiled kernel
+        match the NumPy ones.
+
+        This test verifies the partial observations of the agents, whose
+        windows cross the grid edges, and the total observation of a square
+        grid.
+        """
+        square_grid = GridWorld.init_random(
+            {"obstacles_ratio": 0.2, "nb_agent": 2}, width=6, height=6,
+            random_generator=np.random.RandomState(1))
+        square_grid.place_flower(square_grid.agents[0].position, 1,
+                                 growth_stage=1)
+        strategies = [(self.grids[0], PartialObservation(1)),
+                      (self.grids[0], PartialObservation(3)),
+                      (square_grid, TotalObservation(square_grid))]
+
+        for grid_world, strategy in strategies:
+            compiled = strategy.get_observations(grid_world,
+                                                 grid_world.agents)
+            with patch('ethicalgardeners.observation.cell_features', None):
+                expected = strategy.get_observations(grid_world,
+                                                     grid_world.agents)
+            for observation, expected_observation in zip(compiled, expected):
+                np.testing.assert_array_equal(observation,
+                                              expected_observation)
+
+    def test_batched_step_matches_numpy(self):
+        """Test that the compiled batched step matches the NumPy one.
+
+        This test verifies that two batches of environments stepped with the
+        same actions, one with the compiled kernels and one with the pure
+        NumPy fallback, end up in the same state.
+        """
+        config = OmegaConf.create({
+            'grid': {'width': 6, 'height': 6, 'nb_agent': 3,
+                     'num_seeds_returned': -3},
+            'observation': {},
+        })
+        compiled = SyncVectorGardeners(8, config)
+        reference = SyncVectorGardeners(8, config)
+        _, infos = compiled.reset(seed=1)
+        reference.reset(seed=1)
+        random_generator = np.random.RandomState(2)
+
+        for _ in range(200):
+            # Random actions, favouring the valid ones
+            masks = infos['action_mask']
+            actions = (random_generator.rand(*masks.shape)
+                       + masks).argmax(axis=1)
+            _, rewards, _, _, infos = compiled.step(actions)
+            with patch('ethicalgardeners.vecenv.batched_step', None), \
+                    patch('ethicalgardeners.vecenv.step_grid', None):
+                _, expected_rewards, _, _, expected_infos = reference.step(
+                    actions)
+            np.testing.assert_allclose(rewards, expected_rewards, atol=1e-6)
+            np.testing.assert_array_equal(infos['action_valid'],
+                                          expected_infos['action_valid'])
+
+        for name in ['positions', 'grid_agent_id', 'flower_types',
+                     'growth_stages', 'planted_by', 'seeds', 'money',
+                     'flowers_planted', 'flowers_harvested',
+                     'turns_without_income']:
+            np.testing.assert_array_equal(getattr(compiled, name),
+                                          getattr(reference, name),
+                                          err_msg=name)
+        np.testing.assert_allclose(compiled.pollution, reference.pollution,
+                                   rtol=1e-6)
@@ -6,6 +6,8 @@ import shutil
 
 import csv
 
+import numpy as np
+
 from ethicalgardeners.metricscollector import MetricsCollector
 
 
@@ -51,11 +53,11 @@ class TestMetricsCollector(unittest.TestCase):
         agent1 = Mock()
         agent2 = Mock()
 
-        agent1.flowers_planted = {0: 2}
-        agent1.flowers_harvested = {0: 1}
+        agent1.flowers_planted = np.array([2])
+        agent1.flowers_harvested = np.array([1])
 
-        agent2.flowers_planted = {0: 1}
-        agent2.flowers_harvested = {0: 0}
+        agent2.flowers_planted = np.array([1])
+        agent2.flowers_harvested = np.array([0])
 
         self.mock_grid_world.agents = [agent1, agent2]
 
@@ -83,8 +85,9 @@ class TestMetricsCollector(unittest.TestCase):
             self.agent_selection
         )
 
-        # Export metrics
+        # Export metrics and write them to the file
         self.collector.export_metrics()
+        self.collector.flush_metrics()
 
         # Check if the file was created
         expected_filename = (
@@ -142,6 +145,7 @@ class TestMetricsCollector(unittest.TestCase):
             1: -2.0
         }
         self.collector.export_metrics()
+        self.collector.flush_metrics()
 
         # Read the CSV again and check for two rows
         with open(expected_filename, 'r', newline='') as csvfile:
@@ -153,3 +157,28 @@ class TestMetricsCollector(unittest.TestCase):
                 float(rows[1]['accumulated_reward_agent_0']), 20.0)
             self.assertEqual(
                 float(rows[1]['accumulated_reward_agent_1']), -2.0)
+
+    def test_export_metrics_buffered(self):
+        """Test that exported rows are written by batches.
+
+        Verifies that the rows are only written to the CSV file once
+        flush_every rows have been exported, and that the remaining rows are
+        written when the collector is closed.
+        """
+        self.collector.flush_every = 3
+        filename = os.path.join(self.temp_dir, "simulation_metrics.csv")
+
+        def count_rows():
+            if not os.path.exists(filename):
+                return 0
+            with open(filename, 'r', newline='') as csvfile:
+                return len(list(csv.DictReader(csvfile)))
+
+        for step in range(1, 5):
+            self.collector.update_metrics(self.mock_grid_world, self.rewards,
+                                          self.agent_selection)
+            self.collector.export_metrics()
+            self.assertEqual(count_rows(), 0 if step < 3 else 3)
+
+        self.collector.close()
+        self.assertEqual(count_rows(), 4)
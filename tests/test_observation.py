@@ -5,12 +5,13 @@ This module tests the different observation strategies to ensure they
 correctly generate observations based on the world state.
 """
 import unittest
-from unittest.mock import Mock
 import numpy as np
 
+from ethicalgardeners.agent import Agent
 from ethicalgardeners.constants import FEATURES_PER_CELL
-from ethicalgardeners.observation import TotalObservation, PartialObservation
-from ethicalgardeners.gridworld import CellType
+from ethicalgardeners.observation import (TotalObservation, PartialObservation,
+                                          QuantizedObservation)
+from ethicalgardeners.gridworld import CellType, GridWorld
 
 
 class TestTotalObservation(unittest.TestCase):
@@ -25,62 +26,27 @@ class TestTotalObservation(unittest.TestCase):
         """
         Set up tests.
 
-        Creates mock grid world and agent objects for testing.
+        Creates a grid world with an obstacle, a flower and an agent.
         """
-        self.grid_world = Mock()
-        self.grid_world.width = 10
-        self.grid_world.height = 10
-        self.grid_world.min_pollution = 0
-        self.grid_world.max_pollution = 100
-
-        self.grid_world.flowers_data = {
-            0: {"price": 10, "pollution_reduction": [0, 0, 0, 0, 5]},
-            1: {"price": 5, "pollution_reduction": [0, 0, 1, 3]},
-            2: {"price": 2, "pollution_reduction": [1]}
-        }
-
-        # Create a GROUND mock cell
-        self.mock_ground_cell = Mock()
-        self.mock_ground_cell.cell_type = CellType.GROUND
-        self.mock_ground_cell.pollution = 50
-        self.mock_ground_cell.has_agent = lambda: False
-        self.mock_ground_cell.has_flower = lambda: False
-
-        # Create an OBSTACLE mock cell
-        self.mock_obstacle_cell = Mock()
-        self.mock_obstacle_cell.cell_type = CellType.OBSTACLE
-        self.mock_obstacle_cell.pollution = 0
-        self.mock_obstacle_cell.has_agent = lambda: False
-        self.mock_obstacle_cell.has_flower = lambda: False
-
-        # Create a GROUND cell with a flower
-        self.mock_flower_cell = Mock()
-        self.mock_flower_cell.cell_type = CellType.GROUND
-        self.mock_flower_cell.pollution = 25
-        self.mock_flower_cell.has_agent = lambda: False
-        self.mock_flower_cell.has_flower = lambda: True
-
-        self.mock_flower = Mock()
-        self.mock_flower.flower_type = 0
-        self.mock_flower.current_growth_stage = 2
-        self.mock_flower.num_growth_stage = 4
-        self.mock_flower_cell.flower = self.mock_flower
-
-        # Set get_cell to return different cells based on position
-        def get_cell_side_effect(position):
-            if position == (2, 2):
-                return self.mock_obstacle_cell
-            elif position == (8, 8):
-                return self.mock_flower_cell
-            else:
-                return self.mock_ground_cell
-
-        self.grid_world.get_cell.side_effect = get_cell_side_effect
-
-        # Create a mock agent at (5, 5)
-        self.mock_agent = Mock()
-        self.mock_agent.position = (5, 5)
-        self.grid_world.agents = [self.mock_agent]
+        self.grid_world = GridWorld.init_from_code({'grid_config': {
+            'width': 10,
+            'height': 10,
+            'min_pollution': 0,
+            'max_pollution': 100,
+            'flowers_data': {
+                0: {"price": 10, "pollution_reduction": [0, 0, 0, 0, 5]},
+                1: {"price": 5, "pollution_reduction": [0, 0, 1, 3]},
+                2: {"price": 2, "pollution_reduction": [1]}
+            },
+            'cells': [{'position': (2, 2), 'type': 'OBSTACLE'}],
+            'agents': [{'position': (5, 5)}],
+            'flowers': [{'position': (8, 8), 'type': 0,
+                         'growth_stage': 2}]
+        }})
+        self.grid_world.pollution[8, 8] = 25
+
+        # The agent is at (5, 5)
+        self.mock_agent = self.grid_world.agents[0]
 
         self.agents = {'agent1': self.mock_agent}
 
@@ -124,6 +90,33 @@ class TestTotalObservation(unittest.TestCase):
         self.assertAlmostEqual(obs[8, 8, 3],
                                (2 + 1) / (4 + 1))  # Current growth stage
 
+        # Agent at (5, 5), the only agent of the grid
+        self.assertEqual(obs[5, 5, 4], 1.0)
+        self.assertEqual(obs[1, 1, 4], 0.0)
+        self.assertAlmostEqual(obs[1, 1, 1], 0.5)  # Pollution of 50
+        self.assertAlmostEqual(obs[8, 8, 1], 0.25)
+        np.testing.assert_allclose(obs[..., 5], 5 / 9)
+
+    def test_get_observations_share_cell_features(self):
+        """
+        Test that the observations of several agents generated at once have
+        the same cells and each agent's own position.
+        """
+        agent = Agent((0, 7))
+        self.grid_world.place_agent(agent)
+        agents = self.grid_world.agents
+
+        observations = self.observation.get_observations(self.grid_world,
+                                                         agents)
+
+        self.assertEqual(len(observations), len(agents))
+        for agent, obs in zip(agents, observations):
+            np.testing.assert_array_equal(
+                obs, self.observation.get_observation(self.grid_world, agent))
+        np.testing.assert_array_equal(observations[0][..., :5],
+                                      observations[1][..., :5])
+        np.testing.assert_allclose(observations[1][..., 6], 7 / 9)
+
 
 class TestPartialObservation(unittest.TestCase):
     """
@@ -137,63 +130,28 @@ class TestPartialObservation(unittest.TestCase):
         """
         Set up tests.
 
-        Creates mock grid world and agent objects for testing with different
-        viewing ranges.
+        Creates a grid world with an obstacle, a flower and an agent, and a
+        partial observation with a viewing range of 2.
         """
-        self.grid_world = Mock()
-        self.grid_world.width = 10
-        self.grid_world.height = 10
-        self.grid_world.min_pollution = 0
-        self.grid_world.max_pollution = 100
-
-        self.grid_world.flowers_data = {
-            0: {"price": 10, "pollution_reduction": [0, 0, 0, 0, 5]},
-            1: {"price": 5, "pollution_reduction": [0, 0, 1, 3]},
-            2: {"price": 2, "pollution_reduction": [1]}
-        }
-
-        # Create a GROUND mock cell
-        self.mock_ground_cell = Mock()
-        self.mock_ground_cell.cell_type = CellType.GROUND
-        self.mock_ground_cell.pollution = 50
-        self.mock_ground_cell.has_agent = lambda: False
-        self.mock_ground_cell.has_flower = lambda: False
-
-        # Create an OBSTACLE mock cell
-        self.mock_obstacle_cell = Mock()
-        self.mock_obstacle_cell.cell_type = CellType.OBSTACLE
-        self.mock_obstacle_cell.pollution = 0
-        self.mock_obstacle_cell.has_agent = lambda: False
-        self.mock_obstacle_cell.has_flower = lambda: False
-
-        # Create a GROUND cell with a flower
-        self.mock_flower_cell = Mock()
-        self.mock_flower_cell.cell_type = CellType.GROUND
-        self.mock_flower_cell.pollution = 25
-        self.mock_flower_cell.has_agent = lambda: False
-        self.mock_flower_cell.has_flower = lambda: True
-
-        self.mock_flower = Mock()
-        self.mock_flower.flower_type = 0
-        self.mock_flower.current_growth_stage = 2
-        self.mock_flower.num_growth_stage = 4
-        self.mock_flower_cell.flower = self.mock_flower
-
-        # Set get_cell to return different cells based on position
-        def get_cell_side_effect(position):
-            if position == (3, 3):
-                return self.mock_obstacle_cell
-            elif position == (7, 7):
-                return self.mock_flower_cell
-            else:
-                return self.mock_ground_cell
-
-        self.grid_world.get_cell.side_effect = get_cell_side_effect
-
-        # Create a mock agent at (5, 5)
-        self.mock_agent = Mock()
-        self.mock_agent.position = (5, 5)
-        self.grid_world.agents = [self.mock_agent]
+        self.grid_world = GridWorld.init_from_code({'grid_config': {
+            'width': 10,
+            'height': 10,
+            'min_pollution': 0,
+            'max_pollution': 100,
+            'flowers_data': {
+                0: {"price": 10, "pollution_reduction": [0, 0, 0, 0, 5]},
+                1: {"price": 5, "pollution_reduction": [0, 0, 1, 3]},
+                2: {"price": 2, "pollution_reduction": [1]}
+            },
+            'cells': [{'position': (3, 3), 'type': 'OBSTACLE'}],
+            'agents': [{'position': (5, 5)}],
+            'flowers': [{'position': (7, 7), 'type': 0,
+                         'growth_stage': 2}]
+        }})
+        self.grid_world.pollution[7, 7] = 25
+
+        # The agent is at (5, 5)
+        self.mock_agent = self.grid_world.agents[0]
 
         self.agents = {'agent1': self.mock_agent}
 
@@ -211,6 +169,16 @@ class TestPartialObservation(unittest.TestCase):
         space = self.observation.observation_space(agent)
         self.assertEqual(space.shape, (5, 5, FEATURES_PER_CELL))
 
+    def test_is_visible(self):
+        """
+        Test that only the cells within the viewing range are visible.
+        """
+        agent = self.agents['agent1']
+        self.assertTrue(self.observation.is_visible(agent, (3, 7)))
+        self.assertTrue(self.observation.is_visible(agent, (5, 5)))
+        self.assertFalse(self.observation.is_visible(agent, (2, 5)))
+        self.assertFalse(self.observation.is_visible(agent, (5, 8)))
+
     def test_get_observation_center(self):
         """
         Test observation generation for an agent in the center of the grid.
@@ -227,6 +195,7 @@ class TestPartialObservation(unittest.TestCase):
         # Agent is at (5,5), so the obstacle should be at (2, 2)
         self.assertAlmostEqual(obs[2, 2, 0],
                                CellType.GROUND.value / len(CellType))
+        self.assertEqual(obs[2, 2, 4], 1.0)
 
         # Obstacle at (3, 3) should be at (0, 0)
         self.assertAlmostEqual(obs[0, 0, 0],
@@ -239,6 +208,29 @@ class TestPartialObservation(unittest.TestCase):
         self.assertAlmostEqual(obs[4, 4, 3],
                                (2 + 1)/(4 + 1))  # Current growth stage
 
+    def test_get_observations_matches_get_observation(self):
+        """
+        Test that the observations of several agents generated at once are
+        the same as the observations generated one by one, for agents in the
+        middle, on the edges and in the corners of the grid.
+        """
+        for position in [(0, 0), (9, 9), (0, 6), (8, 1), (4, 5)]:
+            agent = Agent(position)
+            self.grid_world.place_agent(agent)
+        agents = self.grid_world.agents
+
+        for obs_range in [1, 2, 4]:
+            with self.subTest(obs_range=obs_range):
+                observation = PartialObservation(obs_range)
+                observations = observation.get_observations(self.grid_world,
+                                                            agents)
+
+                self.assertEqual(len(observations), len(agents))
+                for agent, obs in zip(agents, observations):
+                    np.testing.assert_array_equal(
+                        obs, observation.get_observation(self.grid_world,
+                                                         agent))
+
     def test_get_observation_edge(self):
         """
         Test observation generation for an agent near the edge of the grid.
@@ -261,3 +253,60 @@ class TestPartialObservation(unittest.TestCase):
 
                 if x < 0 or y < 0:
                     self.assertTrue(np.all(obs[i, j, :2] == 0))
+
+
+class TestQuantizedObservation(unittest.TestCase):
+    """
+    Tests for the QuantizedObservation strategy.
+
+    Ensures that the QuantizedObservation strategy returns the observations
+    of the wrapped strategy as 8-bit integers.
+    """
+
+    def setUp(self):
+        """
+        Set up tests.
+
+        Creates a grid world with a flower and two agents, and a quantized
+        partial observation with a viewing range of 2.
+        """
+        self.grid_world = GridWorld.init_from_code({'grid_config': {
+            'width': 6,
+            'height': 6,
+            'agents': [{'position': (1, 1)}, {'position': (4, 3)}],
+            'flowers': [{'position': (2, 2), 'type': 0, 'growth_stage': 1}]
+        }})
+        self.grid_world.pollution[2, 2] = 33
+        self.partial = PartialObservation(2)
+        self.observation = QuantizedObservation(self.partial)
+
+    def test_observation_space(self):
+        """
+        Test that the observation space has the shape of the wrapped
+        strategy with unsigned 8-bit integers.
+        """
+        agent = self.grid_world.agents[0]
+        space = self.observation.observation_space(agent)
+
+        self.assertEqual(space.shape, self.partial.observation_shape)
+        self.assertEqual(space.dtype, np.uint8)
+        self.assertEqual(space.high.max(), 255)
+
+    def test_get_observations(self):
+        """
+        Test that the observations are the ones of the wrapped strategy
+        scaled to 255 and rounded, and that they are in the observation
+        space.
+        """
+        agents = self.grid_world.agents
+        observations = self.observation.get_observations(self.grid_world,
+                                                         agents)
+
+        for agent, obs in zip(agents, observations):
+            expected = self.partial.get_observation(self.grid_world, agent)
+            self.assertEqual(obs.dtype, np.uint8)
+            np.testing.assert_array_equal(
+                obs, np.rint(expected * 255).astype(np.uint8))
+            np.testing.assert_array_equal(
+                obs, self.observation.get_observation(self.grid_world, agent))
+            self.assertIn(obs, self.observation.observation_space(agent))
@@ -0,0 +1,54 @@
+import shutil
+import sys
+import tempfile
+import unittest
+from importlib.util import find_spec
+from unittest.mock import Mock, patch
+
+from ethicalgardeners import renderer
+from ethicalgardeners.gridworld import GridWorld
+from ethicalgardeners.renderer import GraphicalRenderer
+
+
+@unittest.skipIf(find_spec('pygame') is None, "pygame is not installed")
+class TestGraphicalRenderer(unittest.TestCase):
+    """
+    Tests for the :py:class:`.GraphicalRenderer` class.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary directory for the videos.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_video_error_raised(self):
+        """
+        Test that an error of the video writer is raised by the renderer
+        instead of blocking the rendering once the frame buffers are used.
+        """
+        writer = Mock()
+        writer.write.side_effect = ValueError("cannot encode")
+        grid_world = GridWorld.init_random(width=4, height=4)
+
+        with patch.dict(sys.modules, {'cv2': Mock()}), \
+                patch.object(renderer, '_OpenCVVideoWriter',
+                             return_value=writer):
+            graphical_renderer = GraphicalRenderer(
+                cell_size=8, post_analysis_on=True,
+                out_dir_path=self.temp_dir)
+            graphical_renderer.init(grid_world)
+
+            with self.assertRaises(RuntimeError) as context:
+                for _ in range(10 * GraphicalRenderer.FRAME_QUEUE_SIZE):
+                    graphical_renderer.render(grid_world, {})
+            self.assertIsInstance(context.exception.__cause__, ValueError)
+
+            # The error is only raised once, and the video is still closed
+            graphical_renderer.end_render()
+            writer.release.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,10 @@ from unittest.mock import Mock, patch
 
 from math import log
 
+import numpy as np
+
 from ethicalgardeners.action import create_action_enum
+from ethicalgardeners.gridworld import GridSnapshot
 from ethicalgardeners.rewardfunctions import RewardFunctions
 from ethicalgardeners.constants import MAX_PENALTY_TURNS
 
@@ -21,13 +24,14 @@ class TestRewardFunctions(unittest.TestCase):
         """
         Set up test fixtures before each test method.
 
-        Creates a RewardFunctions instance and mocks for grid_world, agent,
-        and actions.
+        Creates a RewardFunctions instance, a snapshot of an empty cell and
+        mocks for grid_world, agent, and actions.
         """
         self.action_enum = create_action_enum(3)
 
         self.reward_functions = RewardFunctions(self.action_enum)
-        self.mock_grid_world_prev = Mock()
+        self.snapshot = GridSnapshot(position=(1, 1), flower_type=-1,
+                                     growth_stage=0, pollution=50.0)
         self.mock_grid_world = Mock()
         self.mock_agent = Mock()
 
@@ -50,7 +54,7 @@ class TestRewardFunctions(unittest.TestCase):
                                   'compute_biodiversity_reward',
                                   return_value=0.2) as mock_biodiversity:
                     result = self.reward_functions.compute_reward(
-                        self.mock_grid_world_prev,
+                        self.snapshot,
                         self.mock_grid_world,
                         self.mock_agent,
                         self.action_enum.PLANT_TYPE_0
@@ -101,7 +105,7 @@ class TestRewardFunctions(unittest.TestCase):
 
         # Test the method
         result = self.reward_functions.compute_ecology_reward(
-            self.mock_grid_world_prev,
+            self.snapshot,
             self.mock_grid_world,
             self.mock_agent,
             self.action_enum.PLANT_TYPE_0
@@ -130,13 +134,10 @@ class TestRewardFunctions(unittest.TestCase):
         mock_cell.has_flower.return_value = False
         mock_cell.pollution = 50
 
-        mock_prev_cell = Mock()
-        mock_flower = Mock()
-        mock_flower.flower_type = 0
-        mock_prev_cell.flower = mock_flower
+        snapshot = GridSnapshot(position=(1, 1), flower_type=0,
+                                growth_stage=2, pollution=50.0)
 
         self.mock_grid_world.get_cell.return_value = mock_cell
-        self.mock_grid_world_prev.get_cell.return_value = mock_prev_cell
 
         # Configure flower data with pollution reduction
         self.mock_grid_world.flowers_data = {0: {
@@ -146,7 +147,7 @@ class TestRewardFunctions(unittest.TestCase):
 
         # Test the method
         result = self.reward_functions.compute_ecology_reward(
-            self.mock_grid_world_prev,
+            snapshot,
             self.mock_grid_world,
             self.mock_agent,
             self.action_enum.HARVEST
@@ -172,23 +173,17 @@ class TestRewardFunctions(unittest.TestCase):
         mock_cell = Mock()
         mock_cell.has_flower.return_value = False
 
-        mock_prev_cell = Mock()
-        mock_flower = Mock()
-        mock_flower.flower_type = 0
-        mock_prev_cell.flower = mock_flower
+        snapshot = GridSnapshot(position=(1, 1), flower_type=0,
+                                growth_stage=2, pollution=50.0)
 
         self.mock_grid_world.get_cell.return_value = mock_cell
-        self.mock_grid_world_prev.get_cell.return_value = mock_prev_cell
 
         # Configure flower price data
-        self.mock_grid_world.flowers_data = {
-            0: {"price": 10},
-            1: {"price": 20}
-        }
+        self.mock_grid_world.flower_prices = np.array([10, 20])
 
         # Test the method
         result = self.reward_functions.compute_wellbeing_reward(
-            self.mock_grid_world_prev,
+            snapshot,
             self.mock_grid_world,
             self.mock_agent,
             self.action_enum.HARVEST
@@ -198,6 +193,50 @@ class TestRewardFunctions(unittest.TestCase):
         expected = 10 / 20  # Price of 0 / highest flower price
         self.assertEqual(result, expected)
 
+    def test_compute_reward_with_previous_grid_world(self):
+        """
+        Test computeReward method with the grid world before the action.
+
+        Verifies that the previous grid world is still accepted and reduced
+        to the cell of the agent, as before the snapshots.
+        """
+        self.mock_agent.position = (1, 1)
+        self.mock_agent.turns_without_income = 0
+
+        mock_cell = Mock()
+        mock_cell.has_flower.return_value = False
+        mock_cell.pollution = 50
+        self.mock_grid_world.get_cell.return_value = mock_cell
+        self.mock_grid_world.max_pollution = 100
+        self.mock_grid_world.min_pollution = 0
+        self.mock_grid_world.flowers_data = {0: {
+            'price': 10,
+            'pollution_reduction': [1, 2, 3]}
+        }
+        self.mock_grid_world.flower_prices = np.array([10, 20])
+
+        snapshot = GridSnapshot(position=(1, 1), flower_type=0,
+                                growth_stage=2, pollution=50.0)
+        mock_grid_world_prev = Mock()
+        mock_grid_world_prev.snapshot.return_value = snapshot
+
+        result = self.reward_functions.compute_reward(
+            mock_grid_world_prev,
+            self.mock_grid_world,
+            self.mock_agent,
+            self.action_enum.HARVEST
+        )
+        expected = self.reward_functions.compute_reward(
+            snapshot,
+            self.mock_grid_world,
+            self.mock_agent,
+            self.action_enum.HARVEST
+        )
+
+        mock_grid_world_prev.snapshot.assert_called_once_with((1, 1))
+        self.assertEqual(result, expected)
+        self.assertEqual(result['wellbeing'], 10 / 20)
+
     def test_compute_wellbeing_reward_penalty(self):
         """
         Test computeWellbeingReward method for non-harvesting actions.
@@ -209,7 +248,7 @@ class TestRewardFunctions(unittest.TestCase):
 
         # Test the method with a non-harvest action
         result = self.reward_functions.compute_wellbeing_reward(
-            self.mock_grid_world_prev,
+            self.snapshot,
             self.mock_grid_world,
             self.mock_agent,
             self.action_enum.WAIT
@@ -246,14 +285,14 @@ class TestRewardFunctions(unittest.TestCase):
         agent2 = Mock()
 
         # Assign flowers to agents
-        agent1.flowers_planted = {0: 2, 1: 1}
-        agent2.flowers_planted = {0: 1, 1: 1, 2: 1}
+        agent1.flowers_planted = np.array([2, 1, 0])
+        agent2.flowers_planted = np.array([1, 1, 1])
 
         self.mock_grid_world.agents = [agent1, agent2]
 
         # Test biodiversity reward for planting a type 2 flower
         result = self.reward_functions.compute_biodiversity_reward(
-            self.mock_grid_world_prev,
+            self.snapshot,
             self.mock_grid_world,
             self.mock_agent,
             self.action_enum.PLANT_TYPE_2
@@ -311,14 +350,14 @@ class TestRewardFunctions(unittest.TestCase):
         agent2 = Mock()
 
         # Assign flowers to agents
-        agent1.flowers_planted = {0: 2, 1: 1}
-        agent2.flowers_planted = {0: 1, 1: 1}
+        agent1.flowers_planted = np.array([2, 1, 0])
+        agent2.flowers_planted = np.array([1, 1, 0])
 
         self.mock_grid_world.agents = [agent1, agent2]
 
         # Test biodiversity reward for planting a type 0 flower
         result = self.reward_functions.compute_biodiversity_reward(
-            self.mock_grid_world_prev,
+            self.snapshot,
             self.mock_grid_world,
             self.mock_agent,
             self.action_enum.PLANT_TYPE_0
@@ -0,0 +1,259 @@
+import unittest
+import warnings
+from unittest.mock import patch
+
+import numpy as np
+from omegaconf import OmegaConf
+
+from ethicalgardeners import vecenv
+from ethicalgardeners.main import make_env
+from ethicalgardeners.vecenv import (SharedVectorGardeners,
+                                     SyncVectorGardeners)
+
+
+class TestSyncVectorGardeners(unittest.TestCase):
+    """
+    Tests for the :py:class:`.SyncVectorGardeners` vectorized environment.
+
+    The first environment of the batch is compared step by step with a
+    :py:class:`.GardenersEnv` reset with the same seed.
+    """
+
+    def make_config(self, grid, observation):
+        """
+        Create a configuration without renderers nor metrics.
+
+        Args:
+            grid (dict): The grid section of the configuration.
+            observation (dict): The observation section of the configuration.
+        """
+        return OmegaConf.create({
+            'num_iterations': 400,
+            'grid': grid,
+            'observation': observation,
+            'metrics': {'export_on': False, 'send_on': False},
+            'renderer': {'graphical': {'enabled': False},
+                         'console': {'enabled': False}}
+        })
+
+    def assert_same_trajectory(self, config, num_steps):
+        """
+        Play the same actions in a :py:class:`.GardenersEnv` and in the first
+        environment of a :py:class:`.SyncVectorGardeners`, and check that they
+        give the same observations, action masks and rewards.
+
+        Args:
+            config (OmegaConf): The configuration of the environments.
+            num_steps (int): Number of steps to play.
+        """
+        env = make_env(config)
+        env.reset(seed=3)
+        vec_env = SyncVectorGardeners(3, config)
+        observations, infos = vec_env.reset(seed=3)
+        masks = infos['action_mask']
+        random_generator = np.random.RandomState(0)
+
+        for step in range(num_steps):
+            agent_id = env.agent_selection
+            expected = env.observe(agent_id)
+            np.testing.assert_allclose(observations[0],
+                                       expected['observation'], atol=1e-6)
+            np.testing.assert_array_equal(masks[0], expected['action_mask'])
+
+            # Mostly valid actions, with some invalid ones
+            actions = []
+            for mask in masks:
+                if random_generator.rand() < 0.8:
+                    actions.append(random_generator.choice(
+                        np.flatnonzero(mask)))
+                else:
+                    actions.append(random_generator.randint(len(mask)))
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                env.step(actions[0])
+            observations, rewards, _, truncations, infos = vec_env.step(
+                actions)
+            masks = infos['action_mask']
+
+            self.assertEqual(infos['action_valid'][0],
+                             env.infos[agent_id]['action_valid'])
+            for component, value in env.infos[agent_id]['rewards'].items():
+                self.assertAlmostEqual(infos['rewards'][component][0], value,
+                                       msg=f"{component} at step {step}")
+            self.assertFalse(truncations.any())
+
+        agents = list(env.agents.values())
+        np.testing.assert_array_equal(
+            vec_env.money[0], [agent.money for agent in agents])
+        np.testing.assert_array_equal(
+            vec_env.seeds[0], [agent.seeds for agent in agents])
+
+    def test_random_grid_matches_gardeners_env(self):
+        """
+        Test a random grid with total observations and random seed returns.
+        """
+        config = self.make_config(
+            grid={
+                'init_method': 'random',
+                'width': 6,
+                'height': 6,
+                'nb_agent': 3,
+                'num_seeds_returned': -3,
+                'flowers_data': {
+                    0: {'price': 10, 'pollution_reduction': [0, 1, 5]},
+                    1: {'price': 4, 'pollution_reduction': [2]},
+                    2: {'price': 1, 'pollution_reduction': [1, 1]},
+                },
+            },
+            observation={'type': 'total'},
+        )
+        self.assert_same_trajectory(config, 300)
+
+    def test_partial_observation_without_collisions(self):
+        """
+        Test a grid created from code with partial observations and agents
+        that can share cells.
+        """
+        config = self.make_config(
+            grid={
+                'init_method': 'from_code',
+                'config': {
+                    'width': 5,
+                    'height': 5,
+                    'collisions_on': False,
+                    'flowers_data': {
+                        0: {'price': 3, 'pollution_reduction': [0, 2]},
+                        1: {'price': 6, 'pollution_reduction': [1, 1, 4]},
+                    },
+                    'cells': [{'position': (2, 2), 'type': 'OBSTACLE'}],
+                    'agents': [
+                        {'position': (0, 0), 'seeds': [2, -1]},
+                        {'position': (0, 1), 'seeds': [1, 0]},
+                    ],
+                    'flowers': [{'position': (1, 1), 'type': 1,
+                                 'growth_stage': 2}],
+                },
+            },
+            observation={'type': 'partial', 'range': 2},
+        )
+        self.assert_same_trajectory(config, 300)
+
+    def test_autoreset_at_truncation(self):
+        """
+        Test that all environments are reset when the episode is truncated.
+        """
+        config = self.make_config(
+            grid={
+                'init_method': 'from_code',
+                'config': {'width': 4, 'height': 4,
+                           'agents': [{'position': (0, 0)},
+                                      {'position': (3, 3)}]},
+            },
+            observation={})
+        config.num_iterations = 4
+        vec_env = SyncVectorGardeners(2, config)
+        initial_observations, _ = vec_env.reset(seed=0)
+        wait = np.full(2, vec_env.action_enum.WAIT.value)
+
+        for _ in range(3):
+            _, _, _, truncations, infos = vec_env.step(wait)
+            self.assertFalse(truncations.any())
+        observations, _, _, truncations, infos = vec_env.step(wait)
+
+        self.assertTrue(truncations.all())
+        self.assertEqual(vec_env.num_moves, 0)
+        # The grid is created from code, so every reset gives the same state
+        np.testing.assert_array_equal(observations, initial_observations)
+        self.assertFalse(np.array_equal(infos['final_observation'],
+                                        initial_observations))
+
+    def test_step_subset_of_environments(self):
+        """
+        Test that environments left out of a dictionary of actions are
+        skipped, with and without the compiled kernels.
+        """
+        config = self.make_config(
+            grid={'init_method': 'from_code',
+                  'config': {'width': 4, 'height': 4,
+                             'agents': [{'position': (0, 0)},
+                                        {'position': (3, 3)}]}},
+            observation={})
+
+        for kernel in ['compiled', 'numpy']:
+            with self.subTest(kernel=kernel), \
+                    patch('ethicalgardeners.vecenv.batched_step',
+                          None if kernel == 'numpy' else
+                          vecenv.batched_step):
+                vec_env = SyncVectorGardeners(3, config)
+                reference = SyncVectorGardeners(3, config)
+                vec_env.reset(seed=0)
+                reference.reset(seed=0)
+                down = vec_env.action_enum.DOWN.value
+                wait = vec_env.action_enum.WAIT.value
+
+                _, rewards, _, _, infos = vec_env.step({0: down, 2: wait})
+                _, expected_rewards, _, _, _ = reference.step(
+                    [down, wait, wait])
+
+                self.assertEqual(infos['action_valid'].tolist(),
+                                 [True, False, True])
+                self.assertEqual(rewards[1], 0.0)
+                self.assertEqual(vec_env.agent_selection, 1)
+                for n in [0, 2]:
+                    self.assertEqual(rewards[n], expected_rewards[n])
+                    np.testing.assert_array_equal(vec_env.positions[n],
+                                                  reference.positions[n])
+                    np.testing.assert_array_equal(
+                        vec_env.turns_without_income[n],
+                        reference.turns_without_income[n])
+                np.testing.assert_array_equal(vec_env.positions[1],
+                                              reference.positions[1])
+                self.assertEqual(vec_env.turns_without_income[1, 0], 0)
+
+    def test_shared_memory_workers_match_sync(self):
+        """
+        Test that environments stepped by worker processes give the same
+        results as the same environments stepped in one process, across an
+        automatic reset.
+        """
+        config = self.make_config(
+            grid={'init_method': 'random', 'width': 5, 'height': 5,
+                  'nb_agent': 2, 'num_seeds_returned': -3},
+            observation={'type': 'partial', 'range': 1})
+        config.num_iterations = 20
+        shared_env = SharedVectorGardeners(3, config, num_workers=2)
+        self.addCleanup(shared_env.close)
+        vec_env = SyncVectorGardeners(3, config)
+
+        observations, infos = shared_env.reset(seed=5)
+        expected_observations, expected_infos = vec_env.reset(seed=5)
+        np.testing.assert_array_equal(observations, expected_observations)
+        random_generator = np.random.RandomState(1)
+
+        for _ in range(30):
+            masks = expected_infos['action_mask']
+            actions = (random_generator.rand(*masks.shape)
+                       + masks).argmax(axis=1)
+            observations, rewards, _, truncations, infos = shared_env.step(
+                actions)
+            (expected_observations, expected_rewards, _,
+             expected_truncations, expected_infos) = vec_env.step(actions)
+
+            np.testing.assert_array_equal(observations,
+                                          expected_observations)
+            np.testing.assert_array_equal(rewards, expected_rewards)
+            np.testing.assert_array_equal(truncations, expected_truncations)
+            self.assertEqual(infos.keys(), expected_infos.keys())
+            for key in ['action_mask', 'action_valid', 'final_observation']:
+                if key in expected_infos:
+                    np.testing.assert_array_equal(infos[key],
+                                                  expected_infos[key])
+
+        np.testing.assert_array_equal(shared_env.money, vec_env.money)
+        np.testing.assert_array_equal(shared_env.positions,
+                                      vec_env.positions)
+
+
+if __name__ == '__main__':
+    unittest.main()